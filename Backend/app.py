@@ -1,22 +1,73 @@
+import logging
 import os
 from flask import Flask
 from flask_cors import CORS
-from routes.projects import register_projects_routes
-from routes.estimations import register_estimations_routes
+import config
 
 # Load Groq API key from environment variable
 GROQ_API_KEY = os.getenv('GROQ_API_KEY', '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')
 
-# Create Flask application
-app = Flask(__name__)
+def create_app(groq_api_key=GROQ_API_KEY, project_store_path=config.PROJECT_STORE_PATH, llm_client=None, model_loader=None,
+               analysis_store_path=config.ANALYSIS_STORE_PATH or None, job_store_path=config.ESTIMATION_JOB_STORE_PATH or None):
+    """
+    Build the Flask application
 
-# Enable CORS for all routes
-CORS(app)
+    Route and service modules are imported here rather than at module import time, and the
+    effort model loads in a background thread, so the server binds its port straight away
+    and reports readiness on /readyz once the model is warm.
 
-# Register routes
-register_projects_routes(app)
-register_estimations_routes(app, GROQ_API_KEY)
+    :param groq_api_key: API key for Groq
+    :param project_store_path: SQLite path of the project store
+    :param llm_client: Optional pre-built LLM client shared by the analyzers
+    :param model_loader: Optional EffortModelLoader, loaded or started by the caller; a background loader is started if omitted
+    :param analysis_store_path: SQLite path of the analysis store used by recompute (defaults to project_store_path)
+    :param job_store_path: SQLite path of the async estimation job store (defaults to project_store_path)
+    :return: Flask application
+    """
+    from routes.projects import register_projects_routes
+    from routes.estimations import register_estimations_routes
+    from routes.metrics import register_metrics_routes
+    from routes.health import register_health_routes
+    from models.project_store import ProjectStore
+    from models.analysis_store import AnalysisStore
+    from models.job_store import JobStore
+    from services.effort_estimation_model import EffortEstimationModel
+    from services.model_loader import EffortModelLoader
+
+    # Configure logging once for the whole process
+    logging.basicConfig(level=config.LOG_LEVEL, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+
+    # Create Flask application
+    app = Flask(__name__)
+
+    # Enable CORS for all routes (the pagination cursor is sent as a header)
+    CORS(app, expose_headers=['X-Next-Cursor'])
+
+    # Start loading the effort model now so it overlaps the remaining setup
+    if model_loader is None:
+        model_loader = EffortModelLoader(
+            EffortEstimationModel,
+            warm_up=config.EFFORT_MODEL_WARM_UP,
+            wait_seconds=config.EFFORT_MODEL_WAIT_SECONDS,
+            micro_batch_size=config.EFFORT_MODEL_MICRO_BATCH_SIZE,
+            micro_batch_wait_seconds=config.EFFORT_MODEL_MICRO_BATCH_WAIT_MS / 1000
+        ).start()
+
+    # Persistent store for estimation results
+    project_store = ProjectStore(project_store_path)
+    analysis_store = AnalysisStore(analysis_store_path or project_store_path, ttl_seconds=config.ANALYSIS_STORE_TTL_SECONDS or None)
+    # Async job state lives in SQLite so pre-fork workers can answer polls for each other's jobs
+    job_store = JobStore(job_store_path or project_store_path, ttl_seconds=config.ESTIMATION_JOB_RESULT_TTL_SECONDS or None)
+
+    # Register routes
+    register_metrics_routes(app)
+    register_health_routes(app, model_loader)
+    register_projects_routes(app, project_store, seed_mock_projects=config.PROJECT_STORE_SEED_MOCK)
+    register_estimations_routes(app, groq_api_key, project_store=project_store, llm_client=llm_client,
+                                model_loader=model_loader, analysis_store=analysis_store, job_store=job_store)
+
+    return app
 
 if __name__ == '__main__':
     # Run the application
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    create_app().run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,58 @@
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+# Canned FPA analysis returned for JSON-mode Function Point Analysis prompts
+DEFAULT_FPA_RESPONSE = {
+    "EI": {"count": 4, "examples": ["Login form", "Customer entry", "Order entry", "File upload"]},
+    "EO": {"count": 3, "examples": ["Order confirmation", "Sales report", "Invoice"]},
+    "EQ": {"count": 2, "examples": ["Product search", "Order tracking"]},
+    "ILF": {"count": 3, "examples": ["Customer records", "Product catalog", "Orders"]},
+    "EIF": {"count": 1, "examples": ["Payment gateway"]}
+}
+
+class FakeLLMClient:
+    def __init__(self, latency=0.0, fpa_response=None, rating='High', prompt_tokens=500, completion_tokens=50):
+        """
+        Stand-in for groq.Groq that answers chat completions with canned content
+
+        Implements client.chat.completions.create(...) with the same response shape
+        (choices[0].message.content and usage), so it can be injected anywhere a Groq
+        client is accepted.
+
+        :param latency: Seconds each completion sleeps, to model provider latency
+        :param fpa_response: Dictionary returned for Function Point Analysis prompts
+        :param rating: Rating returned for cost driver prompts
+        :param prompt_tokens: Prompt token count reported in usage
+        :param completion_tokens: Completion token count reported in usage
+        """
+        self.latency = latency
+        self.fpa_response = fpa_response or DEFAULT_FPA_RESPONSE
+        self.rating = rating
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+        self.calls = 0
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=self)
+
+    def create(self, messages, model=None, response_format=None, **kwargs):
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        prompt = messages[-1]['content']
+        if response_format and 'Function Point Analysis' in prompt:
+            content = json.dumps(self.fpa_response)
+        elif response_format:
+            # Batched cost driver prompt: rate every driver listed under COST DRIVERS
+            drivers = [line[2:].split(':', 1)[0] for line in prompt.splitlines() if line.startswith('- ') and ':' in line]
+            content = json.dumps({driver: self.rating for driver in drivers})
+        else:
+            content = self.rating
+
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(prompt_tokens=self.prompt_tokens, completion_tokens=self.completion_tokens)
+        )
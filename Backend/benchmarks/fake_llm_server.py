@@ -0,0 +1,135 @@
+"""
+Local stand-in for an OpenAI-compatible chat completion server
+
+Answers POST /v1/chat/completions with FakeLLMClient's canned responses after a
+configurable delay, so the whole service can run and be load-tested with no network
+and no model. Run from the Backend directory:
+
+    python -m benchmarks.fake_llm_server --port 8089 --latency 0.4
+    LLM_PROVIDER=local LLM_BASE_URL=http://127.0.0.1:8089/v1 python app.py
+"""
+import argparse
+import json
+import logging
+import random
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from benchmarks.fake_llm import FakeLLMClient
+
+logger = logging.getLogger(__name__)
+
+class FakeLLMRequestHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps connections alive, like a real server behind the pooled client
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        if self.path.rstrip('/') in ('/v1/models', '/models'):
+            self._send_json(200, {"object": "list", "data": [{"id": self.server.model, "object": "model"}]})
+        elif self.path == '/healthz':
+            self._send_json(200, {"status": "ok"})
+        else:
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+
+    def do_POST(self):
+        if self.path.rstrip('/') not in ('/v1/chat/completions', '/chat/completions'):
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            messages = body['messages']
+        except (ValueError, KeyError) as e:
+            self._send_json(400, {"error": {"message": f"Invalid request: {e}"}})
+            return
+
+        server = self.server
+        if server.error_rate and random.random() < server.error_rate:
+            self._send_json(503, {"error": {"message": "Injected failure"}})
+            return
+
+        delay = server.latency + (random.uniform(0, server.jitter) if server.jitter else 0.0)
+        if delay:
+            time.sleep(delay)
+        completion = server.client.create(messages, model=body.get('model'), response_format=body.get('response_format'))
+        content = completion.choices[0].message.content
+
+        # Rough token counts (4 characters per token) so usage metrics behave like a real provider
+        prompt_tokens = sum(len(message.get('content') or '') for message in messages) // 4
+        completion_tokens = max(1, len(content) // 4)
+        self._send_json(200, {
+            "id": f"chatcmpl-{server.client.calls}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get('model') or server.model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        })
+
+    def _send_json(self, status, payload):
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+def make_server(host='127.0.0.1', port=8089, latency=0.0, jitter=0.0, error_rate=0.0, fpa_response=None,
+                rating='High', model='fake-llama'):
+    """
+    Build the stand-in server without starting it (call serve_forever, e.g. in a thread)
+
+    :param host: Interface to bind
+    :param port: Port to bind (0 picks a free one, see server.server_address)
+    :param latency: Seconds every completion takes
+    :param jitter: Extra uniformly distributed seconds added to latency
+    :param error_rate: Fraction of completions answered with HTTP 503
+    :param fpa_response: Dictionary returned for Function Point Analysis prompts
+    :param rating: Rating returned for cost driver prompts
+    :param model: Model name listed by /v1/models
+    :return: ThreadingHTTPServer
+    """
+    server = ThreadingHTTPServer((host, port), FakeLLMRequestHandler)
+    server.daemon_threads = True
+    server.client = FakeLLMClient(fpa_response=fpa_response, rating=rating)
+    server.latency = latency
+    server.jitter = jitter
+    server.error_rate = error_rate
+    server.model = model
+    return server
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve canned chat completions on an OpenAI-compatible API")
+    parser.add_argument('--host', default='127.0.0.1', help="Interface to bind")
+    parser.add_argument('--port', type=int, default=8089, help="Port to bind")
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds every completion takes")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Extra random seconds added to --latency")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of completions failed with HTTP 503")
+    parser.add_argument('--fpa-response', default=None, help="JSON file with the FPA result to return")
+    parser.add_argument('--rating', default='High', help="Rating returned for cost driver prompts")
+    args = parser.parse_args(argv)
+
+    fpa_response = None
+    if args.fpa_response:
+        with open(args.fpa_response) as f:
+            fpa_response = json.load(f)
+
+    server = make_server(args.host, args.port, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                         fpa_response=fpa_response, rating=args.rating)
+    print(f"Fake LLM server on http://{args.host}:{server.server_address[1]}/v1 (latency {args.latency}s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,120 @@
+import io
+import zipfile
+from xml.sax.saxutils import escape
+
+# One page worth of requirement-like text
+_PAGE_LINES = [
+    "{section}.{n} The system shall allow a registered user to submit an order form with up to 50 line items.",
+    "{section}.{n} The system shall generate a monthly sales report grouped by region and product category.",
+    "{section}.{n} The system shall provide a product search that returns results within two seconds.",
+    "{section}.{n} The system shall store customer records including billing and shipping addresses.",
+    "{section}.{n} The system shall read exchange rates from the external currency service every hour.",
+]
+
+def requirement_pages(page_count, lines_per_page=40):
+    """
+    Generate deterministic requirement text, one string per page
+
+    :param page_count: Number of pages
+    :param lines_per_page: Lines of text on each page
+    :return: List of page strings
+    """
+    pages = []
+    for page in range(page_count):
+        lines = [f"Section {page + 1}: Functional Requirements"]
+        for n in range(lines_per_page):
+            lines.append(_PAGE_LINES[n % len(_PAGE_LINES)].format(section=page + 1, n=n + 1))
+        pages.append('\n'.join(lines))
+    return pages
+
+def make_txt(page_count):
+    """
+    :return: UTF-8 bytes of a plain-text requirements document
+    """
+    return '\n\n'.join(requirement_pages(page_count)).encode('utf-8')
+
+def make_pdf(page_count):
+    """
+    Build a minimal multi-page PDF with Helvetica text, without third-party libraries
+
+    :return: PDF bytes
+    """
+    pages = requirement_pages(page_count)
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        ('<< /Type /Pages /Kids [%s] /Count %d >>' % (
+            ' '.join(f'{4 + 2 * i} 0 R' for i in range(page_count)), page_count
+        )).encode('ascii'),
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>'
+    ]
+    for i, page in enumerate(pages):
+        operations = ['BT /F1 9 Tf 12 TL 40 800 Td']
+        for line in page.split('\n'):
+            line = line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+            operations.append(f'({line}) Tj T*')
+        operations.append('ET')
+        content = '\n'.join(operations).encode('latin-1')
+        objects.append(
+            f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] '
+            f'/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>'.encode('ascii')
+        )
+        objects.append(b'<< /Length %d >>\nstream\n' % len(content) + content + b'\nendstream')
+
+    output = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+    xref_offset = len(output)
+    output += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    for offset in offsets:
+        output += b'%010d 00000 n \n' % offset
+    output += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref_offset)
+    return bytes(output)
+
+def make_docx(page_count):
+    """
+    Build a minimal DOCX (one paragraph per line) without third-party libraries
+
+    :return: DOCX bytes
+    """
+    paragraphs = ''.join(
+        f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>'
+        for page in requirement_pages(page_count) for line in page.split('\n')
+    )
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f'<w:body>{paragraphs}</w:body></w:document>'
+    )
+    content_types = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/word/document.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+        '</Types>'
+    )
+    relationships = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="word/document.xml"/>'
+        '</Relationships>'
+    )
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', content_types)
+        archive.writestr('_rels/.rels', relationships)
+        archive.writestr('word/document.xml', document)
+    return buffer.getvalue()
+
+# File extension to fixture builder
+FIXTURE_BUILDERS = {
+    'txt': make_txt,
+    'pdf': make_pdf,
+    'docx': make_docx
+}
@@ -0,0 +1,244 @@
+"""
+Stage-level benchmarks for the estimation service
+
+Runs every stage against generated fixtures and a FakeLLMClient, so neither the Groq
+API nor TensorFlow is needed. Run from the Backend directory:
+
+    python -m benchmarks.run_benchmarks                    # compare against baseline.json
+    python -m benchmarks.run_benchmarks --update-baseline  # record a new baseline
+    python -m benchmarks.run_benchmarks extraction         # only the named groups
+
+Baselines are hardware-specific: regenerate baseline.json on the machine that runs the comparison.
+"""
+import argparse
+import io
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from werkzeug.datastructures import FileStorage
+from benchmarks.fake_llm import FakeLLMClient, DEFAULT_FPA_RESPONSE
+from benchmarks.fixtures import FIXTURE_BUILDERS
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# Document sizes (in pages) used for the extraction benchmarks
+FIXTURE_PAGE_COUNTS = (1, 10, 50)
+
+def _cost_drivers(null_count):
+    """
+    :return: Cost driver list as sent by the frontend, with the first null_count drivers left null
+    """
+    from services.cost_drivers_analyzer import COST_DRIVER_DESCRIPTIONS
+    return [
+        {"driver": driver, "value": 'null' if index < null_count else 'Nominal'}
+        for index, driver in enumerate(COST_DRIVER_DESCRIPTIONS)
+    ]
+
+def measure(func, iterations, warmup=1):
+    """
+    Time repeated calls of func
+
+    :param func: Zero-argument callable; called warmup + iterations times
+    :param iterations: Number of timed calls
+    :param warmup: Untimed calls made first
+    :return: Dictionary with throughput (ops/s) and latency percentiles in milliseconds
+    """
+    for _ in range(warmup):
+        func()
+    samples = []
+    total_start = time.perf_counter()
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    total = time.perf_counter() - total_start
+
+    samples.sort()
+    def percentile(q):
+        return samples[min(len(samples) - 1, int(round(q * (len(samples) - 1))))] * 1000
+
+    return {
+        "iterations": iterations,
+        "throughput": round(iterations / total, 3),
+        "meanMs": round(statistics.fmean(samples) * 1000, 4),
+        "p50Ms": round(percentile(0.50), 4),
+        "p95Ms": round(percentile(0.95), 4),
+        "p99Ms": round(percentile(0.99), 4)
+    }
+
+def benchmark_extraction(iterations):
+    from services.document_extractor import extract_text_from_document
+
+    results = {}
+    for extension, build in FIXTURE_BUILDERS.items():
+        for pages in FIXTURE_PAGE_COUNTS:
+            data = build(pages)
+            def run():
+                extract_text_from_document(FileStorage(stream=io.BytesIO(data), filename=f'requirements.{extension}'))
+            # Large documents are slow enough that fewer samples still give stable percentiles
+            results[f'extract_text_from_document[{extension},{pages}p]'] = measure(run, max(3, iterations // pages))
+    return results
+
+def benchmark_project_metrics(iterations):
+    from services.function_point_analysis import FunctionPointAnalyzer
+
+    analyzer = FunctionPointAnalyzer(client=FakeLLMClient())
+    return {
+        'calculate_project_metrics': measure(
+            lambda: analyzer.calculate_project_metrics(DEFAULT_FPA_RESPONSE, language="Java"), iterations * 20
+        )
+    }
+
+def benchmark_cost_drivers(iterations, latency):
+    from services.cost_drivers_analyzer import CostDriversAnalyzer, DriverRatingMemo, process_cost_drivers
+
+    results = {}
+    for mode in ('sequential', 'concurrent', 'single_shot'):
+        # Cold: no memo, every null driver goes to the (fake) LLM
+        analyzer = CostDriversAnalyzer(client=FakeLLMClient(latency=latency), inference_mode=mode, max_concurrency=8, memo=None)
+        results[f'process_cost_drivers[{mode},cold]'] = measure(
+            lambda: process_cost_drivers(_cost_drivers(6), analyzer=analyzer), iterations
+        )
+
+    # Warm: ratings come from the memo after the first call
+    analyzer = CostDriversAnalyzer(client=FakeLLMClient(latency=latency), memo=DriverRatingMemo())
+    results['process_cost_drivers[memo,warm]'] = measure(
+        lambda: process_cost_drivers(_cost_drivers(6), analyzer=analyzer), iterations * 20
+    )
+    return results
+
+def benchmark_effort_model(iterations, batch_size):
+    from services.effort_estimation_model import EffortEstimationModel
+
+    model = EffortEstimationModel()
+    processed = [dict(driver, numerical_value=1.0) for driver in _cost_drivers(0)]
+    batch_drivers = [processed] * batch_size
+    batch_klocs = [10.0 + index for index in range(batch_size)]
+
+    return {
+        f'predict_effort[{model.engine}]': measure(lambda: model.predict_effort(processed, 42.0), iterations * 10),
+        f'predict_effort_batch[{model.engine},{batch_size}]': measure(
+            lambda: model.predict_effort_batch(batch_drivers, batch_klocs), iterations
+        )
+    }
+
+def benchmark_estimation_route(iterations, latency):
+    from flask import Flask
+    from models.project_store import ProjectStore
+    from routes.estimations import register_estimations_routes
+
+    app = Flask(__name__)
+    register_estimations_routes(
+        app, 'benchmark', project_store=ProjectStore(':memory:'), llm_client=FakeLLMClient(latency=latency)
+    )
+    client = app.test_client()
+    document = FIXTURE_BUILDERS['txt'](5)
+    cost_drivers = json.dumps(_cost_drivers(6))
+
+    def run():
+        response = client.post('/estimations', data={
+            'costDrivers': cost_drivers,
+            'requirementsDocument': (io.BytesIO(document), 'requirements.txt')
+        }, content_type='multipart/form-data')
+        if response.status_code != 200:
+            raise RuntimeError(f"/estimations returned {response.status_code}: {response.get_data(as_text=True)[:200]}")
+
+    # FPA results and driver ratings are cached after the warm-up call, so this measures the warm path
+    return {'POST /estimations[txt,5p,warm]': measure(run, iterations)}
+
+# Benchmark groups in run order
+BENCHMARK_GROUPS = {
+    'extraction': lambda args: benchmark_extraction(args.iterations),
+    'project_metrics': lambda args: benchmark_project_metrics(args.iterations),
+    'cost_drivers': lambda args: benchmark_cost_drivers(args.iterations, args.llm_latency),
+    'effort_model': lambda args: benchmark_effort_model(args.iterations, args.batch_size),
+    'estimation_route': lambda args: benchmark_estimation_route(args.iterations, args.llm_latency)
+}
+
+def compare_to_baseline(results, baseline, tolerance, min_delta_ms=0.05):
+    """
+    :param results: Dictionary of benchmark name to measurement
+    :param baseline: Dictionary of benchmark name to baseline measurement
+    :param tolerance: Allowed fractional slowdown of p50 and p95 (1.0 = twice as slow)
+    :param min_delta_ms: Slowdowns smaller than this are treated as timer noise
+    :return: List of regression messages
+    """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        for metric in ('p50Ms', 'p95Ms'):
+            slower = result[metric] - reference[metric]
+            if result[metric] > reference[metric] * (1 + tolerance) and slower > min_delta_ms:
+                regressions.append(
+                    f"{name}: {metric} {result[metric]:.3f} ms > baseline {reference[metric]:.3f} ms (+{tolerance:.0%})"
+                )
+    return regressions
+
+def print_results(results):
+    width = max(len(name) for name in results)
+    print(f"{'benchmark':<{width}}  {'ops/s':>10}  {'p50 ms':>10}  {'p95 ms':>10}  {'p99 ms':>10}")
+    for name, result in results.items():
+        print(
+            f"{name:<{width}}  {result['throughput']:>10.1f}  {result['p50Ms']:>10.3f}  "
+            f"{result['p95Ms']:>10.3f}  {result['p99Ms']:>10.3f}"
+        )
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run stage-level benchmarks of the estimation service")
+    parser.add_argument('--iterations', type=int, default=20, help="Timed iterations per benchmark (scaled per stage)")
+    parser.add_argument('--llm-latency', type=float, default=0.005, help="Seconds each fake LLM completion takes")
+    parser.add_argument('--batch-size', type=int, default=256, help="Projects per predict_effort_batch call")
+    parser.add_argument('groups', nargs='*', help=f"Benchmark groups to run: {', '.join(BENCHMARK_GROUPS)} (default: all)")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="Baseline JSON file")
+    parser.add_argument('--tolerance', type=float, default=1.0, help="Allowed fractional slowdown before failing")
+    parser.add_argument('--min-delta-ms', type=float, default=0.05, help="Ignore slowdowns smaller than this (timer noise)")
+    parser.add_argument('--update-baseline', action='store_true', help="Write the results as the new baseline")
+    parser.add_argument('--output', default=None, help="Also write the results to this JSON file")
+    args = parser.parse_args(argv)
+    unknown = [group for group in args.groups if group not in BENCHMARK_GROUPS]
+    if unknown:
+        parser.error(f"unknown benchmark group(s): {', '.join(unknown)}")
+
+    logging.basicConfig(level=logging.WARNING)
+    results = {}
+    for group in args.groups or BENCHMARK_GROUPS:
+        results.update(BENCHMARK_GROUPS[group](args))
+
+    print_results(results)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one")
+        return 0
+
+    with open(args.baseline) as f:
+        regressions = compare_to_baseline(results, json.load(f), args.tolerance, args.min_delta_ms)
+    if regressions:
+        print("\nRegressions:")
+        for message in regressions:
+            print(f"  {message}")
+        return 1
+    print("\nNo regressions against baseline")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""
+Estimate every requirements document of a directory tree offline
+
+Documents (.pdf, .docx, .txt) are extracted in a process pool, analyzed by the LLM
+with bounded concurrency and estimated in vectorized batches by the effort model.
+Results are appended batch by batch to a CSV file, or to a directory of Parquet
+parts (requires pyarrow). Rerunning with the same output resumes where the previous
+run stopped. The LLM provider, FPA cache and call policy come from the same
+environment variables as the service (see config.py).
+
+Usage:
+    python bulk_estimate.py DOCUMENTS_DIR --output estimates.csv [--cost-drivers drivers.json]
+        [--language Java] [--extract-workers N] [--llm-concurrency 8] [--batch-size 256]
+        [--format csv|parquet] [--retry-failed] [--limit N]
+
+drivers.json holds the cost drivers applied to every document, in the format the
+/estimations route accepts, e.g. [{"driver": "rely", "value": "High"}]; "null"
+values are inferred once by the LLM.
+"""
+import argparse
+import json
+import logging
+import sys
+from app import GROQ_API_KEY
+from services.bulk_estimation import BulkEstimator, open_result_writer
+from services.cache import FPAResultCache
+from services.cost_drivers_analyzer import CostDriversAnalyzer, process_cost_drivers, DRIVER_RATING_MEMO
+from services.effort_estimation_model import EffortEstimationModel
+from services.function_point_analysis import FunctionPointAnalyzer
+from services.llm_client import DEFAULT_MODELS, create_llm_client
+from services.llm_policy import CircuitBreaker, LLMCallPolicy
+from services.similarity_index import MinHashLSHIndex
+from services.text_compaction import TextCompactor
+import config
+
+logger = logging.getLogger(__name__)
+
+
+def build_analyzers(llm_concurrency):
+    """
+    Build the FPA and cost driver analyzers the service would use, sized for llm_concurrency
+
+    :param llm_concurrency: Documents analyzed at once; each gets one connection
+    :return: Tuple of (FunctionPointAnalyzer, CostDriversAnalyzer)
+    """
+    DRIVER_RATING_MEMO.configure(
+        ttl_seconds=config.COST_DRIVER_MEMO_TTL_SECONDS or None,
+        max_entries=config.COST_DRIVER_MEMO_MAX_ENTRIES,
+        pinned_ratings=config.COST_DRIVER_PINNED_RATINGS
+    )
+    fpa_cache = FPAResultCache(
+        max_entries=config.FPA_CACHE_MAX_ENTRIES,
+        ttl_seconds=config.FPA_CACHE_TTL_SECONDS or None,
+        db_path=config.FPA_CACHE_DB_PATH or None,
+        similarity_index=MinHashLSHIndex(
+            threshold=config.FPA_SIMILARITY_THRESHOLD,
+            max_entries=config.FPA_SIMILARITY_MAX_ENTRIES
+        ) if config.FPA_SIMILARITY_THRESHOLD > 0 else None
+    )
+    max_connections = max(llm_concurrency, config.COST_DRIVER_MAX_CONCURRENCY)
+    llm_client = create_llm_client(
+        GROQ_API_KEY if config.LLM_PROVIDER == 'groq' else None,
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        keepalive_expiry=config.LLM_KEEPALIVE_EXPIRY_SECONDS,
+        connect_timeout=config.LLM_CONNECT_TIMEOUT_SECONDS,
+        read_timeout=config.LLM_READ_TIMEOUT_SECONDS,
+        max_retries=0,
+        provider=config.LLM_PROVIDER,
+        base_url=config.LLM_BASE_URL
+    )
+    llm_model = config.LLM_MODEL or DEFAULT_MODELS.get(config.LLM_PROVIDER, DEFAULT_MODELS['groq'])
+    llm_call_policy = LLMCallPolicy(
+        call_timeout=config.LLM_CALL_TIMEOUT_SECONDS or None,
+        request_timeout=config.LLM_REQUEST_DEADLINE_SECONDS or None,
+        max_attempts=config.LLM_MAX_RETRIES + 1,
+        backoff_base_seconds=config.LLM_BACKOFF_BASE_SECONDS,
+        backoff_max_seconds=config.LLM_BACKOFF_MAX_SECONDS,
+        hedge_percentile=config.LLM_HEDGE_PERCENTILE or None,
+        hedge_min_samples=config.LLM_HEDGE_MIN_SAMPLES,
+        circuit_breaker=CircuitBreaker(
+            failure_threshold=config.LLM_CIRCUIT_FAILURE_THRESHOLD,
+            reset_seconds=config.LLM_CIRCUIT_RESET_SECONDS
+        ),
+        max_workers=2 * max_connections
+    )
+    fpa_analyzer = FunctionPointAnalyzer(
+        client=llm_client,
+        model=llm_model,
+        call_policy=llm_call_policy,
+        cache=fpa_cache,
+        chunk_token_budget=config.FPA_CHUNK_TOKEN_BUDGET or None,
+        # Chunks of one document run one after another, so llm_concurrency bounds the calls in flight
+        max_concurrency=1
+    )
+    cost_drivers_analyzer = CostDriversAnalyzer(
+        client=llm_client,
+        model=llm_model,
+        call_policy=llm_call_policy,
+        inference_mode=config.COST_DRIVER_INFERENCE_MODE,
+        max_concurrency=config.COST_DRIVER_MAX_CONCURRENCY
+    )
+    return fpa_analyzer, cost_drivers_analyzer
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Estimate every requirements document of a directory tree")
+    parser.add_argument('documents', help="Directory walked for .pdf, .docx and .txt documents")
+    parser.add_argument('--output', required=True, help="CSV file, or Parquet directory; resumed if it exists")
+    parser.add_argument('--format', choices=('csv', 'parquet'), default=None,
+                        help="Output format (default: csv for a .csv output, parquet otherwise)")
+    parser.add_argument('--cost-drivers', default=None, help="JSON file with the cost drivers for every document")
+    parser.add_argument('--language', default='Java', help="Programming language for LOC/FP")
+    parser.add_argument('--extract-workers', type=int, default=None, help="Extraction processes (default: all cores)")
+    parser.add_argument('--llm-concurrency', type=int, default=8, help="Documents analyzed by the LLM at once")
+    parser.add_argument('--batch-size', type=int, default=256, help="Documents per model invocation and output write")
+    parser.add_argument('--retry-failed', action='store_true', help="Redo documents that previously failed or got no function points")
+    parser.add_argument('--limit', type=int, default=None, help="Stop after this many documents")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=config.LOG_LEVEL, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+
+    cost_drivers = []
+    if args.cost_drivers:
+        with open(args.cost_drivers) as f:
+            cost_drivers = json.load(f)
+
+    try:
+        writer = open_result_writer(args.output, args.format)
+    except ImportError:
+        parser.error("Parquet output requires pyarrow (pip install pyarrow), or use a .csv output")
+
+    fpa_analyzer, cost_drivers_analyzer = build_analyzers(args.llm_concurrency)
+    # Drivers are rated once up front; null ones cost one round of LLM calls for the whole run
+    processed_cost_drivers = process_cost_drivers(cost_drivers, analyzer=cost_drivers_analyzer)
+
+    estimator = BulkEstimator(
+        fpa_analyzer,
+        EffortEstimationModel(),
+        processed_cost_drivers,
+        language=args.language,
+        extract_workers=args.extract_workers,
+        llm_concurrency=args.llm_concurrency,
+        batch_size=args.batch_size,
+        max_document_bytes=config.MAX_DOCUMENT_BYTES,
+        text_compactor=TextCompactor(drop_sections=config.TEXT_COMPACTION_DROP_SECTIONS) if config.TEXT_COMPACTION_ENABLED else None
+    )
+    summary = estimator.run(
+        args.documents,
+        writer,
+        retry_failed=args.retry_failed,
+        limit=args.limit,
+        on_progress=lambda done, total: logger.info("Estimated %d/%d documents", done, total)
+    )
+    summary['fpaCache'] = fpa_analyzer.cache.stats()
+    print(json.dumps(summary, indent=2))
+    return 0 if summary['statuses'].get('error', 0) == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+import json
+import os
+
+# Strategy for inferring null cost drivers: 'sequential', 'concurrent' or 'single_shot'
+COST_DRIVER_INFERENCE_MODE = os.getenv('COST_DRIVER_INFERENCE_MODE', 'concurrent')
+
+# Maximum number of in-flight Groq calls when COST_DRIVER_INFERENCE_MODE is 'concurrent'
+COST_DRIVER_MAX_CONCURRENCY = int(os.getenv('COST_DRIVER_MAX_CONCURRENCY', '8'))
+
+# Function Point Analysis result cache (in-memory LRU, plus SQLite when FPA_CACHE_DB_PATH is set)
+FPA_CACHE_MAX_ENTRIES = int(os.getenv('FPA_CACHE_MAX_ENTRIES', '256'))
+FPA_CACHE_TTL_SECONDS = float(os.getenv('FPA_CACHE_TTL_SECONDS', str(7 * 24 * 3600)))
+FPA_CACHE_DB_PATH = os.getenv('FPA_CACHE_DB_PATH', '')
+
+# Near-duplicate documents (estimated shingle Jaccard similarity at or above the threshold)
+# reuse a cached FPA result, marked with fpaCache "similar" in the response; off (0) unless
+# an operator opts in, e.g. with 0.9, since the reused counts may miss the document's edits
+FPA_SIMILARITY_THRESHOLD = float(os.getenv('FPA_SIMILARITY_THRESHOLD', '0'))
+FPA_SIMILARITY_MAX_ENTRIES = int(os.getenv('FPA_SIMILARITY_MAX_ENTRIES', '50000'))
+
+# Process-wide memo of inferred cost driver ratings
+COST_DRIVER_MEMO_TTL_SECONDS = float(os.getenv('COST_DRIVER_MEMO_TTL_SECONDS', str(24 * 3600)))
+COST_DRIVER_MEMO_MAX_ENTRIES = int(os.getenv('COST_DRIVER_MEMO_MAX_ENTRIES', '256'))
+
+# JSON object of driver name to a fixed rating, e.g. {"rely": "High"}; pinned drivers are never sent to the LLM
+COST_DRIVER_PINNED_RATINGS = json.loads(os.getenv('COST_DRIVER_PINNED_RATINGS', '{}'))
+
+# LLM backend: 'groq' for the Groq API, 'local' for an OpenAI-compatible server such as Ollama
+# (e.g. LLM_PROVIDER=local LLM_BASE_URL=http://localhost:11434/v1); LLM_MODEL defaults per provider
+LLM_PROVIDER = os.getenv('LLM_PROVIDER', 'groq').lower()
+LLM_BASE_URL = os.getenv('LLM_BASE_URL', 'http://localhost:11434/v1')
+LLM_MODEL = os.getenv('LLM_MODEL', '')
+
+# Shared LLM client connection pool and timeouts
+LLM_MAX_CONNECTIONS = int(os.getenv('LLM_MAX_CONNECTIONS', '20'))
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv('LLM_MAX_KEEPALIVE_CONNECTIONS', '10'))
+LLM_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv('LLM_KEEPALIVE_EXPIRY_SECONDS', '30'))
+LLM_CONNECT_TIMEOUT_SECONDS = float(os.getenv('LLM_CONNECT_TIMEOUT_SECONDS', '5'))
+LLM_READ_TIMEOUT_SECONDS = float(os.getenv('LLM_READ_TIMEOUT_SECONDS', '60'))
+LLM_MAX_RETRIES = int(os.getenv('LLM_MAX_RETRIES', '2'))
+
+# Call policy applied to every completion: per-call timeout, deadline for all calls of one
+# analysis, capped exponential backoff between retries (LLM_MAX_RETRIES), optional hedged
+# duplicates after LLM_HEDGE_PERCENTILE of recent latencies (0 disables), and a circuit
+# breaker that skips the provider after consecutive transient failures
+LLM_CALL_TIMEOUT_SECONDS = float(os.getenv('LLM_CALL_TIMEOUT_SECONDS', '20'))
+LLM_REQUEST_DEADLINE_SECONDS = float(os.getenv('LLM_REQUEST_DEADLINE_SECONDS', '45'))
+LLM_BACKOFF_BASE_SECONDS = float(os.getenv('LLM_BACKOFF_BASE_SECONDS', '0.25'))
+LLM_BACKOFF_MAX_SECONDS = float(os.getenv('LLM_BACKOFF_MAX_SECONDS', '4'))
+LLM_HEDGE_PERCENTILE = float(os.getenv('LLM_HEDGE_PERCENTILE', '0'))
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv('LLM_HEDGE_MIN_SAMPLES', '20'))
+LLM_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('LLM_CIRCUIT_FAILURE_THRESHOLD', '5'))
+LLM_CIRCUIT_RESET_SECONDS = float(os.getenv('LLM_CIRCUIT_RESET_SECONDS', '30'))
+
+# Largest accepted requirements document upload, in bytes
+MAX_DOCUMENT_BYTES = int(os.getenv('MAX_DOCUMENT_BYTES', str(50 * 1024 * 1024)))
+
+# PDFs with at least this many pages are extracted in a process pool (0 disables parallel extraction)
+PDF_PARALLEL_PAGE_THRESHOLD = int(os.getenv('PDF_PARALLEL_PAGE_THRESHOLD', '64'))
+PDF_EXTRACTION_WORKERS = int(os.getenv('PDF_EXTRACTION_WORKERS', str(os.cpu_count() or 1)))
+
+# Documents above this many (estimated) tokens are analyzed in chunks; 0 sends the whole document in one prompt
+FPA_CHUNK_TOKEN_BUDGET = int(os.getenv('FPA_CHUNK_TOKEN_BUDGET', '6000'))
+FPA_MAX_CONCURRENCY = int(os.getenv('FPA_MAX_CONCURRENCY', '4'))
+
+# Background estimation jobs (POST /estimations?async=1)
+ESTIMATION_JOB_WORKERS = int(os.getenv('ESTIMATION_JOB_WORKERS', '4'))
+ESTIMATION_JOB_QUEUE_DEPTH = int(os.getenv('ESTIMATION_JOB_QUEUE_DEPTH', '32'))
+ESTIMATION_JOB_RESULT_TTL_SECONDS = float(os.getenv('ESTIMATION_JOB_RESULT_TTL_SECONDS', '3600'))
+# SQLite database holding job state, shared by all gunicorn workers so any of them can answer a poll
+# (an empty path shares the project store's database; it must be a file, not ':memory:', with more than one worker)
+ESTIMATION_JOB_STORE_PATH = os.getenv('ESTIMATION_JOB_STORE_PATH', '')
+
+# Extracted text is compacted (headers/footers, page numbers, TOC, duplicates, whitespace)
+# before Function Point Analysis; optionally non-requirement sections are dropped too
+TEXT_COMPACTION_ENABLED = os.getenv('TEXT_COMPACTION_ENABLED', '1').lower() in ('1', 'true', 'yes')
+TEXT_COMPACTION_DROP_SECTIONS = os.getenv('TEXT_COMPACTION_DROP_SECTIONS', '0').lower() in ('1', 'true', 'yes')
+
+# SQLite database holding saved estimation results
+PROJECT_STORE_PATH = os.getenv('PROJECT_STORE_PATH', 'projects.db')
+PROJECT_STORE_SEED_MOCK = os.getenv('PROJECT_STORE_SEED_MOCK', '1').lower() in ('1', 'true', 'yes')
+
+# Extracted text and FPA results kept for POST /estimations/<id>/recompute
+# (an empty path shares the project store's database, TTL 0 keeps them forever)
+ANALYSIS_STORE_PATH = os.getenv('ANALYSIS_STORE_PATH', '')
+ANALYSIS_STORE_TTL_SECONDS = float(os.getenv('ANALYSIS_STORE_TTL_SECONDS', str(30 * 24 * 3600)))
+
+# The effort model loads in a background thread; requests wait up to EFFORT_MODEL_WAIT_SECONDS for it
+EFFORT_MODEL_WARM_UP = os.getenv('EFFORT_MODEL_WARM_UP', '1').lower() in ('1', 'true', 'yes')
+EFFORT_MODEL_WAIT_SECONDS = float(os.getenv('EFFORT_MODEL_WAIT_SECONDS', '30'))
+
+# Concurrent predict_effort calls are coalesced into one forward pass of up to this many rows (0 or 1 disables)
+EFFORT_MODEL_MICRO_BATCH_SIZE = int(os.getenv('EFFORT_MODEL_MICRO_BATCH_SIZE', '32'))
+EFFORT_MODEL_MICRO_BATCH_WAIT_MS = float(os.getenv('EFFORT_MODEL_MICRO_BATCH_WAIT_MS', '2'))
+
+# Monte Carlo samples behind the P10/P50/P90 ranges in estimationResults.uncertainty, which are only
+# computed for requests with ?uncertainty=1 (0 disables them entirely)
+ESTIMATION_UNCERTAINTY_SAMPLES = int(os.getenv('ESTIMATION_UNCERTAINTY_SAMPLES', '20000'))
+
+# Log verbosity; DEBUG also logs documents, FPA results and cost drivers for each request
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
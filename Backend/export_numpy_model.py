@@ -0,0 +1,141 @@
+"""
+Export the trained Keras effort model to a TensorFlow-free .npz
+
+BatchNormalization layers are folded into the following Dense layer, Dropout
+is dropped (it is the identity at inference time) and the scaler_X/scaler_y
+MinMaxScaler parameters are stored alongside the weights, so that
+services.numpy_effort_engine.NumpyEffortEngine can serve predictions with
+NumPy alone.
+
+Usage:
+    python export_numpy_model.py [--model cocomo_effort_model.keras] [--output cocomo_effort_model.npz]
+"""
+import argparse
+import pickle
+import numpy as np
+import tensorflow as tf
+from services.numpy_effort_engine import NumpyEffortEngine
+
+
+def fold_keras_layers(model):
+    """
+    Convert a Dense/BatchNormalization/Dropout stack into folded Dense layers
+
+    A BatchNormalization that follows Dense(activation) computes h * s + t with
+    s = gamma / sqrt(moving_variance + epsilon) and t = beta - moving_mean * s,
+    which is absorbed into the next Dense as W' = s[:, None] * W and b' = t @ W + b.
+
+    :param model: Loaded Keras Sequential model
+    :return: Tuple of (weights, biases, activations)
+    """
+    weights, biases, activations = [], [], []
+    pending_scale, pending_shift = None, None
+
+    for layer in model.layers:
+        kind = layer.__class__.__name__
+
+        if kind == 'Dropout':
+            continue
+
+        if kind == 'BatchNormalization':
+            config = layer.get_config()
+            params = iter(layer.get_weights())
+            gamma = next(params) if config.get('scale', True) else None
+            beta = next(params) if config.get('center', True) else None
+            moving_mean, moving_variance = next(params), next(params)
+
+            scale = 1.0 / np.sqrt(moving_variance.astype(np.float64) + config['epsilon'])
+            if gamma is not None:
+                scale = scale * gamma
+            shift = -moving_mean * scale
+            if beta is not None:
+                shift = shift + beta
+
+            # Compose with any BatchNormalization that is still pending
+            if pending_scale is not None:
+                pending_shift = pending_shift * scale + shift
+                pending_scale = pending_scale * scale
+            else:
+                pending_scale, pending_shift = scale, shift
+            continue
+
+        if kind == 'Dense':
+            kernel, bias = (p.astype(np.float64) for p in layer.get_weights())
+            if pending_scale is not None:
+                bias = pending_shift @ kernel + bias
+                kernel = pending_scale[:, None] * kernel
+                pending_scale, pending_shift = None, None
+            weights.append(kernel)
+            biases.append(bias)
+            activations.append(layer.get_config().get('activation', 'linear'))
+            continue
+
+        raise ValueError(f"Cannot export layer of type {kind}")
+
+    if pending_scale is not None:
+        raise ValueError("Model ends with a BatchNormalization layer that cannot be folded")
+
+    return weights, biases, activations
+
+
+def export_model(model_path, scaler_X_path, scaler_y_path, output_path):
+    """
+    Export the Keras model and scalers to a single .npz file
+
+    :param model_path: Path to the saved Keras model
+    :param scaler_X_path: Path to the pickled MinMaxScaler for input features
+    :param scaler_y_path: Path to the pickled MinMaxScaler for output labels
+    :param output_path: Destination .npz path
+    :return: Loaded Keras model (for verification)
+    """
+    model = tf.keras.models.load_model(model_path)
+    with open(scaler_X_path, 'rb') as f:
+        scaler_X = pickle.load(f)
+    with open(scaler_y_path, 'rb') as f:
+        scaler_y = pickle.load(f)
+
+    weights, biases, activations = fold_keras_layers(model)
+
+    arrays = {
+        'layer_count': np.array(len(weights)),
+        'activations': np.array(activations),
+        'x_scale': scaler_X.scale_.astype(np.float64),
+        'x_min': scaler_X.min_.astype(np.float64),
+        'y_scale': scaler_y.scale_.astype(np.float64),
+        'y_min': scaler_y.min_.astype(np.float64)
+    }
+    for i, (kernel, bias) in enumerate(zip(weights, biases)):
+        arrays[f'W_{i}'] = kernel
+        arrays[f'b_{i}'] = bias
+
+    # Uncompressed so the arrays can be memory-mapped
+    np.savez(output_path, **arrays)
+    return model, scaler_X, scaler_y
+
+
+def verify_export(model, scaler_X, scaler_y, output_path, samples=1000, seed=0):
+    """
+    Compare Keras and NumPy predictions on random inputs within the scaler range
+
+    :return: Maximum absolute difference in person-months
+    """
+    rng = np.random.default_rng(seed)
+    X = rng.uniform(scaler_X.data_min_, scaler_X.data_max_, size=(samples, len(scaler_X.data_min_)))
+
+    expected = scaler_y.inverse_transform(model.predict(scaler_X.transform(X), verbose=0))[:, 0]
+    actual = NumpyEffortEngine.load(output_path).predict(X)
+
+    return float(np.max(np.abs(expected - actual)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the effort model for TensorFlow-free inference")
+    parser.add_argument('--model', default='cocomo_effort_model.keras')
+    parser.add_argument('--scaler-x', default='scaler_X.pkl')
+    parser.add_argument('--scaler-y', default='scaler_y.pkl')
+    parser.add_argument('--output', default='cocomo_effort_model.npz')
+    args = parser.parse_args()
+
+    model, scaler_X, scaler_y = export_model(args.model, args.scaler_x, args.scaler_y, args.output)
+    max_error = verify_export(model, scaler_X, scaler_y, args.output)
+    print(f"Exported {args.model} to {args.output} (max abs difference vs Keras: {max_error:.6g})")
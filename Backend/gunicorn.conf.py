@@ -0,0 +1,30 @@
+"""
+Gunicorn settings for serving the estimation API: gunicorn -c gunicorn.conf.py wsgi:app
+"""
+import gc
+import os
+
+bind = os.getenv('BIND', '0.0.0.0:5000')
+
+# One process per core; threads cover the time requests spend waiting on the LLM
+workers = int(os.getenv('WEB_CONCURRENCY', str(os.cpu_count() or 1)))
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+
+# Full-document estimations can spend minutes in LLM calls
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '300'))
+graceful_timeout = 30
+
+# Import the app (and the NumPy model weights) once in the master, then fork
+preload_app = True
+
+def pre_fork(server, worker):
+    # Move everything allocated so far out of the collector's reach, so the first GC pass
+    # in a worker does not write to (and so copy) every shared page holding those objects
+    gc.freeze()
+
+def post_fork(server, worker):
+    # Workers load the Keras model themselves when it could not be shared from the master
+    import wsgi
+    if not wsgi.PRELOAD_MODEL:
+        wsgi.model_loader.start()
@@ -0,0 +1,92 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+class AnalysisStore:
+    def __init__(self, db_path, ttl_seconds=None):
+        """
+        SQLite store of extracted requirements text and FPA results, so estimates can be
+        recomputed with new cost drivers without re-uploading or re-analyzing the document
+
+        :param db_path: Path to the SQLite database file (':memory:' for a throwaway store)
+        :param ttl_seconds: Seconds after which an analysis can no longer be recomputed (None keeps them forever)
+        """
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # Connect eagerly so a bad path fails at startup rather than on the first request
+        self._connection = self._connect()
+        self._connection_pid = os.getpid()
+
+    @property
+    def _conn(self):
+        # SQLite connections must not cross fork(), so each pre-fork worker opens its own
+        if self._connection_pid != os.getpid():
+            self._connection = self._connect()
+            self._connection_pid = os.getpid()
+        return self._connection
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        if self.db_path != ':memory:':
+            conn.execute('PRAGMA journal_mode=WAL')
+        conn.executescript('''
+            CREATE TABLE IF NOT EXISTS analyses (
+                id TEXT PRIMARY KEY,
+                created_at REAL NOT NULL,
+                extracted_text TEXT NOT NULL,
+                fpa_analysis TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_analyses_created_at ON analyses (created_at);
+        ''')
+        conn.commit()
+        return conn
+
+    def add(self, extracted_text, fpa_analysis):
+        """
+        Save an analysis, and purge analyses past their TTL
+
+        :param extracted_text: Text extracted from the requirements document
+        :param fpa_analysis: FPA counts and examples for the text
+        :return: New analysis id
+        """
+        analysis_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            # Expired rows that are never requested again would otherwise stay forever
+            if self.ttl_seconds:
+                self._conn.execute('DELETE FROM analyses WHERE created_at < ?', (now - self.ttl_seconds,))
+            self._conn.execute(
+                'INSERT INTO analyses (id, created_at, extracted_text, fpa_analysis) VALUES (?, ?, ?, ?)',
+                (analysis_id, now, extracted_text, json.dumps(fpa_analysis))
+            )
+            self._conn.commit()
+        return analysis_id
+
+    def get(self, analysis_id):
+        """
+        :param analysis_id: Id returned by add
+        :return: Dictionary with extractedText and fpaAnalysis, or None if unknown or expired
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT created_at, extracted_text, fpa_analysis FROM analyses WHERE id = ?', (analysis_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        if self.ttl_seconds and row['created_at'] + self.ttl_seconds < time.time():
+            self.delete(analysis_id)
+            return None
+        return {
+            "extractedText": row['extracted_text'],
+            "fpaAnalysis": json.loads(row['fpa_analysis'])
+        }
+
+    def delete(self, analysis_id):
+        with self._lock:
+            self._conn.execute('DELETE FROM analyses WHERE id = ?', (analysis_id,))
+            self._conn.commit()
@@ -0,0 +1,76 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+class JobStore:
+    def __init__(self, db_path, ttl_seconds=None):
+        """
+        SQLite store of asynchronous estimation job snapshots, so a job queued in one
+        pre-fork worker can be polled through any other worker
+
+        :param db_path: Path to the SQLite database file (':memory:' for a throwaway store)
+        :param ttl_seconds: Seconds a job snapshot is kept after its last update (None keeps them forever)
+        """
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # Connect eagerly so a bad path fails at startup rather than on the first request
+        self._connection = self._connect()
+        self._connection_pid = os.getpid()
+
+    @property
+    def _conn(self):
+        # SQLite connections must not cross fork(), so each pre-fork worker opens its own
+        if self._connection_pid != os.getpid():
+            self._connection = self._connect()
+            self._connection_pid = os.getpid()
+        return self._connection
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        if self.db_path != ':memory:':
+            conn.execute('PRAGMA journal_mode=WAL')
+        conn.executescript('''
+            CREATE TABLE IF NOT EXISTS estimation_jobs (
+                id TEXT PRIMARY KEY,
+                updated_at REAL NOT NULL,
+                payload TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_estimation_jobs_updated_at ON estimation_jobs (updated_at);
+        ''')
+        conn.commit()
+        return conn
+
+    def save(self, job):
+        """
+        Insert or replace a job snapshot, and purge snapshots past their TTL
+
+        :param job: Job snapshot with at least jobId (see EstimationJobManager.get)
+        """
+        now = time.time()
+        with self._lock:
+            if self.ttl_seconds:
+                self._conn.execute('DELETE FROM estimation_jobs WHERE updated_at < ?', (now - self.ttl_seconds,))
+            self._conn.execute(
+                'INSERT OR REPLACE INTO estimation_jobs (id, updated_at, payload) VALUES (?, ?, ?)',
+                (job['jobId'], now, json.dumps(job))
+            )
+            self._conn.commit()
+
+    def get(self, job_id):
+        """
+        :param job_id: Job id
+        :return: Last saved snapshot of the job, or None if unknown or expired
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT updated_at, payload FROM estimation_jobs WHERE id = ?', (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        if self.ttl_seconds and row['updated_at'] + self.ttl_seconds < time.time():
+            return None
+        return json.loads(row['payload'])
@@ -0,0 +1,175 @@
+import base64
+import json
+import os
+import sqlite3
+import threading
+
+# Fields stored outside the JSON payload so summary listings never have to load them
+LARGE_FIELDS = ('extractedRequirementsText',)
+
+# Value of list(fields=...) that returns every field except LARGE_FIELDS
+SUMMARY_FIELDS = 'summary'
+
+class ProjectStore:
+    def __init__(self, db_path):
+        """
+        Persistent SQLite store for estimation results
+
+        :param db_path: Path to the SQLite database file (':memory:' for a throwaway store)
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        # Connect eagerly so a bad path fails at startup rather than on the first request
+        self._connection = self._connect()
+        self._connection_pid = os.getpid()
+
+    @property
+    def _conn(self):
+        # SQLite connections must not cross fork(), so each pre-fork worker opens its own
+        if self._connection_pid != os.getpid():
+            self._connection = self._connect()
+            self._connection_pid = os.getpid()
+        return self._connection
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        if self.db_path != ':memory:':
+            conn.execute('PRAGMA journal_mode=WAL')
+        conn.executescript('''
+            CREATE TABLE IF NOT EXISTS projects (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                project_name TEXT NOT NULL,
+                date_created TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                extracted_text TEXT,
+                expose_id INTEGER NOT NULL DEFAULT 1
+            );
+            CREATE INDEX IF NOT EXISTS idx_projects_date_created ON projects (date_created, id);
+            CREATE INDEX IF NOT EXISTS idx_projects_name ON projects (project_name, date_created, id);
+        ''')
+        # Stores created before expose_id existed get the column with the default
+        if 'expose_id' not in {row['name'] for row in conn.execute('PRAGMA table_info(projects)')}:
+            conn.execute('ALTER TABLE projects ADD COLUMN expose_id INTEGER NOT NULL DEFAULT 1')
+        conn.commit()
+        return conn
+
+    def add(self, project, expose_id=True):
+        """
+        Save an estimation result
+
+        :param project: Estimation payload with at least projectName and dateCreated
+        :param expose_id: Return the id with the project from list (the seeded mock projects never had one)
+        :return: Id of the stored project
+        """
+        payload = {key: value for key, value in project.items() if key not in LARGE_FIELDS and key != 'id'}
+        with self._lock:
+            cursor = self._conn.execute(
+                'INSERT INTO projects (project_name, date_created, payload, extracted_text, expose_id) VALUES (?, ?, ?, ?, ?)',
+                (
+                    project.get('projectName', 'Generated Project'),
+                    project['dateCreated'],
+                    json.dumps(payload),
+                    project.get('extractedRequirementsText'),
+                    int(bool(expose_id))
+                )
+            )
+            self._conn.commit()
+            return cursor.lastrowid
+
+    def get(self, project_id):
+        """
+        :param project_id: Id returned by add
+        :return: Full stored project, or None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT id, payload, extracted_text FROM projects WHERE id = ?', (project_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        project = json.loads(row['payload'])
+        project['id'] = row['id']
+        project['extractedRequirementsText'] = row['extracted_text']
+        return project
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM projects').fetchone()[0]
+
+    def list(self, limit=50, cursor=None, name=None, created_after=None, created_before=None, fields=None):
+        """
+        List projects newest first, one keyset-paginated page at a time
+
+        :param limit: Maximum number of projects in the page
+        :param cursor: Opaque cursor returned by the previous page
+        :param name: Only projects whose name starts with this prefix
+        :param created_after: Only projects with dateCreated >= this ISO timestamp
+        :param created_before: Only projects with dateCreated < this ISO timestamp
+        :param fields: Top-level fields to return, SUMMARY_FIELDS for everything except LARGE_FIELDS, or None for every field
+        :return: Tuple of (list of projects, cursor for the next page or None)
+        """
+        clauses, params = [], []
+        if name:
+            # Range scan on the name index instead of LIKE, which SQLite cannot index case-sensitively
+            clauses.append('project_name >= ? AND project_name < ?')
+            params.extend([name, name + '\U0010ffff'])
+        if created_after:
+            clauses.append('date_created >= ?')
+            params.append(created_after)
+        if created_before:
+            clauses.append('date_created < ?')
+            params.append(created_before)
+        if cursor:
+            cursor_date, cursor_id = decode_cursor(cursor)
+            clauses.append('(date_created < ? OR (date_created = ? AND id < ?))')
+            params.extend([cursor_date, cursor_date, cursor_id])
+
+        summary = fields == SUMMARY_FIELDS
+        if summary:
+            fields = None
+        include_text = not summary and (fields is None or any(field in LARGE_FIELDS for field in fields))
+        columns = 'id, date_created, payload, expose_id' + (', extracted_text' if include_text else '')
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+
+        # One extra row tells us whether there is a next page
+        with self._lock:
+            rows = self._conn.execute(
+                f'SELECT {columns} FROM projects {where} ORDER BY date_created DESC, id DESC LIMIT ?',
+                params + [limit + 1]
+            ).fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]['date_created'], rows[-1]['id'])
+
+        projects = []
+        for row in rows:
+            project = json.loads(row['payload'])
+            if row['expose_id']:
+                project['id'] = row['id']
+            if include_text and row['extracted_text'] is not None:
+                project['extractedRequirementsText'] = row['extracted_text']
+            if fields is not None:
+                project = {field: project[field] for field in fields if field in project}
+            projects.append(project)
+
+        return projects, next_cursor
+
+def encode_cursor(date_created, project_id):
+    """
+    :return: Opaque URL-safe cursor for the position after (date_created, project_id)
+    """
+    return base64.urlsafe_b64encode(json.dumps([date_created, project_id]).encode('utf-8')).decode('ascii')
+
+def decode_cursor(cursor):
+    """
+    :return: Tuple of (date_created, project_id) encoded by encode_cursor
+    :raises ValueError: If the cursor is malformed
+    """
+    try:
+        date_created, project_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return str(date_created), int(project_id)
+    except Exception:
+        raise ValueError(f"Invalid cursor '{cursor}'")
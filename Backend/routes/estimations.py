@@ -1,128 +1,430 @@
+import io
 import json
+import logging
+import traceback
 from datetime import datetime
-from flask import jsonify, request
-from services.document_extractor import extract_text_from_document
-from services.function_point_analysis import FunctionPointAnalyzer
-from services.cost_drivers_analyzer import process_cost_drivers
+from flask import jsonify, request, url_for
+from werkzeug.datastructures import FileStorage
+from models.analysis_store import AnalysisStore
+from services.document_extractor import open_document_stream, DocumentTooLargeError
+from services.function_point_analysis import FunctionPointAnalyzer, calculate_vaf, validate_fpa_analysis
+from services.cost_drivers_analyzer import CostDriversAnalyzer, process_cost_drivers, DRIVER_RATING_MEMO
 from services.effort_estimation_model import EffortEstimationModel
+from services.model_loader import EffortModelLoader, ModelNotReadyError
+from services.cache import FPAResultCache
+from services.similarity_index import MinHashLSHIndex
+from services.llm_client import DEFAULT_MODELS, create_llm_client
+from services.llm_policy import CircuitBreaker, LLMCallPolicy
+from services.estimation_pipeline import EstimationPipeline
+from services.uncertainty import EffortUncertaintySimulator
+from services.text_compaction import TextCompactor
+from services.scenarios import run_scenario_matrix
+from services.sensitivity import DEFAULT_KLOC_STEPS, kloc_sweep_values, resolve_baseline_ratings, run_sensitivity_sweep
+from services.estimation_jobs import EstimationJobManager, JobQueueFullError
+from services.metrics import REGISTRY, timed_stage
+import config
 
-def register_estimations_routes(app, groq_api_key):
+logger = logging.getLogger(__name__)
+
+def register_estimations_routes(app, groq_api_key, project_store=None, llm_client=None, model_loader=None, analysis_store=None,
+                                job_store=None):
     """
     Register estimation-related routes
     
     :param app: Flask application instance
     :param groq_api_key: API key for Groq
+    :param project_store: Optional ProjectStore that every generated estimation is saved to
+    :param llm_client: Optional pre-built LLM client (e.g. a fake for benchmarks); a pooled Groq client is created if omitted
+    :param model_loader: Optional EffortModelLoader; one that loads EffortEstimationModel in the background is started if omitted
+    :param analysis_store: Optional AnalysisStore for POST /estimations/<id>/recompute; an in-memory store is used if omitted
+    :param job_store: Optional JobStore that makes async jobs pollable from every server process; jobs stay in this process if omitted
     """
-    fpa_analyzer = FunctionPointAnalyzer(groq_api_key)
-    effort_model = EffortEstimationModel()  # Initialize the effort estimation model
+    fpa_cache = FPAResultCache(
+        max_entries=config.FPA_CACHE_MAX_ENTRIES,
+        ttl_seconds=config.FPA_CACHE_TTL_SECONDS or None,
+        db_path=config.FPA_CACHE_DB_PATH or None,
+        similarity_index=MinHashLSHIndex(
+            threshold=config.FPA_SIMILARITY_THRESHOLD,
+            max_entries=config.FPA_SIMILARITY_MAX_ENTRIES
+        ) if config.FPA_SIMILARITY_THRESHOLD > 0 else None
+    )
+    DRIVER_RATING_MEMO.configure(
+        ttl_seconds=config.COST_DRIVER_MEMO_TTL_SECONDS or None,
+        max_entries=config.COST_DRIVER_MEMO_MAX_ENTRIES,
+        pinned_ratings=config.COST_DRIVER_PINNED_RATINGS
+    )
+
+    # One pooled client shared by both analyzers for the lifetime of the app
+    if llm_client is None:
+        llm_client = create_llm_client(
+            groq_api_key if config.LLM_PROVIDER == 'groq' else None,
+            max_connections=config.LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=config.LLM_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=config.LLM_KEEPALIVE_EXPIRY_SECONDS,
+            connect_timeout=config.LLM_CONNECT_TIMEOUT_SECONDS,
+            read_timeout=config.LLM_READ_TIMEOUT_SECONDS,
+            # Retries are owned by the call policy below, so the client itself never retries
+            max_retries=0,
+            provider=config.LLM_PROVIDER,
+            base_url=config.LLM_BASE_URL
+        )
+    llm_model = config.LLM_MODEL or DEFAULT_MODELS.get(config.LLM_PROVIDER, DEFAULT_MODELS['groq'])
+    llm_circuit_breaker = CircuitBreaker(
+        failure_threshold=config.LLM_CIRCUIT_FAILURE_THRESHOLD,
+        reset_seconds=config.LLM_CIRCUIT_RESET_SECONDS
+    )
+    llm_call_policy = LLMCallPolicy(
+        call_timeout=config.LLM_CALL_TIMEOUT_SECONDS or None,
+        request_timeout=config.LLM_REQUEST_DEADLINE_SECONDS or None,
+        max_attempts=config.LLM_MAX_RETRIES + 1,
+        backoff_base_seconds=config.LLM_BACKOFF_BASE_SECONDS,
+        backoff_max_seconds=config.LLM_BACKOFF_MAX_SECONDS,
+        hedge_percentile=config.LLM_HEDGE_PERCENTILE or None,
+        hedge_min_samples=config.LLM_HEDGE_MIN_SAMPLES,
+        circuit_breaker=llm_circuit_breaker,
+        # Room for one hedge per pooled connection
+        max_workers=2 * config.LLM_MAX_CONNECTIONS
+    )
+    fpa_analyzer = FunctionPointAnalyzer(
+        client=llm_client,
+        model=llm_model,
+        call_policy=llm_call_policy,
+        cache=fpa_cache,
+        chunk_token_budget=config.FPA_CHUNK_TOKEN_BUDGET or None,
+        max_concurrency=config.FPA_MAX_CONCURRENCY
+    )
+    cost_drivers_analyzer = CostDriversAnalyzer(
+        client=llm_client,
+        model=llm_model,
+        call_policy=llm_call_policy,
+        inference_mode=config.COST_DRIVER_INFERENCE_MODE,
+        max_concurrency=config.COST_DRIVER_MAX_CONCURRENCY
+    )
+    # The effort model loads in the background so the app can bind its port immediately
+    if model_loader is None:
+        model_loader = EffortModelLoader(
+            EffortEstimationModel,
+            warm_up=config.EFFORT_MODEL_WARM_UP,
+            wait_seconds=config.EFFORT_MODEL_WAIT_SECONDS,
+            micro_batch_size=config.EFFORT_MODEL_MICRO_BATCH_SIZE,
+            micro_batch_wait_seconds=config.EFFORT_MODEL_MICRO_BATCH_WAIT_MS / 1000
+        ).start()
+
+    if analysis_store is None:
+        analysis_store = AnalysisStore(':memory:', ttl_seconds=config.ANALYSIS_STORE_TTL_SECONDS or None)
+
+    pipeline = EstimationPipeline(
+        fpa_analyzer,
+        cost_drivers_analyzer,
+        model_loader,
+        max_document_bytes=config.MAX_DOCUMENT_BYTES,
+        parallel_page_threshold=config.PDF_PARALLEL_PAGE_THRESHOLD or None,
+        pdf_workers=config.PDF_EXTRACTION_WORKERS,
+        project_store=project_store,
+        uncertainty_simulator=EffortUncertaintySimulator(config.ESTIMATION_UNCERTAINTY_SAMPLES) if config.ESTIMATION_UNCERTAINTY_SAMPLES > 0 else None,
+        analysis_store=analysis_store,
+        text_compactor=TextCompactor(drop_sections=config.TEXT_COMPACTION_DROP_SECTIONS) if config.TEXT_COMPACTION_ENABLED else None
+    )
+    job_manager = EstimationJobManager(
+        pipeline,
+        max_workers=config.ESTIMATION_JOB_WORKERS,
+        max_queue_depth=config.ESTIMATION_JOB_QUEUE_DEPTH,
+        result_ttl_seconds=config.ESTIMATION_JOB_RESULT_TTL_SECONDS,
+        store=job_store
+    )
+
+    # Cache effectiveness and job queue state are read from the live objects at scrape time
+    REGISTRY.gauge_callback(
+        'cache_hits_total', 'Cache hits by cache',
+        lambda: {('function_point_analysis',): fpa_cache.stats()['hits'], ('cost_driver_rating',): DRIVER_RATING_MEMO.stats()['hits']},
+        ('cache',), metric_type='counter'
+    )
+    REGISTRY.gauge_callback(
+        'cache_misses_total', 'Cache misses by cache',
+        lambda: {('function_point_analysis',): fpa_cache.stats()['misses'], ('cost_driver_rating',): DRIVER_RATING_MEMO.stats()['misses']},
+        ('cache',), metric_type='counter'
+    )
+    REGISTRY.gauge_callback(
+        'cache_hit_ratio', 'Cache hit ratio by cache',
+        lambda: {('function_point_analysis',): fpa_cache.stats()['hitRatio'], ('cost_driver_rating',): DRIVER_RATING_MEMO.stats()['hitRatio']},
+        ('cache',)
+    )
+    REGISTRY.gauge_callback(
+        'llm_circuit_open', 'Whether the LLM circuit breaker is failing calls fast (1) or not (0)',
+        lambda: int(llm_circuit_breaker.state == 'open')
+    )
+    REGISTRY.gauge_callback(
+        'estimation_jobs', 'Asynchronous estimation jobs by status',
+        lambda: {(status,): count for status, count in job_manager.stats().items()},
+        ('status',)
+    )
 
     @app.route('/estimations', methods=['POST'])
     def generate_estimation():
         """
         Endpoint to handle estimation generation
-        Echoes back the received data with a mock estimation result
+        With ?async=1 the pipeline runs as a background job and a job id is returned immediately
+        With ?uncertainty=1 estimationResults also carries Monte Carlo P10/P50/P90 ranges
         """
         try:
             # Log the incoming request data
-            print(f"Request Data: {request.form.to_dict()}")
+            logger.debug("Request Data: %s", request.form)
             
-            # Extract text from requirements document if provided
             requirements_doc = request.files.get('requirementsDocument')
-            extracted_text = ""
-            fpa_analysis = {
-                "EI": {"count": 0, "examples": []},
-                "EO": {"count": 0, "examples": []},
-                "EQ": {"count": 0, "examples": []},
-                "ILF": {"count": 0, "examples": []},
-                "EIF": {"count": 0, "examples": []}
-            }
-            
-            if requirements_doc:
-                # Extract text from the document
-                extracted_text = extract_text_from_document(requirements_doc)
-                print("Extracted Document Text:", extracted_text[:500] + "..." if len(extracted_text) > 500 else extracted_text)
-                
-                # Perform Function Point Analysis
-                fpa_analysis = fpa_analyzer.analyze_requirements(extracted_text)
-                print("Function Point Analysis:", fpa_analysis)
-
-            # Parse and process cost drivers
             cost_drivers = json.loads(request.form.get('costDrivers', '[]'))
-            print("Original Cost Drivers:", cost_drivers)
+            include_uncertainty = request.args.get('uncertainty', '').lower() in ('1', 'true', 'yes')
 
-            # Process cost drivers with null values
-            processed_cost_drivers = process_cost_drivers(cost_drivers, groq_api_key)
-            print("Processed Cost Drivers:", processed_cost_drivers)
-
-            # Calculate effort multiplier as the product of numerical values of processed cost drivers
-            effort_multiplier = 1.0
-            for driver in processed_cost_drivers:
-                effort_multiplier *= driver.get('numerical_value', 1.0)
-            print(f"Effort Multiplier: {effort_multiplier}")
-
-            # Calculate project metrics
-            estimation_results = fpa_analyzer.calculate_project_metrics(fpa_analysis)
-            print("Estimation Results:", estimation_results)
-            
-            # Update estimation results with the calculated effort multiplier
-            estimation_results['effortMultiplier'] = effort_multiplier
+            if request.args.get('async', '').lower() in ('1', 'true', 'yes'):
+                # The request stream is gone once we return, so the job gets an in-memory copy
+                job_document = None
+                if requirements_doc:
+                    stream = open_document_stream(requirements_doc, max_bytes=config.MAX_DOCUMENT_BYTES)
+                    job_document = FileStorage(stream=io.BytesIO(stream.read()), filename=requirements_doc.filename)
+                
+                job_id = job_manager.submit(job_document, cost_drivers, include_uncertainty=include_uncertainty)
+                return jsonify({
+                    "jobId": job_id,
+                    "status": "queued",
+                    "statusUrl": url_for('get_estimation_job', job_id=job_id)
+                }), 202
 
-            # Get estimated KLOC from project metrics
-            estimated_kloc = estimation_results.get('estimatedKLOC', 0)
-            print(f"Estimated KLOC: {estimated_kloc}")
-            
-            # Predict effort using the trained model
-            predicted_effort = effort_model.predict_effort(processed_cost_drivers, estimated_kloc)
-            print(f"Predicted Effort: {predicted_effort}")
-            
-            # Calculate development time
-            development_time = effort_model.calculate_development_time(predicted_effort, estimated_kloc)
-            print(f"Development Time: {development_time}")
-
-            # Update estimation results with predicted effort and time
-            estimation_results['developmentEffort'] = predicted_effort
-            estimation_results['developmentTime'] = development_time
-
-            # Prepare response 
-            response_data = {
-                "projectName": "Generated Project",
-                "dateCreated": datetime.now().isoformat(),
-                "extractedRequirementsText": extracted_text,
-                "functionPointAnalysis": {
-                    "externalInputs": {
-                        "count": fpa_analysis['EI']['count'],
-                        "modules": fpa_analysis['EI']['examples']
-                    },
-                    "externalOutputs": {
-                        "count": fpa_analysis['EO']['count'],
-                        "modules": fpa_analysis['EO']['examples']
-                    },
-                    "externalInquiries": {
-                        "count": fpa_analysis['EQ']['count'],
-                        "modules": fpa_analysis['EQ']['examples']
-                    },
-                    "internalLogicalFiles": {
-                        "count": fpa_analysis['ILF']['count'],
-                        "modules": fpa_analysis['ILF']['examples']
-                    },
-                    "externalInterfaceFiles": {
-                        "count": fpa_analysis['EIF']['count'],
-                        "modules": fpa_analysis['EIF']['examples']
-                    }
-                },
-                "estimationResults": estimation_results,
-                "receivedCostDrivers": cost_drivers,
-                "processedCostDrivers": processed_cost_drivers 
-            }
-            
-            return jsonify(response_data), 200
+            response_data = pipeline.run(requirements_doc, cost_drivers, include_uncertainty=include_uncertainty)
+            with timed_stage('serialization'):
+                response = jsonify(response_data)
+            return response, 200
+        
+        except DocumentTooLargeError as e:
+            return jsonify({"error": str(e)}), 413
+        
+        except JobQueueFullError as e:
+            return jsonify({"error": str(e)}), 503
+        
+        except ModelNotReadyError as e:
+            return jsonify({"error": str(e)}), 503, {'Retry-After': '5'}
         
         except Exception as e:
             # More detailed error logging
-            import traceback
-            print("Full Error Traceback:")
-            traceback.print_exc()
+            logger.exception("Estimation failed")
+            return jsonify({
+                "error": str(e),
+                "traceback": traceback.format_exc()
+            }), 400
+
+    @app.route('/estimations/<analysis_id>/recompute', methods=['POST'])
+    def recompute_estimation(analysis_id):
+        """
+        Re-estimate a previous analysis with new cost drivers and/or language, without
+        re-uploading the document or repeating extraction and Function Point Analysis
+        With ?uncertainty=1 estimationResults also carries Monte Carlo P10/P50/P90 ranges
+        """
+        try:
+            data = request.get_json(silent=True) or {}
+            if not isinstance(data, dict):
+                return jsonify({"error": "Request body must be a JSON object"}), 400
+            cost_drivers = data.get('costDrivers', [])
+            if not isinstance(cost_drivers, list):
+                return jsonify({"error": "'costDrivers' must be a list"}), 400
+            if not all(isinstance(driver, dict) and 'driver' in driver and 'value' in driver for driver in cost_drivers):
+                return jsonify({"error": "Every cost driver must be an object with 'driver' and 'value'"}), 400
+
+            with timed_stage('recompute'):
+                response_data = pipeline.recompute(
+                    analysis_id,
+                    cost_drivers,
+                    language=data.get('language', 'Java'),
+                    include_uncertainty=request.args.get('uncertainty', '').lower() in ('1', 'true', 'yes')
+                )
+            if response_data is None:
+                return jsonify({"error": f"Unknown or expired analysis '{analysis_id}'"}), 404
+            return jsonify(response_data), 200
+
+        except ModelNotReadyError as e:
+            return jsonify({"error": str(e)}), 503, {'Retry-After': '5'}
+
+        except (ValueError, KeyError, TypeError) as e:
+            return jsonify({"error": str(e)}), 400
+
+    @app.route('/estimations/jobs/<job_id>', methods=['GET'])
+    def get_estimation_job(job_id):
+        """
+        Endpoint to poll an asynchronous estimation job for per-stage progress and its result
+        """
+        job = job_manager.get(job_id)
+        if job is None:
+            return jsonify({"error": f"Unknown estimation job '{job_id}'"}), 404
+        return jsonify(job), 200
+
+    @app.route('/estimations/cache', methods=['GET'])
+    def get_estimation_cache_stats():
+        """
+        Endpoint to inspect the Function Point Analysis and cost driver rating cache counters
+        """
+        return jsonify({
+            "functionPointAnalysis": fpa_cache.stats(),
+            "costDriverRatings": DRIVER_RATING_MEMO.stats()
+        }), 200
+
+    @app.route('/estimations/batch', methods=['POST'])
+    def generate_batch_estimation():
+        """
+        Endpoint to estimate a portfolio of projects in one request
+        Expects JSON of the form {"projects": [{"projectName", "costDrivers", "estimatedKLOC" | "functionPointAnalysis", "language"}]}
+        All projects are scored with a single model invocation
+        """
+        try:
+            payload = request.get_json(force=True) or {}
+            projects = payload.get('projects', [])
+            if not isinstance(projects, list) or not projects:
+                return jsonify({"error": "'projects' must be a non-empty list"}), 400
+
+            batch_cost_drivers = []
+            batch_klocs = []
+            batch_results = []
+            for project in projects:
+                # Process cost drivers with null values
+                processed_cost_drivers = process_cost_drivers(project.get('costDrivers', []), analyzer=cost_drivers_analyzer)
+
+                # Effort multiplier as the product of numerical values of processed cost drivers
+                effort_multiplier = 1.0
+                for driver in processed_cost_drivers:
+                    effort_multiplier *= driver.get('numerical_value', 1.0)
+
+                # Use the supplied KLOC, or derive it from supplied FPA counts
+                if 'estimatedKLOC' in project:
+                    estimated_kloc = float(project['estimatedKLOC'])
+                    estimation_results = {
+                        "totalFunctionPoints": None,
+                        "projectSize": estimated_kloc,
+                        "estimatedKLOC": estimated_kloc
+                    }
+                else:
+                    estimation_results = fpa_analyzer.calculate_project_metrics(
+                        project.get('functionPointAnalysis', {}),
+                        language=project.get('language', 'Java')
+                    )
+                    estimated_kloc = estimation_results.get('estimatedKLOC', 0)
+                estimation_results['effortMultiplier'] = effort_multiplier
+
+                batch_cost_drivers.append(processed_cost_drivers)
+                batch_klocs.append(estimated_kloc)
+                batch_results.append({
+                    "projectName": project.get('projectName', 'Generated Project'),
+                    "estimationResults": estimation_results,
+                    "processedCostDrivers": processed_cost_drivers
+                })
+
+            # Predict effort for all projects at once
+            effort_model = model_loader.get()
+            predicted_efforts = effort_model.predict_effort_batch(batch_cost_drivers, batch_klocs)
+
+            date_created = datetime.now().isoformat()
+            for result, predicted_effort, estimated_kloc in zip(batch_results, predicted_efforts, batch_klocs):
+                result['dateCreated'] = date_created
+                result['estimationResults']['developmentEffort'] = predicted_effort
+                result['estimationResults']['developmentTime'] = effort_model.calculate_development_time(predicted_effort, estimated_kloc)
+
+            return jsonify({"projects": batch_results}), 200
+
+        except ModelNotReadyError as e:
+            return jsonify({"error": str(e)}), 503, {'Retry-After': '5'}
+
+        except Exception as e:
+            logger.exception("Batch estimation failed")
             return jsonify({
                 "error": str(e),
                 "traceback": traceback.format_exc()
             }), 400
+
+    @app.route('/estimations/sensitivity', methods=['POST'])
+    def generate_sensitivity_sweep():
+        """
+        Endpoint for what-if analysis without re-running extraction or the LLM
+        Expects JSON of the form {"costDrivers", "estimatedKLOC" | "functionPointAnalysis", "language",
+        "klocRange": {"min", "max", "steps"}}; null or missing drivers are taken as Nominal, steps is at most MAX_KLOC_STEPS
+        Every one-at-a-time rating change and the KLOC sweep are scored in a single model invocation
+        """
+        try:
+            payload = request.get_json(force=True) or {}
+            if not isinstance(payload, dict):
+                return jsonify({"error": "Request body must be a JSON object"}), 400
+            if 'estimatedKLOC' in payload:
+                estimated_kloc = float(payload['estimatedKLOC'])
+            elif 'functionPointAnalysis' in payload:
+                estimated_kloc = fpa_analyzer.calculate_project_metrics(
+                    payload['functionPointAnalysis'],
+                    language=payload.get('language', 'Java')
+                )['estimatedKLOC']
+            else:
+                return jsonify({"error": "Either 'estimatedKLOC' or 'functionPointAnalysis' is required"}), 400
+
+            kloc_range = payload.get('klocRange') or {}
+            if not isinstance(kloc_range, dict):
+                return jsonify({"error": "'klocRange' must be an object"}), 400
+            baseline_ratings = resolve_baseline_ratings(payload.get('costDrivers', []))
+            kloc_values = kloc_sweep_values(
+                estimated_kloc,
+                kloc_min=kloc_range.get('min'),
+                kloc_max=kloc_range.get('max'),
+                steps=kloc_range.get('steps', DEFAULT_KLOC_STEPS)
+            )
+
+            with timed_stage('sensitivity'):
+                result = run_sensitivity_sweep(model_loader.get(), baseline_ratings, estimated_kloc, kloc_values)
+            return jsonify(result), 200
+
+        except ModelNotReadyError as e:
+            return jsonify({"error": str(e)}), 503, {'Retry-After': '5'}
+
+        except (ValueError, KeyError, TypeError) as e:
+            return jsonify({"error": str(e)}), 400
+
+    @app.route('/estimations/scenarios', methods=['POST'])
+    def generate_scenario_matrix():
+        """
+        Endpoint comparing languages and Value Adjustment Factors for one FPA result
+        Expects JSON of the form {"functionPointAnalysis", "costDrivers", "languages", "vafs", "generalSystemCharacteristics"}
+        The VAF derived from the 14 general system characteristics is added to the VAF list when given;
+        at most MAX_SCENARIO_LANGUAGES languages and MAX_SCENARIO_VAFS VAFs, each between 0.65 and 1.35
+        All language x VAF scenarios are scored with a single model invocation
+        """
+        try:
+            payload = request.get_json(force=True) or {}
+            if not isinstance(payload, dict):
+                return jsonify({"error": "Request body must be a JSON object"}), 400
+            fpa_analysis = payload.get('functionPointAnalysis')
+            if not isinstance(fpa_analysis, dict):
+                return jsonify({"error": "'functionPointAnalysis' is required"}), 400
+            fpa_analysis = validate_fpa_analysis(fpa_analysis)
+            cost_drivers = payload.get('costDrivers', [])
+            if not isinstance(cost_drivers, list):
+                return jsonify({"error": "'costDrivers' must be a list"}), 400
+            if not all(isinstance(driver, dict) and 'driver' in driver and 'value' in driver for driver in cost_drivers):
+                return jsonify({"error": "Every cost driver must be an object with 'driver' and 'value'"}), 400
+
+            vafs = payload.get('vafs')
+            derived_vaf = None
+            if payload.get('generalSystemCharacteristics') is not None:
+                derived_vaf = calculate_vaf(payload['generalSystemCharacteristics'])
+                vafs = (vafs or []) + [derived_vaf]
+
+            # Process cost drivers with null values
+            processed_cost_drivers = process_cost_drivers(cost_drivers, analyzer=cost_drivers_analyzer)
+
+            with timed_stage('scenarios'):
+                result = run_scenario_matrix(
+                    model_loader.get(),
+                    fpa_analyzer,
+                    fpa_analysis,
+                    processed_cost_drivers,
+                    languages=payload.get('languages'),
+                    vafs=vafs
+                )
+            result['derivedVaf'] = derived_vaf
+            result['processedCostDrivers'] = processed_cost_drivers
+            return jsonify(result), 200
+
+        except ModelNotReadyError as e:
+            return jsonify({"error": str(e)}), 503, {'Retry-After': '5'}
+
+        except (ValueError, KeyError, TypeError) as e:
+            return jsonify({"error": str(e)}), 400
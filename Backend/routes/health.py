@@ -0,0 +1,27 @@
+from flask import jsonify
+
+def register_health_routes(app, model_loader):
+    """
+    Register liveness and readiness probes
+
+    :param app: Flask application instance
+    :param model_loader: EffortModelLoader whose state decides readiness
+    """
+    @app.route('/healthz', methods=['GET'])
+    def get_health():
+        """
+        Liveness probe: the process is up and serving requests
+        """
+        return jsonify({"status": "ok"}), 200
+
+    @app.route('/readyz', methods=['GET'])
+    def get_readiness():
+        """
+        Readiness probe: 200 once the effort model is loaded and warmed up, 503 before that or if loading failed
+        """
+        model_status = model_loader.status()
+        ready = model_loader.is_ready()
+        return jsonify({
+            "status": "ready" if ready else "not ready",
+            "effortModel": model_status
+        }), 200 if ready else 503
@@ -0,0 +1,29 @@
+import time
+from flask import Response, g, request
+from services.metrics import REGISTRY, REQUEST_LATENCY
+
+def register_metrics_routes(app):
+    """
+    Register the Prometheus /metrics endpoint and per-request latency tracking
+    
+    :param app: Flask application instance
+    """
+    @app.before_request
+    def start_request_timer():
+        g.request_start = time.perf_counter()
+
+    @app.after_request
+    def record_request_latency(response):
+        start = g.pop('request_start', None)
+        if start is not None:
+            # Label by route template, not the raw path, to keep the series count bounded
+            endpoint = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+            REQUEST_LATENCY.observe(time.perf_counter() - start, endpoint=endpoint, status=str(response.status_code))
+        return response
+
+    @app.route('/metrics', methods=['GET'])
+    def get_metrics():
+        """
+        Endpoint exposing latency histograms, LLM call/token counts and cache hit ratios
+        """
+        return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
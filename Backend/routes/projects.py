@@ -1,15 +1,55 @@
-from flask import jsonify
+from flask import jsonify, request
 from models.mock_data import MOCK_PROJECTS
+from models.project_store import SUMMARY_FIELDS
 
-def register_projects_routes(app):
+def register_projects_routes(app, project_store, seed_mock_projects=True):
     """
     Register routes related to projects
     
     :param app: Flask application instance
+    :param project_store: ProjectStore holding saved estimation results
+    :param seed_mock_projects: Load MOCK_PROJECTS into the store when it is empty
     """
+    if seed_mock_projects and project_store.count() == 0:
+        for project in MOCK_PROJECTS:
+            # Listed as before the store existed, without an id
+            project_store.add(project, expose_id=False)
+
     @app.route('/projects', methods=['GET'])
     def get_projects():
         """
-        Endpoint to retrieve list of projects
+        Endpoint to retrieve list of projects, newest first
+        Query parameters: limit, cursor, name (prefix), createdAfter, createdBefore,
+        fields (comma separated, or "summary" to leave out the extracted requirements text)
+        The cursor for the next page is returned in the X-Next-Cursor header
+        """
+        try:
+            limit = min(max(int(request.args.get('limit', 50)), 1), 500)
+            fields = request.args.get('fields', '').strip()
+            if fields != SUMMARY_FIELDS:
+                fields = [field.strip() for field in fields.split(',') if field.strip()] or None
+            projects, next_cursor = project_store.list(
+                limit=limit,
+                cursor=request.args.get('cursor'),
+                name=request.args.get('name'),
+                created_after=request.args.get('createdAfter'),
+                created_before=request.args.get('createdBefore'),
+                fields=fields
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        response = jsonify(projects)
+        if next_cursor:
+            response.headers['X-Next-Cursor'] = next_cursor
+        return response, 200
+
+    @app.route('/projects/<int:project_id>', methods=['GET'])
+    def get_project(project_id):
+        """
+        Endpoint to retrieve one saved project, including its extracted requirements text
         """
-        return jsonify(MOCK_PROJECTS), 200
\ No newline at end of file
+        project = project_store.get(project_id)
+        if project is None:
+            return jsonify({"error": f"Unknown project {project_id}"}), 404
+        return jsonify(project), 200
@@ -0,0 +1,422 @@
+import csv
+import io
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from werkzeug.datastructures import FileStorage
+from services.document_extractor import extract_text_from_document
+from services.function_point_analysis import FPA_WEIGHTS, estimate_tokens, validate_fpa_analysis
+
+logger = logging.getLogger(__name__)
+
+# File types extract_text_from_document understands
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.txt')
+
+# Output columns and their types, in order; every part of a Parquet output shares this schema
+RESULT_COLUMNS = (
+    ('path', 'string'),
+    ('status', 'string'),
+    ('error', 'string'),
+    ('language', 'string'),
+    ('characters', 'int'),
+    ('promptTokens', 'int'),
+    ('tokensSaved', 'int'),
+    ('EI', 'int'),
+    ('EO', 'int'),
+    ('EQ', 'int'),
+    ('ILF', 'int'),
+    ('EIF', 'int'),
+    ('totalFunctionPoints', 'int'),
+    ('estimatedKLOC', 'float'),
+    ('effortMultiplier', 'float'),
+    ('developmentEffort', 'float'),
+    ('developmentTime', 'float'),
+    ('extractSeconds', 'float'),
+    ('fpaSeconds', 'float')
+)
+RESULT_COLUMN_NAMES = tuple(name for name, _ in RESULT_COLUMNS)
+
+# Statuses an LLM outage or a transient read error can cause, redone by run(retry_failed=True);
+# 'partial' rows were estimated from an analysis some chunks (or the whole request) failed to contribute to
+RETRYABLE_STATUSES = ('error', 'no_function_points', 'partial')
+
+def find_documents(root):
+    """
+    :param root: Directory to walk
+    :return: Sorted paths of supported documents below root, relative to root
+    """
+    paths = []
+    for directory, subdirectories, filenames in os.walk(root):
+        subdirectories.sort()
+        for filename in filenames:
+            if filename.lower().endswith(SUPPORTED_EXTENSIONS):
+                paths.append(os.path.relpath(os.path.join(directory, filename), root))
+    return sorted(paths)
+
+def extract_document(path, max_bytes=None, text_compactor=None):
+    """
+    Extract (and optionally compact) one document; runs in a worker process
+
+    :param path: Path of the document
+    :param max_bytes: Maximum accepted document size in bytes (None for no limit)
+    :param text_compactor: Optional TextCompactor applied to the extracted text
+    :return: Dictionary with text, characters, promptTokens, tokensSaved, extractSeconds and error
+    """
+    start = time.perf_counter()
+    result = {"text": "", "characters": 0, "promptTokens": 0, "tokensSaved": 0, "error": None}
+    try:
+        with open(path, 'rb') as f:
+            text = extract_text_from_document(FileStorage(stream=f, filename=os.path.basename(path)), max_bytes=max_bytes)
+        result['characters'] = len(text)
+        if text_compactor is not None and text:
+            text, report = text_compactor.compact(text)
+            result['tokensSaved'] = report['tokensSaved']
+        result['text'] = text
+        result['promptTokens'] = estimate_tokens(text)
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['extractSeconds'] = time.perf_counter() - start
+    return result
+
+class CsvResultWriter:
+    def __init__(self, path):
+        """
+        Append-only CSV output that doubles as the resume checkpoint
+
+        Every batch is written with one write and fsynced, so after a crash the file
+        holds whole batches plus at most one torn line, which is cut off on reopen.
+
+        :param path: CSV file; created with a header if missing, appended to otherwise
+        """
+        self.path = path
+        self._file = None
+
+    def completed(self):
+        """
+        :return: Dictionary of path to status of the latest row per document already written
+        """
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return {}
+        self._truncate_torn_line()
+        with open(self.path, newline='', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            if tuple(reader.fieldnames or ()) != RESULT_COLUMN_NAMES:
+                raise ValueError(f"{self.path} was not written by the bulk estimator (unexpected header)")
+            return {row['path']: row['status'] for row in reader}
+
+    def write(self, rows):
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=RESULT_COLUMN_NAMES)
+        if self._file is None:
+            new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+            self._file = open(self.path, 'a', newline='', encoding='utf-8')
+            if new_file:
+                writer.writeheader()
+        writer.writerows(rows)
+        self._file.write(buffer.getvalue())
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _truncate_torn_line(self):
+        with open(self.path, 'rb+') as f:
+            f.seek(0, io.SEEK_END)
+            size = f.tell()
+            f.seek(max(0, size - 1))
+            if f.read(1) == b'\n':
+                return
+            # Find the last complete line and drop whatever follows it
+            position = size
+            while position > 0:
+                step = min(64 * 1024, position)
+                f.seek(position - step)
+                block = f.read(step)
+                newline = block.rfind(b'\n')
+                if newline != -1:
+                    position = position - step + newline + 1
+                    break
+                position -= step
+            logger.warning("Dropping %d bytes of a partially written row from %s", size - position, self.path)
+            f.truncate(position)
+
+class ParquetResultWriter:
+    def __init__(self, path):
+        """
+        Parquet output written as a directory of part files, one per batch
+
+        Each part is written under a temporary name and renamed into place, so a crash
+        never leaves a half-written part; the directory reads as one dataset with
+        pandas.read_parquet or pyarrow.dataset. Requires pyarrow.
+
+        :param path: Output directory; created if missing, new parts are added otherwise
+        :raises ImportError: If pyarrow is not installed
+        """
+        # Imported on first use so CSV output does not need pyarrow
+        import pyarrow
+        import pyarrow.parquet
+
+        self.path = path
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        types = {'string': pyarrow.string(), 'int': pyarrow.int64(), 'float': pyarrow.float64()}
+        self.schema = pyarrow.schema([(name, types[kind]) for name, kind in RESULT_COLUMNS])
+        os.makedirs(path, exist_ok=True)
+        self._next_part = 1 + max((self._part_number(name) for name in self._parts()), default=-1)
+
+    def completed(self):
+        completed = {}
+        for name in self._parts():
+            table = self._pq.read_table(os.path.join(self.path, name), columns=['path', 'status'])
+            completed.update(zip(table.column('path').to_pylist(), table.column('status').to_pylist()))
+        return completed
+
+    def write(self, rows):
+        table = self._pa.Table.from_pylist(rows, schema=self.schema)
+        final_path = os.path.join(self.path, f"part-{self._next_part:05d}.parquet")
+        temporary_path = final_path + '.tmp'
+        self._pq.write_table(table, temporary_path)
+        os.replace(temporary_path, final_path)
+        self._next_part += 1
+
+    def close(self):
+        pass
+
+    def _parts(self):
+        # Parts sort by number, so later retries of a document override earlier rows
+        names = [name for name in os.listdir(self.path) if name.startswith('part-') and name.endswith('.parquet')]
+        return sorted(names, key=self._part_number)
+
+    @staticmethod
+    def _part_number(name):
+        return int(name[len('part-'):-len('.parquet')])
+
+def open_result_writer(path, output_format=None):
+    """
+    :param path: Output file (CSV) or directory (Parquet)
+    :param output_format: 'csv' or 'parquet'; inferred from the extension if omitted (.csv is CSV, anything else Parquet)
+    :return: CsvResultWriter or ParquetResultWriter
+    """
+    if output_format is None:
+        output_format = 'csv' if path.lower().endswith('.csv') else 'parquet'
+    if output_format == 'csv':
+        return CsvResultWriter(path)
+    if output_format == 'parquet':
+        return ParquetResultWriter(path)
+    raise ValueError(f"Unknown output format '{output_format}', expected 'csv' or 'parquet'")
+
+class BulkEstimator:
+    def __init__(self, fpa_analyzer, effort_model, processed_cost_drivers, language="Java", extract_workers=None,
+                 llm_concurrency=4, batch_size=256, max_document_bytes=None, text_compactor=None):
+        """
+        Estimate every document of a directory tree offline
+
+        Three stages overlap: documents are extracted (and compacted) in a process pool
+        sized to the available cores, FPA runs on a thread pool that bounds the number of
+        documents in flight to the LLM, and finished documents are estimated in batches
+        with one vectorized model invocation each, then appended to the output. The
+        number of documents held in memory is bounded, so archives of any size stream
+        through.
+
+        :param fpa_analyzer: FunctionPointAnalyzer (chunk concurrency multiplies llm_concurrency)
+        :param effort_model: Loaded EffortEstimationModel
+        :param processed_cost_drivers: Output of process_cost_drivers, applied to every document
+        :param language: Programming language for LOC/FP
+        :param extract_workers: Extraction processes (None uses every available core)
+        :param llm_concurrency: Documents analyzed by the LLM at once
+        :param batch_size: Documents per model invocation and per output write
+        :param max_document_bytes: Larger documents are recorded as errors (None for no limit)
+        :param text_compactor: Optional TextCompactor run in the extraction workers
+        """
+        if language not in fpa_analyzer.language_productivity:
+            raise ValueError(f"Unknown language '{language}', expected one of {list(fpa_analyzer.language_productivity)}")
+        if extract_workers is None:
+            extract_workers = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count() or 1
+        self.fpa_analyzer = fpa_analyzer
+        self.effort_model = effort_model
+        self.processed_cost_drivers = processed_cost_drivers
+        self.language = language
+        self.extract_workers = max(1, int(extract_workers))
+        self.llm_concurrency = max(1, int(llm_concurrency))
+        self.batch_size = max(1, int(batch_size))
+        self.max_document_bytes = max_document_bytes
+        self.text_compactor = text_compactor
+        # Fixed for the run: the drivers are the same for every document
+        self.effort_multiplier = 1.0
+        for driver in processed_cost_drivers:
+            self.effort_multiplier *= driver.get('numerical_value', 1.0)
+
+    def run(self, root, writer, retry_failed=False, limit=None, on_progress=None):
+        """
+        :param root: Directory with the requirements documents
+        :param writer: Result writer (see open_result_writer); documents it already holds are skipped
+        :param retry_failed: Also redo documents whose latest row has a RETRYABLE_STATUSES status (the new row supersedes it)
+        :param limit: Process at most this many documents (None for all)
+        :param on_progress: Optional callback(done, total) after every written batch
+        :return: Summary dictionary with document counts per status and throughput
+        """
+        completed = writer.completed()
+        documents = find_documents(root)
+        todo = [path for path in documents if path not in completed or (retry_failed and completed[path] in RETRYABLE_STATUSES)]
+        skipped = len(documents) - len(todo)
+        if limit is not None:
+            todo = todo[:limit]
+        logger.info("%d documents to estimate, %d already done", len(todo), skipped)
+
+        statuses = {}
+        start = time.perf_counter()
+        done = 0
+        # Enough documents in flight to keep both pools busy while bounding memory
+        window = 2 * (self.extract_workers + self.llm_concurrency)
+        paths = iter(todo)
+        in_flight = {}
+        ready = []
+
+        def flush(rows):
+            nonlocal done
+            rows = self._estimate_batch(rows)
+            writer.write(rows)
+            for row in rows:
+                statuses[row['status']] = statuses.get(row['status'], 0) + 1
+            done += len(rows)
+            if on_progress is not None:
+                on_progress(done, len(todo))
+
+        # Spawned workers start clean instead of inheriting the LLM client's threads and sockets
+        extract_pool = ProcessPoolExecutor(max_workers=self.extract_workers, mp_context=multiprocessing.get_context('spawn'))
+        llm_pool = ThreadPoolExecutor(max_workers=self.llm_concurrency, thread_name_prefix='bulk-fpa')
+        try:
+            while True:
+                while len(in_flight) < window:
+                    path = next(paths, None)
+                    if path is None:
+                        break
+                    future = extract_pool.submit(extract_document, os.path.join(root, path), self.max_document_bytes, self.text_compactor)
+                    in_flight[future] = ('extract', path)
+                if not in_flight:
+                    break
+
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    stage, path = in_flight.pop(future)
+                    document = self._collect(future, stage, path)
+                    if stage == 'extract' and document['status'] is None:
+                        in_flight[llm_pool.submit(self._analyze, document)] = ('fpa', path)
+                    else:
+                        ready.append(document)
+
+                while len(ready) >= self.batch_size:
+                    # Taken off ready first, so a failing flush is not retried by the finally below
+                    batch, ready = ready[:self.batch_size], ready[self.batch_size:]
+                    flush(batch)
+        finally:
+            try:
+                # On interruption, everything already analyzed is still written
+                if ready:
+                    flush(ready)
+            finally:
+                extract_pool.shutdown(wait=False, cancel_futures=True)
+                llm_pool.shutdown(wait=False, cancel_futures=True)
+                writer.close()
+
+        elapsed = time.perf_counter() - start
+        return {
+            "documents": done,
+            "skipped": skipped,
+            "statuses": statuses,
+            "seconds": round(elapsed, 3),
+            "documentsPerSecond": round(done / elapsed, 3) if elapsed else 0.0
+        }
+
+    def _collect(self, future, stage, path):
+        """
+        :return: Document record; status stays None while it still needs FPA
+        """
+        try:
+            document = future.result()
+        except Exception as e:
+            # A crashed worker (e.g. BrokenProcessPool) fails the document, not the run
+            document = {"error": f"{type(e).__name__}: {e}", "extractSeconds": None}
+        document.setdefault('status', None)
+        document['path'] = path
+        if stage == 'extract':
+            if document.get('error'):
+                document['status'] = 'error'
+            elif not document['text'].strip():
+                document['status'] = 'no_text'
+        return document
+
+    def _analyze(self, document):
+        start = time.perf_counter()
+        try:
+            document['fpaAnalysis'], document['fpaComplete'] = self.fpa_analyzer.analyze_requirements_with_status(document['text'])
+        except Exception as e:
+            document['error'] = f"{type(e).__name__}: {e}"
+            document['status'] = 'error'
+        document['fpaSeconds'] = time.perf_counter() - start
+        # The text is no longer needed; drop it before the document waits for its batch
+        document['text'] = None
+        return document
+
+    def _estimate_batch(self, documents):
+        """
+        Turn a batch of analyzed documents into output rows with one model invocation
+
+        :param documents: Document records from the extraction and FPA stages
+        :return: Output rows with RESULT_COLUMN_NAMES keys
+        """
+        rows = []
+        estimable = []
+        for document in documents:
+            row = dict.fromkeys(RESULT_COLUMN_NAMES)
+            row.update({
+                "path": document['path'],
+                "status": document.get('status'),
+                "error": document.get('error'),
+                "language": self.language,
+                "characters": document.get('characters'),
+                "promptTokens": document.get('promptTokens'),
+                "tokensSaved": document.get('tokensSaved'),
+                "extractSeconds": document.get('extractSeconds'),
+                "fpaSeconds": document.get('fpaSeconds')
+            })
+            fpa_analysis = document.get('fpaAnalysis')
+            if row['status'] is None and fpa_analysis is not None:
+                try:
+                    fpa_analysis = validate_fpa_analysis(fpa_analysis)
+                    metrics = self.fpa_analyzer.calculate_project_metrics(fpa_analysis, language=self.language)
+                except (ValueError, KeyError, TypeError) as e:
+                    # A malformed analysis fails its own row, not the batch
+                    row['status'] = 'error'
+                    row['error'] = f"Invalid FPA analysis: {e}"
+                    rows.append(row)
+                    continue
+                for function_type in FPA_WEIGHTS:
+                    row[function_type] = fpa_analysis[function_type]['count']
+                row['totalFunctionPoints'] = metrics['totalFunctionPoints']
+                row['estimatedKLOC'] = metrics['estimatedKLOC']
+                row['effortMultiplier'] = self.effort_multiplier
+                if not document.get('fpaComplete', True):
+                    row['status'] = 'partial'
+                else:
+                    # Zero function points usually means an unusable document, so it is flagged rather than estimated as ok
+                    row['status'] = 'ok' if metrics['totalFunctionPoints'] > 0 else 'no_function_points'
+                estimable.append(row)
+            rows.append(row)
+
+        if estimable:
+            X = self.effort_model.build_feature_matrix(
+                [self.processed_cost_drivers] * len(estimable),
+                [row['estimatedKLOC'] for row in estimable]
+            )
+            efforts = self.effort_model.predict_effort_matrix(X)
+            development_times = self.effort_model.calculate_development_time_batch(efforts)
+            for row, effort, development_time in zip(estimable, efforts, development_times):
+                row['developmentEffort'] = float(effort)
+                row['developmentTime'] = float(development_time)
+        return rows
@@ -0,0 +1,291 @@
+import copy
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+
+class TTLCache:
+    def __init__(self, max_entries=1024, ttl_seconds=None):
+        """
+        Thread-safe in-memory LRU cache with optional time-to-live
+
+        :param max_entries: Maximum number of entries kept before the least recently used is evicted
+        :param ttl_seconds: Seconds after which an entry expires (None keeps entries until evicted)
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None, record_stats=True):
+        """
+        Look up a key, refreshing its LRU position
+
+        :param key: Cache key
+        :param default: Value returned on a miss
+        :param record_stats: Count the lookup in hits/misses
+        :return: Cached value or default
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    if record_stats:
+                        self.hits += 1
+                    return value
+                del self._entries[key]
+            if record_stats:
+                self.misses += 1
+            return default
+
+    def set(self, key, value):
+        """
+        Store a value, evicting the least recently used entries beyond max_entries
+
+        :param key: Cache key
+        :param value: Value to store
+        """
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        """
+        Remove a key if present
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """
+        Remove every entry (counters are kept)
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """
+        :return: Dictionary with size and hit/miss/eviction counters
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxEntries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hitRatio": self.hits / lookups if lookups else 0.0
+        }
+
+
+class SQLiteCacheStore:
+    def __init__(self, db_path, table='cache', ttl_seconds=None):
+        """
+        Persistent JSON key/value tier backed by SQLite
+
+        :param db_path: Path to the SQLite database file
+        :param table: Table name, so several caches can share one database
+        :param ttl_seconds: Seconds after which stored entries are treated as missing
+        """
+        self.table = table
+        self.ttl_seconds = ttl_seconds
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        # Connect eagerly so a bad path fails at startup rather than on the first request
+        self._connection = self._connect()
+        self._connection_pid = os.getpid()
+
+    @property
+    def _conn(self):
+        # SQLite connections must not cross fork(), so each pre-fork worker opens its own
+        if self._connection_pid != os.getpid():
+            self._connection = self._connect()
+            self._connection_pid = os.getpid()
+        return self._connection
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute(
+            f'CREATE TABLE IF NOT EXISTS {self.table} (key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)'
+        )
+        conn.commit()
+        return conn
+
+    def get(self, key):
+        """
+        :param key: Cache key
+        :return: Decoded JSON value, or None when missing or expired
+        """
+        with self._lock:
+            row = self._conn.execute(f'SELECT value, created_at FROM {self.table} WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        value, created_at = row
+        if self.ttl_seconds and created_at + self.ttl_seconds < time.time():
+            self.delete(key)
+            return None
+        return json.loads(value)
+
+    def set(self, key, value):
+        """
+        :param key: Cache key
+        :param value: JSON-serializable value
+        """
+        with self._lock:
+            self._conn.execute(
+                f'INSERT OR REPLACE INTO {self.table} (key, value, created_at) VALUES (?, ?, ?)',
+                (key, json.dumps(value), time.time())
+            )
+            self._conn.commit()
+
+    def delete(self, key):
+        with self._lock:
+            self._conn.execute(f'DELETE FROM {self.table} WHERE key = ?', (key,))
+            self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute(f'SELECT COUNT(*) FROM {self.table}').fetchone()[0]
+
+
+def normalize_document_text(text):
+    """
+    Normalize extracted text so trivially different extractions share a cache key
+
+    :param text: Extracted document text
+    :return: Text with runs of whitespace collapsed and surrounding whitespace stripped
+    """
+    return re.sub(r'\s+', ' ', text or '').strip()
+
+
+class FPAResultCache:
+    def __init__(self, max_entries=256, ttl_seconds=24 * 3600, db_path=None, similarity_index=None):
+        """
+        Content-addressed cache for Function Point Analysis results
+
+        :param max_entries: Size of the in-memory LRU tier
+        :param ttl_seconds: Time-to-live for both tiers (None disables expiry)
+        :param db_path: Optional SQLite path for a tier that survives restarts
+        :param similarity_index: Optional MinHashLSHIndex so near-duplicate documents reuse analyses (see get_similar)
+        """
+        self.memory = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self.disk = SQLiteCacheStore(db_path, table='fpa_cache', ttl_seconds=ttl_seconds) if db_path else None
+        self.disk_hits = 0
+        self.similarity_index = similarity_index
+        self.similar_hits = 0
+        # Signatures computed by get_similar, kept until set() indexes the analysis of that key
+        self._pending_signatures = TTLCache(max_entries=64, ttl_seconds=3600)
+
+    @staticmethod
+    def make_key(extracted_text, model, prompt_version):
+        """
+        :param extracted_text: Text extracted from the requirements document
+        :param model: LLM model name
+        :param prompt_version: Version of the FPA prompt
+        :return: SHA-256 hex digest identifying the analysis
+        """
+        digest = hashlib.sha256()
+        for part in (model, str(prompt_version), normalize_document_text(extracted_text)):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def get(self, key):
+        """
+        Look up an analysis, promoting disk hits into the memory tier
+
+        :param key: Key from make_key
+        :return: Cached FPA analysis or None
+        """
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.disk_hits += 1
+                self.memory.set(key, value)
+        # Hand out copies so callers cannot mutate the cached analysis
+        return copy.deepcopy(value)
+
+    def get_similar(self, key, extracted_text, model, prompt_version):
+        """
+        Look up the analysis of a near-duplicate document; call after get(key) missed
+
+        :param key: Key from make_key for extracted_text
+        :param extracted_text: Text extracted from the requirements document
+        :param model: LLM model name
+        :param prompt_version: Version of the FPA prompt
+        :return: Tuple of (FPA analysis, estimated similarity), or None
+        """
+        if self.similarity_index is None:
+            return None
+        namespace = zlib.crc32(f"{model}\0{prompt_version}".encode('utf-8'))
+        signature = self.similarity_index.signature(normalize_document_text(extracted_text))
+        self._pending_signatures.set(key, (signature, namespace))
+
+        match = self.similarity_index.query(signature, namespace=namespace)
+        if match is None:
+            return None
+        similar_key, similarity = match
+        # The index only holds keys, so the analysis may have expired from the cache since
+        value = self.memory.get(similar_key.hex(), record_stats=False)
+        if value is None and self.disk is not None:
+            value = self.disk.get(similar_key.hex())
+        if value is None:
+            return None
+        self.similar_hits += 1
+        return copy.deepcopy(value), similarity
+
+    def set(self, key, value):
+        """
+        Store an analysis in every tier, and in the similarity index if get_similar saw the document
+
+        :param key: Key from make_key
+        :param value: FPA analysis dictionary
+        """
+        self.memory.set(key, copy.deepcopy(value))
+        if self.disk is not None:
+            self.disk.set(key, value)
+        if self.similarity_index is not None:
+            pending = self._pending_signatures.get(key, record_stats=False)
+            if pending is not None:
+                signature, namespace = pending
+                self.similarity_index.add(signature, bytes.fromhex(key), namespace=namespace)
+                self._pending_signatures.delete(key)
+
+    def stats(self):
+        """
+        :return: Hit/miss counters; hits include disk hits promoted into memory and near-duplicate hits
+        """
+        stats = self.memory.stats()
+        hits = stats['hits'] + self.disk_hits + self.similar_hits
+        misses = stats['misses'] - self.disk_hits - self.similar_hits
+        stats.update({
+            "hits": hits,
+            "misses": misses,
+            "memoryHits": stats['hits'],
+            "diskHits": self.disk_hits,
+            "diskSize": len(self.disk) if self.disk is not None else None,
+            "similarHits": self.similar_hits,
+            "similarityIndexSize": len(self.similarity_index) if self.similarity_index is not None else None,
+            "hitRatio": hits / (hits + misses) if hits + misses else 0.0
+        })
+        return stats
@@ -1,139 +1,250 @@
 import json
-from groq import Groq
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from services.cache import TTLCache
+from services.llm_policy import LLMCallPolicy
+from services.metrics import observe_llm_call
+
+logger = logging.getLogger(__name__)
+
+# Supported strategies for inferring null cost drivers
+INFERENCE_MODES = ('sequential', 'concurrent', 'single_shot')
+
+# Bump whenever generate_prompt/generate_batch_prompt change, so memoized ratings are not reused
+COST_DRIVER_PROMPT_VERSION = 1
+
+class DriverRatingMemo:
+    def __init__(self, ttl_seconds=24 * 3600, max_entries=256, pinned_ratings=None):
+        """
+        Process-wide memo of inferred cost driver ratings
+        
+        The rating prompt depends only on the driver name, so an inferred rating can be
+        shared by every request until it expires.
+        
+        :param ttl_seconds: Seconds an inferred rating is reused (None keeps it until evicted)
+        :param max_entries: Maximum number of memoized ratings
+        :param pinned_ratings: Dictionary of driver name to a fixed rating that is never inferred
+        """
+        self._lock = threading.Lock()
+        self.configure(ttl_seconds, max_entries, pinned_ratings)
+
+    def configure(self, ttl_seconds=24 * 3600, max_entries=256, pinned_ratings=None):
+        """
+        Replace the memo settings, discarding any memoized ratings
+        """
+        with self._lock:
+            self.cache = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+            self.pinned_ratings = dict(pinned_ratings or {})
+
+    @staticmethod
+    def _key(driver, model):
+        return (model, COST_DRIVER_PROMPT_VERSION, driver)
+
+    def get(self, driver, model):
+        """
+        :param driver: Cost driver name
+        :param model: LLM model the rating was inferred with
+        :return: Pinned or memoized rating, or None
+        """
+        if driver in self.pinned_ratings:
+            return self.pinned_ratings[driver]
+        return self.cache.get(self._key(driver, model))
+
+    def set(self, driver, model, value):
+        """
+        :param driver: Cost driver name
+        :param model: LLM model the rating was inferred with
+        :param value: Validated rating
+        """
+        self.cache.set(self._key(driver, model), value)
+
+    def clear(self):
+        self.cache.clear()
+
+    def stats(self):
+        """
+        :return: Memo counters plus the pinned ratings
+        """
+        stats = self.cache.stats()
+        stats['pinned'] = dict(self.pinned_ratings)
+        return stats
+
+# Shared by every CostDriversAnalyzer in the process
+DRIVER_RATING_MEMO = DriverRatingMemo()
+
+# Detailed descriptions for each cost driver
+COST_DRIVER_DESCRIPTIONS = {
+    'rely': 'Required Software Reliability: The extent to which the software must be accurate, precise, and meet critical user needs.',
+    'data': 'Data Base Size: The size and complexity of the database the software will interact with.',
+    'cplx': 'Product Complexity: The intricacy of the software\'s processing, algorithms, and control structures.',
+    'time': 'Execution Time Constraint: The percentage of available computer time the software must use for processing.',
+    'stor': 'Main Storage Constraint: The amount of main memory required by the software.',
+    'pvol': 'Platform Volatility: The stability and expected changes in the software development environment.',
+    'acap': 'Analyst Capability: The skill level and experience of the system analysts working on the project.',
+    'pcap': 'Programmer Capability: The skill level and experience of the programmers developing the software.',
+    'aexp': 'Analyst Experience: The team\'s prior experience with similar types of applications and development environments.',
+    'pexp': 'Programmer Experience: The team\'s prior experience with the programming language and development tools.',
+    'ltex': 'Language and Tool Experience: The team\'s experience with the specific programming languages and tools being used.',
+    'tool': 'Use of Software Tools: The sophistication of the software development tools used in the project.',
+    'sced': 'Schedule Constraint: The tightness of the project schedule and potential impact on development effort.'
+}
+
+# Predefined value categories with their COCOMO II numerical multipliers
+COST_DRIVER_MULTIPLIERS = {
+    'rely': {
+        'VeryLow': 0.82,
+        'Low': 0.92,
+        'Nominal': 1.00,
+        'High': 1.10,
+        'VeryHigh': 1.26,
+        'ExtraHigh': 1.50
+    },
+    'data': {
+        'VeryLow': 0.90,
+        'Low': 0.94,
+        'Nominal': 1.00,
+        'High': 1.08,
+        'VeryHigh': 1.16,
+        'ExtraHigh': 1.24
+    },
+    'cplx': {
+        'VeryLow': 0.73,
+        'Low': 0.87,
+        'Nominal': 1.00,
+        'High': 1.17,
+        'VeryHigh': 1.34,
+        'ExtraHigh': 1.74
+    },
+    'time': {
+        'VeryLow': 1.00,
+        'Low': 1.00,
+        'Nominal': 1.00,
+        'High': 1.11,
+        'VeryHigh': 1.30,
+        'ExtraHigh': 1.66
+    },
+    'stor': {
+        'VeryLow': 1.00,
+        'Low': 1.00,
+        'Nominal': 1.00,
+        'High': 1.05,
+        'VeryHigh': 1.20,
+        'ExtraHigh': 1.56
+    },
+    'pvol': {
+        'VeryLow': 1.00,
+        'Low': 0.87,
+        'Nominal': 1.00,
+        'High': 1.15,
+        'VeryHigh': 1.30,
+        'ExtraHigh': 1.56
+    },
+    'acap': {
+        'VeryLow': 1.42,
+        'Low': 1.29,
+        'Nominal': 1.00,
+        'High': 0.85,
+        'VeryHigh': 0.71,
+        'ExtraHigh': 0.56
+    },
+    'pcap': {
+        'VeryLow': 1.34,
+        'Low': 1.15,
+        'Nominal': 1.00,
+        'High': 0.88,
+        'VeryHigh': 0.76,
+        'ExtraHigh': 0.62
+    },
+    'aexp': {
+        'VeryLow': 1.22,
+        'Low': 1.10,
+        'Nominal': 1.00,
+        'High': 0.88,
+        'VeryHigh': 0.81,
+        'ExtraHigh': 0.67
+    },
+    'pexp': {
+        'VeryLow': 1.19,
+        'Low': 1.09,
+        'Nominal': 1.00,
+        'High': 0.91,
+        'VeryHigh': 0.85,
+        'ExtraHigh': 0.76
+    },
+    'ltex': {
+        'VeryLow': 1.20,
+        'Low': 1.09,
+        'Nominal': 1.00,
+        'High': 0.91,
+        'VeryHigh': 0.84,
+        'ExtraHigh': 0.70
+    },
+    'tool': {
+        'VeryLow': 1.17,
+        'Low': 1.09,
+        'Nominal': 1.00,
+        'High': 0.90,
+        'VeryHigh': 0.78,
+        'ExtraHigh': 0.66
+    },
+    'sced': {
+        'VeryLow': 1.43,
+        'Low': 1.14,
+        'Nominal': 1.00,
+        'High': 1.00,
+        'VeryHigh': 1.00,
+        'ExtraHigh': 1.00
+    }
+}
+
+# Ratings from lowest to highest, as used by every driver in COST_DRIVER_MULTIPLIERS
+RATING_SCALE = ('VeryLow', 'Low', 'Nominal', 'High', 'VeryHigh', 'ExtraHigh')
+_RATINGS_BY_KEY = {rating.lower(): rating for rating in RATING_SCALE}
+
+def normalize_rating(value):
+    """
+    Map a rating in any case or spacing ('very high', 'VERYHIGH') to its canonical name
+
+    :param value: Rating as received from the client or the LLM
+    :return: Canonical rating from RATING_SCALE, or None if it is not a rating
+    """
+    if not isinstance(value, str):
+        return None
+    return _RATINGS_BY_KEY.get(value.replace(' ', '').replace('_', '').lower())
 
 class CostDriversAnalyzer:
-    def __init__(self, api_key):
+    def __init__(self, api_key=None, inference_mode='sequential', max_concurrency=4, memo=DRIVER_RATING_MEMO,
+                 model="llama-3.2-3b-preview", client=None, call_policy=None):
         """
         Initialize Groq client for cost drivers analysis
         
-        :param api_key: Groq API key
+        :param api_key: Groq API key (ignored when client is given)
+        :param inference_mode: 'sequential' (one call per driver), 'concurrent' (per-driver calls
+                               fanned out over a thread pool) or 'single_shot' (one JSON-mode call for all drivers)
+        :param max_concurrency: Maximum number of in-flight Groq calls in 'concurrent' mode
+        :param memo: DriverRatingMemo shared across requests (None disables memoization)
+        :param model: Groq model used for rating inference
+        :param client: Shared Groq client (see services.llm_client); a private one is created if omitted
+        :param call_policy: Shared LLMCallPolicy (timeouts, retries, hedging, circuit breaker); calls are unprotected if omitted
         """
-        self.client = Groq(api_key=api_key)
+        if inference_mode not in INFERENCE_MODES:
+            raise ValueError(f"Unknown inference mode '{inference_mode}', expected one of {INFERENCE_MODES}")
         
-        # Detailed descriptions for each cost driver
-        self.cost_driver_descriptions = {
-            'rely': 'Required Software Reliability: The extent to which the software must be accurate, precise, and meet critical user needs.',
-            'data': 'Data Base Size: The size and complexity of the database the software will interact with.',
-            'cplx': 'Product Complexity: The intricacy of the software\'s processing, algorithms, and control structures.',
-            'time': 'Execution Time Constraint: The percentage of available computer time the software must use for processing.',
-            'stor': 'Main Storage Constraint: The amount of main memory required by the software.',
-            'pvol': 'Platform Volatility: The stability and expected changes in the software development environment.',
-            'acap': 'Analyst Capability: The skill level and experience of the system analysts working on the project.',
-            'pcap': 'Programmer Capability: The skill level and experience of the programmers developing the software.',
-            'aexp': 'Analyst Experience: The team\'s prior experience with similar types of applications and development environments.',
-            'pexp': 'Programmer Experience: The team\'s prior experience with the programming language and development tools.',
-            'ltex': 'Language and Tool Experience: The team\'s experience with the specific programming languages and tools being used.',
-            'tool': 'Use of Software Tools: The sophistication of the software development tools used in the project.',
-            'sced': 'Schedule Constraint: The tightness of the project schedule and potential impact on development effort.'
-        }
+        if client is None:
+            # Imported here so modules that only receive a shared client never import the SDK
+            from groq import Groq
+            client = Groq(api_key=api_key)
+        self.client = client
+        self.inference_mode = inference_mode
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.memo = memo
+        self.model = model
+        self.call_policy = call_policy or LLMCallPolicy()
         
-        # Predefined value categories with their COCOMO II numerical multipliers
-        self.cost_driver_multipliers = {
-            'rely': {
-                'VeryLow': 0.82,
-                'Low': 0.92,
-                'Nominal': 1.00,
-                'High': 1.10,
-                'VeryHigh': 1.26,
-                'ExtraHigh': 1.50
-            },
-            'data': {
-                'VeryLow': 0.90,
-                'Low': 0.94,
-                'Nominal': 1.00,
-                'High': 1.08,
-                'VeryHigh': 1.16,
-                'ExtraHigh': 1.24
-            },
-            'cplx': {
-                'VeryLow': 0.73,
-                'Low': 0.87,
-                'Nominal': 1.00,
-                'High': 1.17,
-                'VeryHigh': 1.34,
-                'ExtraHigh': 1.74
-            },
-            'time': {
-                'VeryLow': 1.00,
-                'Low': 1.00,
-                'Nominal': 1.00,
-                'High': 1.11,
-                'VeryHigh': 1.30,
-                'ExtraHigh': 1.66
-            },
-            'stor': {
-                'VeryLow': 1.00,
-                'Low': 1.00,
-                'Nominal': 1.00,
-                'High': 1.05,
-                'VeryHigh': 1.20,
-                'ExtraHigh': 1.56
-            },
-            'pvol': {
-                'VeryLow': 1.00,
-                'Low': 0.87,
-                'Nominal': 1.00,
-                'High': 1.15,
-                'VeryHigh': 1.30,
-                'ExtraHigh': 1.56
-            },
-            'acap': {
-                'VeryLow': 1.42,
-                'Low': 1.29,
-                'Nominal': 1.00,
-                'High': 0.85,
-                'VeryHigh': 0.71,
-                'ExtraHigh': 0.56
-            },
-            'pcap': {
-                'VeryLow': 1.34,
-                'Low': 1.15,
-                'Nominal': 1.00,
-                'High': 0.88,
-                'VeryHigh': 0.76,
-                'ExtraHigh': 0.62
-            },
-            'aexp': {
-                'VeryLow': 1.22,
-                'Low': 1.10,
-                'Nominal': 1.00,
-                'High': 0.88,
-                'VeryHigh': 0.81,
-                'ExtraHigh': 0.67
-            },
-            'pexp': {
-                'VeryLow': 1.19,
-                'Low': 1.09,
-                'Nominal': 1.00,
-                'High': 0.91,
-                'VeryHigh': 0.85,
-                'ExtraHigh': 0.76
-            },
-            'ltex': {
-                'VeryLow': 1.20,
-                'Low': 1.09,
-                'Nominal': 1.00,
-                'High': 0.91,
-                'VeryHigh': 0.84,
-                'ExtraHigh': 0.70
-            },
-            'tool': {
-                'VeryLow': 1.17,
-                'Low': 1.09,
-                'Nominal': 1.00,
-                'High': 0.90,
-                'VeryHigh': 0.78,
-                'ExtraHigh': 0.66
-            },
-            'sced': {
-                'VeryLow': 1.43,
-                'Low': 1.14,
-                'Nominal': 1.00,
-                'High': 1.00,
-                'VeryHigh': 1.00,
-                'ExtraHigh': 1.00
-            }
-        }
+        # Static driver tables are shared module constants, so constructing an analyzer stays cheap
+        self.cost_driver_descriptions = COST_DRIVER_DESCRIPTIONS
+        self.cost_driver_multipliers = COST_DRIVER_MULTIPLIERS
         
         # Predefined value categories (exact match required)
         self.value_categories = list(self.cost_driver_multipliers['rely'].keys())
@@ -179,68 +290,219 @@ Respond with ONLY the selected rating value. Example: "High"
 
 YOUR RESPONSE: """
 
-    def analyze_null_cost_drivers(self, cost_drivers):
+    def generate_batch_prompt(self, drivers):
         """
-        Analyze cost drivers with null values using Groq API
+        Generate a prompt asking for ratings of several cost drivers in one JSON response
         
-        :param cost_drivers: List of cost drivers with potential null values
-        :return: Updated list of cost drivers with inferred values
+        :param drivers: List of cost driver names to rate
+        :return: Structured prompt for a JSON-mode Groq completion
         """
-        # Filter out cost drivers with null values
-        null_drivers = [driver for driver in cost_drivers if driver['value'].lower() == 'null']
+        driver_lines = "\n".join(
+            f"- {driver}: {self.cost_driver_descriptions.get(driver, 'No description available')}"
+            for driver in drivers
+        )
+        example = ", ".join(f'"{driver}": "Nominal"' for driver in drivers)
         
-        # Process each null driver
-        for driver in null_drivers:
-            try:
-                # Generate prompt for the specific driver
-                prompt = self.generate_prompt(driver['driver'])
-                
+        return f"""TASK: Software Project Cost Driver Analysis
+
+OBJECTIVE: 
+- Precisely categorize each of the following software development cost drivers
+- Assign an accurate complexity/impact rating to each based on detailed criteria
+
+CONTEXT:
+Cost drivers are factors that significantly influence the effort and complexity of software development. Your assessment will help estimate project resources and challenges.
+
+COST DRIVERS:
+{driver_lines}
+
+RATING SCALE (STRICTLY USE THESE VALUES ONLY):
+- VeryLow: Minimum impact, lowest complexity, minimal additional effort required
+- Low: Slight complexity, minimal additional challenges
+- Nominal: Standard, average complexity, typical project considerations
+- High: Significant complexity, substantial additional effort needed
+- VeryHigh: Extensive complexity, major challenges expected
+- ExtraHigh: Extreme complexity, potentially project-critical challenges
+
+CRITICAL INSTRUCTIONS:
+1. Analyze each cost driver's characteristics comprehensively
+2. Select ONLY ONE rating from the provided scale for every driver listed
+3. Respond with a single JSON object mapping each driver name to its rating
+4. DO NOT include ANY additional keys, text, explanation, or commentary
+
+RESPONSE FORMAT:
+{{{example}}}"""
+
+    def infer_driver_value(self, driver, deadline=None):
+        """
+        Infer the rating of a single cost driver with one Groq call
+        
+        :param driver: Cost driver name
+        :param deadline: Optional monotonic deadline shared by every call of the request
+        :return: A value from value_categories, or None if the response is invalid or the call fails
+        """
+        try:
+            # Generate prompt for the specific driver
+            prompt = self.generate_prompt(driver)
+            
+            def request():
                 # Make API call to Groq
+                with observe_llm_call('cost_driver_rating') as call:
+                    response = self.client.chat.completions.create(
+                        messages=[
+                            {
+                                "role": "system",
+                                "content": "You are a precise software project estimation analyst. Provide ONLY the specified value."
+                            },
+                            {
+                                "role": "user",
+                                "content": prompt
+                            }
+                        ],
+                        model=self.model,
+                        max_tokens=10,
+                        temperature=0.7
+                    )
+                    call.record(response)
+                return response
+            
+            response = self.call_policy.call(request, operation='cost_driver_rating', deadline=deadline)
+            
+            # Extract and clean the response
+            inferred_value = response.choices[0].message.content.strip()
+            
+            # Validate the response
+            if inferred_value in self.value_categories:
+                logger.debug("Inferred value for %s: %s", driver, inferred_value)
+                return inferred_value
+            
+            logger.warning("Invalid response for %s", driver)
+            return None
+        
+        except Exception as e:
+            logger.warning("Error processing %s: %s", driver, e)
+            return None
+
+    def infer_driver_values_single_shot(self, drivers, deadline=None):
+        """
+        Infer the ratings of several cost drivers with one JSON-mode Groq call
+        
+        :param drivers: List of cost driver names
+        :param deadline: Optional monotonic deadline for the call and its retries
+        :return: Dictionary of driver name to value, None for any missing or invalid rating
+        """
+        inferred = {driver: None for driver in drivers}
+        
+        def request():
+            with observe_llm_call('cost_driver_ratings_batch') as call:
                 response = self.client.chat.completions.create(
                     messages=[
                         {
                             "role": "system",
-                            "content": "You are a precise software project estimation analyst. Provide ONLY the specified value."
+                            "content": "You are a precise software project estimation analyst. Respond ONLY with the requested JSON object."
                         },
                         {
                             "role": "user",
-                            "content": prompt
+                            "content": self.generate_batch_prompt(drivers)
                         }
                     ],
-                    model="llama-3.2-3b-preview",
-                    max_tokens=10,
-                    temperature=0.7
+                    model=self.model,
+                    max_tokens=16 * len(drivers) + 16,
+                    temperature=0.7,
+                    response_format={"type": "json_object"}
                 )
-                
-                # Extract and clean the response
-                inferred_value = response.choices[0].message.content.strip()
-                
-                # Validate the response
-                if inferred_value in self.value_categories:
-                    driver['value'] = inferred_value
-                    print(f"Inferred value for {driver['driver']}: {inferred_value}")
-                else:
-                    # Fallback to Nominal if response is invalid
-                    driver['value'] = 'Nominal'
-                    print(f"Invalid response for {driver['driver']}, defaulting to Nominal")
+                call.record(response)
+            return response
+        
+        try:
+            response = self.call_policy.call(request, operation='cost_driver_ratings_batch', deadline=deadline)
+            ratings = json.loads(response.choices[0].message.content)
+        
+        except Exception as e:
+            logger.warning("Error processing cost drivers %s: %s", drivers, e)
+            return inferred
+        
+        # Validate each driver independently so one bad rating does not discard the rest
+        for driver in drivers:
+            value = ratings.get(driver) if isinstance(ratings, dict) else None
+            if isinstance(value, str) and value.strip() in self.value_categories:
+                inferred[driver] = value.strip()
+                logger.debug("Inferred value for %s: %s", driver, inferred[driver])
+            else:
+                logger.warning("Invalid response for %s", driver)
+        
+        return inferred
+
+    def infer_driver_values_concurrent(self, drivers, deadline=None):
+        """
+        Infer the ratings of several cost drivers with per-driver Groq calls run concurrently
+        
+        :param drivers: List of cost driver names
+        :param deadline: Optional monotonic deadline shared by every call
+        :return: Dictionary of driver name to value, None for any failed inference
+        """
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(drivers))) as executor:
+            return dict(zip(drivers, executor.map(lambda driver: self.infer_driver_value(driver, deadline), drivers)))
+
+    def analyze_null_cost_drivers(self, cost_drivers):
+        """
+        Analyze cost drivers with null values using Groq API
+        
+        :param cost_drivers: List of cost drivers with potential null values
+        :return: Updated list of cost drivers with inferred values
+        """
+        # Filter out cost drivers with null values
+        null_drivers = [driver for driver in cost_drivers if driver['value'].lower() == 'null']
+        if not null_drivers:
+            return cost_drivers
+        
+        # Resolve each distinct driver once: pinned or memoized ratings first, then the LLM
+        driver_names = list(dict.fromkeys(driver['driver'] for driver in null_drivers))
+        inferred = {}
+        if self.memo is not None:
+            for name in driver_names:
+                value = self.memo.get(name, self.model)
+                if value in self.value_categories:
+                    inferred[name] = value
+        missing = [name for name in driver_names if name not in inferred]
+        
+        if missing:
+            # One deadline for every call of this request, so sequential mode is bounded too
+            deadline = self.call_policy.deadline()
+            if self.inference_mode == 'single_shot':
+                fresh = self.infer_driver_values_single_shot(missing, deadline)
+            elif self.inference_mode == 'concurrent':
+                fresh = self.infer_driver_values_concurrent(missing, deadline)
+            else:
+                fresh = {name: self.infer_driver_value(name, deadline) for name in missing}
             
-            except Exception as e:
-                print(f"Error processing {driver['driver']}: {str(e)}")
-                # Fallback to a default value if inference fails
-                driver['value'] = 'Nominal'
+            for name, value in fresh.items():
+                if value is None:
+                    # Fallback to Nominal if inference failed; not memoized so it is retried next time
+                    logger.warning("Defaulting %s to Nominal", name)
+                    value = 'Nominal'
+                elif self.memo is not None:
+                    self.memo.set(name, self.model, value)
+                inferred[name] = value
+        
+        for driver in null_drivers:
+            driver['value'] = inferred[driver['driver']]
         
         return cost_drivers
 
-def process_cost_drivers(cost_drivers, groq_api_key):
+def process_cost_drivers(cost_drivers, groq_api_key=None, inference_mode='sequential', max_concurrency=4, analyzer=None):
     """
     Main function to process cost drivers
     
     :param cost_drivers: List of cost drivers
-    :param groq_api_key: Groq API key
+    :param groq_api_key: Groq API key (only used when no analyzer is given)
+    :param inference_mode: Strategy for inferring null drivers (see INFERENCE_MODES)
+    :param max_concurrency: Maximum in-flight Groq calls in 'concurrent' mode
+    :param analyzer: Shared CostDriversAnalyzer; a new one is created if omitted
     :return: Processed cost drivers with numerical multipliers
     """
     # Initialize the analyzer
-    analyzer = CostDriversAnalyzer(groq_api_key)
+    if analyzer is None:
+        analyzer = CostDriversAnalyzer(groq_api_key, inference_mode=inference_mode, max_concurrency=max_concurrency)
     
     # Analyze and update null cost drivers
     processed_drivers = analyzer.analyze_null_cost_drivers(cost_drivers)
@@ -248,17 +510,17 @@ def process_cost_drivers(cost_drivers, groq_api_key):
     # Add numerical multipliers to the processed drivers
     for driver in processed_drivers:
         try:
-            # Ensure case-insensitive matching
-            normalized_value = driver['value'].title()
+            # Ensure case-insensitive matching (str.title() would turn 'VeryHigh' into 'Veryhigh')
+            normalized_value = normalize_rating(driver['value']) or driver['value']
             
             # Verify the driver and value exist in the multipliers
             if driver['driver'] not in analyzer.cost_driver_multipliers:
-                print(f"Warning: Unknown cost driver '{driver['driver']}'")
+                logger.warning("Unknown cost driver '%s'", driver['driver'])
                 driver['numerical_value'] = 1.0  # Default neutral value
                 continue
             
             if normalized_value not in analyzer.cost_driver_multipliers[driver['driver']]:
-                print(f"Warning: Invalid value '{normalized_value}' for driver '{driver['driver']}'")
+                logger.warning("Invalid value '%s' for driver '%s'", normalized_value, driver['driver'])
                 driver['numerical_value'] = 1.0  # Default neutral value
                 continue
             
@@ -266,7 +528,7 @@ def process_cost_drivers(cost_drivers, groq_api_key):
             driver['numerical_value'] = analyzer.cost_driver_multipliers[driver['driver']][normalized_value]
         
         except KeyError as e:
-            print(f"Error processing driver {driver}: {str(e)}")
+            logger.warning("Error processing driver %s: %s", driver, e)
             driver['numerical_value'] = 1.0  # Fallback to neutral value
     
     return processed_drivers
@@ -1,47 +1,275 @@
+import codecs
+import io
+import logging
+import multiprocessing
 import os
+import tempfile
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import PyPDF2
-import docx
 import mammoth  # Better alternative for .docx files
 
-def extract_text_from_document(document):
+logger = logging.getLogger(__name__)
+
+# Size of the pieces yielded for formats without natural page boundaries
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# Process pool shared by every parallel PDF extraction, created on first use
+_pdf_pool = None
+_pdf_pool_workers = None
+_pdf_pool_lock = threading.Lock()
+
+# In each pool worker: (path, open file, PdfReader) of the PDF it last extracted from, released
+# after _WORKER_PDF_IDLE_SECONDS without a task so the deleted temporary file is not held open
+_worker_pdf = None
+_worker_pdf_lock = threading.Lock()
+_worker_pdf_timer = None
+_WORKER_PDF_IDLE_SECONDS = 5
+
+class DocumentTooLargeError(ValueError):
+    """
+    Raised when an uploaded document exceeds the configured maximum size
+    """
+
+def open_document_stream(document, max_bytes=None):
+    """
+    Get a seekable binary stream for an upload without writing it to disk
+
+    :param document: File object from Flask request (or anything with .filename and .stream)
+    :param max_bytes: Maximum accepted size in bytes (None for no limit)
+    :return: Seekable binary stream positioned at the start of the document
+    """
+    stream = getattr(document, 'stream', document)
+
+    if stream.seekable():
+        # Werkzeug already spooled the upload; measure it in place instead of copying
+        size = stream.seek(0, io.SEEK_END)
+        stream.seek(0)
+        if max_bytes is not None and size > max_bytes:
+            raise DocumentTooLargeError(f"Document is {size} bytes, the limit is {max_bytes} bytes")
+        return stream
+
+    # Non-seekable streams are buffered in memory, stopping as soon as the limit is passed
+    buffer = io.BytesIO()
+    while True:
+        block = stream.read(DEFAULT_CHUNK_SIZE)
+        if not block:
+            break
+        buffer.write(block)
+        if max_bytes is not None and buffer.tell() > max_bytes:
+            raise DocumentTooLargeError(f"Document exceeds the limit of {max_bytes} bytes")
+    buffer.seek(0)
+    return buffer
+
+def _extract_pdf_page_range(pdf_path, start, stop):
+    """
+    Extract the text of pages [start, stop) in a worker process
+
+    The worker keeps the reader of the last PDF it opened, so it parses each document
+    once however many of its ranges it is given, and releases it once it has been idle
+    for _WORKER_PDF_IDLE_SECONDS. Only the path crosses the process boundary; the file
+    itself is shared through the page cache.
+
+    :param pdf_path: Path of a temporary copy of the PDF
+    :param start: Index of the first page
+    :param stop: Index one past the last page
+    :return: List of page texts in order
+    """
+    global _worker_pdf, _worker_pdf_timer
+    if _worker_pdf_timer is not None:
+        _worker_pdf_timer.cancel()
+    with _worker_pdf_lock:
+        if _worker_pdf is None or _worker_pdf[0] != pdf_path:
+            if _worker_pdf is not None:
+                _worker_pdf[1].close()
+            pdf_file = open(pdf_path, 'rb')
+            _worker_pdf = (pdf_path, pdf_file, PyPDF2.PdfReader(pdf_file))
+        reader = _worker_pdf[2]
+        texts = [reader.pages[index].extract_text() or '' for index in range(start, stop)]
+    _worker_pdf_timer = threading.Timer(_WORKER_PDF_IDLE_SECONDS, _release_worker_pdf)
+    _worker_pdf_timer.daemon = True
+    _worker_pdf_timer.start()
+    return texts
+
+def _release_worker_pdf():
+    """
+    Close the reader cached by _extract_pdf_page_range in this worker
+    """
+    global _worker_pdf
+    with _worker_pdf_lock:
+        if _worker_pdf is not None:
+            _worker_pdf[1].close()
+            _worker_pdf = None
+
+def _get_pdf_pool(max_workers):
+    """
+    Get the shared extraction process pool, recreating it if the worker count changed
+    """
+    global _pdf_pool, _pdf_pool_workers
+    with _pdf_pool_lock:
+        if _pdf_pool is None or _pdf_pool_workers != max_workers:
+            if _pdf_pool is not None:
+                _pdf_pool.shutdown(wait=False)
+            # Spawned workers start clean instead of inheriting the web server's threads, sockets and locks
+            _pdf_pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'))
+            _pdf_pool_workers = max_workers
+        return _pdf_pool
+
+def _reset_pdf_pool():
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is not None:
+            _pdf_pool.shutdown(wait=False)
+        _pdf_pool = None
+
+def iter_pdf_pages_parallel(stream, page_count, max_workers):
+    """
+    Yield the text of a PDF page by page, extracting page ranges in a process pool
+
+    Ranges are split into about two per worker to balance uneven pages, and are
+    yielded in document order as they complete. The PDF is written once to a temporary
+    file that every worker opens, so tasks carry only a path and a page range.
+
+    :param stream: Seekable binary stream containing the PDF
+    :param page_count: Number of pages in the PDF
+    :param max_workers: Number of worker processes
+    """
+    # Workers open one temporary copy instead of each task pickling the whole document
+    stream.seek(0)
+    # The unique name also keys the readers cached in the workers
+    with tempfile.NamedTemporaryFile(prefix=f'extract-{uuid.uuid4().hex}-', suffix='.pdf', delete=False) as pdf_file:
+        while True:
+            block = stream.read(DEFAULT_CHUNK_SIZE)
+            if not block:
+                break
+            pdf_file.write(block)
+    range_size = max(1, -(-page_count // (max_workers * 2)))
+    ranges = [(start, min(start + range_size, page_count)) for start in range(0, page_count, range_size)]
+
+    futures = []
+    try:
+        pool = _get_pdf_pool(max_workers)
+        futures = [pool.submit(_extract_pdf_page_range, pdf_file.name, start, stop) for start, stop in ranges]
+        for future in futures:
+            yield from future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+        try:
+            # Workers may still hold the file open; on POSIX the data goes once they move on
+            os.remove(pdf_file.name)
+        except OSError:
+            logger.warning("Could not remove temporary PDF %s", pdf_file.name)
+
+def iter_pdf_pages(stream, parallel_page_threshold=None, max_workers=None):
+    """
+    Yield the text of a PDF one page at a time
+
+    :param stream: Seekable binary stream containing the PDF
+    :param parallel_page_threshold: Minimum page count for process-pool extraction (None keeps it serial)
+    :param max_workers: Worker processes for parallel extraction (defaults to the CPU count)
+    """
+    reader = PyPDF2.PdfReader(stream)
+    page_count = len(reader.pages)
+    max_workers = max_workers or os.cpu_count() or 1
+
+    if parallel_page_threshold is not None and page_count >= parallel_page_threshold and max_workers > 1:
+        yielded = 0
+        try:
+            for text in iter_pdf_pages_parallel(stream, page_count, max_workers):
+                yield text
+                yielded += 1
+            return
+        except BrokenProcessPool as e:
+            # Finish the remaining pages serially rather than failing the upload
+            logger.warning("PDF extraction pool failed, continuing serially: %s", e)
+            _reset_pdf_pool()
+            for page in reader.pages[yielded:]:
+                yield page.extract_text() or ''
+            return
+
+    for page in reader.pages:
+        yield page.extract_text() or ''
+
+def iter_text_chunks(stream, chunk_size=DEFAULT_CHUNK_SIZE, encoding='utf-8'):
+    """
+    Decode a text upload incrementally, yielding chunks as they are read
+
+    :param stream: Binary stream containing the text
+    :param chunk_size: Number of bytes read per chunk
+    :param encoding: Text encoding of the upload
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    while True:
+        block = stream.read(chunk_size)
+        if not block:
+            break
+        text = decoder.decode(block)
+        if text:
+            yield text
+    tail = decoder.decode(b'', final=True)
+    if tail:
+        yield tail
+
+def iter_document_text(document, max_bytes=None, chunk_size=DEFAULT_CHUNK_SIZE, parallel_page_threshold=None, max_workers=None):
+    """
+    Extract text from various document types incrementally
+
+    PDFs are yielded page by page and text files chunk by chunk, so downstream
+    stages can start before the whole document has been converted.
+
+    :param document: File object from Flask request
+    :param max_bytes: Maximum accepted upload size in bytes (None for no limit)
+    :param chunk_size: Size of the chunks yielded for text and DOCX documents
+    :param parallel_page_threshold: Minimum PDF page count for process-pool extraction (None keeps it serial)
+    :param max_workers: Worker processes for parallel PDF extraction
+    :return: Generator of text pieces
+    """
+    filename = document.filename.lower()
+    stream = open_document_stream(document, max_bytes)
+
+    if filename.endswith('.pdf'):
+        yield from iter_pdf_pages(stream, parallel_page_threshold, max_workers)
+
+    elif filename.endswith('.docx'):
+        # mammoth needs the whole zip archive, so the converted text is yielded in chunks
+        text = mammoth.extract_raw_text(stream).value
+        for start in range(0, len(text), chunk_size):
+            yield text[start:start + chunk_size]
+
+    elif filename.endswith('.txt'):
+        yield from iter_text_chunks(stream, chunk_size)
+
+    else:
+        # Fallback for unknown file types
+        yield "Unsupported file type"
+
+def extract_text_from_document(document, max_bytes=None, parallel_page_threshold=None, max_workers=None):
     """
     Extract text from various document types
-    
+
     :param document: File object from Flask request
+    :param max_bytes: Maximum accepted upload size in bytes (None for no limit)
+    :param parallel_page_threshold: Minimum PDF page count for process-pool extraction (None keeps it serial)
+    :param max_workers: Worker processes for parallel PDF extraction
     :return: Extracted text as string
+    :raises DocumentTooLargeError: If the upload exceeds max_bytes
     """
     try:
-        # Get original filename
-        filename = document.filename.lower()
-        
-        # Temporarily save the uploaded file
-        temp_path = os.path.join('/tmp', filename)
-        document.save(temp_path)
-        
-        # Extract text based on file extension
-        if filename.endswith('.pdf'):
-            with open(temp_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                text = ' '.join([page.extract_text() for page in reader.pages])
-        
-        elif filename.endswith('.docx'):
-            with open(temp_path, 'rb') as file:
-                result = mammoth.extract_text(file)
-                text = result.value
-        
-        elif filename.endswith('.txt'):
-            with open(temp_path, 'r', encoding='utf-8') as file:
-                text = file.read()
-        
-        else:
-            # Fallback for unknown file types
-            text = "Unsupported file type"
-        
-        # Remove temporary file
-        os.unlink(temp_path)
-        
-        return text
-    
+        # PDF pages are joined with a form feed (so compaction can find per-page headers
+        # and footers), other formats are concatenated as read
+        separator = '\f' if document.filename.lower().endswith('.pdf') else ''
+        return separator.join(iter_document_text(
+            document, max_bytes,
+            parallel_page_threshold=parallel_page_threshold,
+            max_workers=max_workers
+        ))
+
+    except DocumentTooLargeError:
+        raise
+
     except Exception as e:
-        print(f"Error extracting document text: {str(e)}")
-        return ""
\ No newline at end of file
+        logger.error("Error extracting document text: %s", e)
+        return ""
@@ -1,24 +1,52 @@
-import pandas as pd
+import logging
+import os
 import numpy as np
-import tensorflow as tf
 import pickle
-from sklearn.preprocessing import MinMaxScaler
+from services.numpy_effort_engine import NumpyEffortEngine
+
+logger = logging.getLogger(__name__)
+
+# Model artifacts live in the Backend directory, independent of the working directory
+MODEL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 class EffortEstimationModel:
-    def __init__(self, model_path='cocomo_effort_model.keras', scaler_X_path='scaler_X.pkl', scaler_y_path='scaler_y.pkl'):
+    def __init__(self, model_path=os.path.join(MODEL_DIR, 'cocomo_effort_model.keras'),
+                 scaler_X_path=os.path.join(MODEL_DIR, 'scaler_X.pkl'),
+                 scaler_y_path=os.path.join(MODEL_DIR, 'scaler_y.pkl'),
+                 engine='auto', numpy_model_path=os.path.join(MODEL_DIR, 'cocomo_effort_model.npz'), mmap_weights=False):
         """
         Initialize the Effort Estimation Model
         
         :param model_path: Path to the saved TensorFlow model
         :param scaler_X_path: Path to the saved MinMaxScaler for input features
         :param scaler_y_path: Path to the saved MinMaxScaler for output labels
+        :param engine: 'keras', 'numpy', or 'auto' (numpy when the exported .npz exists)
+        :param numpy_model_path: Path to the .npz produced by export_numpy_model.py
+        :param mmap_weights: Memory-map the NumPy engine's weights read-only so processes share one copy
         """
-        # Load the pre-trained model
-        self.model = tf.keras.models.load_model(model_path)
-        
-        # Load scalers
-        self.scaler_X = self._load_scaler(scaler_X_path)
-        self.scaler_y = self._load_scaler(scaler_y_path)
+        if engine == 'auto':
+            engine = 'numpy' if os.path.exists(numpy_model_path) else 'keras'
+        if engine not in ('keras', 'numpy'):
+            raise ValueError(f"Unknown inference engine '{engine}'")
+        self.engine = engine
+        
+        if engine == 'numpy':
+            # TensorFlow-free inference with BatchNorm and scalers baked into the weights
+            self.numpy_engine = NumpyEffortEngine.load(numpy_model_path, mmap_mode='r' if mmap_weights else None)
+            self.model = None
+            self.scaler_X = None
+            self.scaler_y = None
+        else:
+            # Imported lazily so the NumPy engine never pays the TensorFlow import
+            import tensorflow as tf
+            
+            # Load the pre-trained model
+            self.numpy_engine = None
+            self.model = tf.keras.models.load_model(model_path)
+            
+            # Load scalers
+            self.scaler_X = self._load_scaler(scaler_X_path)
+            self.scaler_y = self._load_scaler(scaler_y_path)
         
         # Predefined order of cost drivers for consistent input
         self.cost_driver_order = [
@@ -38,9 +66,42 @@ class EffortEstimationModel:
             with open(scaler_path, 'rb') as f:
                 return pickle.load(f)
         except (FileNotFoundError, IOError):
-            print(f"Warning: Could not load scaler from {scaler_path}. Using default MinMaxScaler.")
+            from sklearn.preprocessing import MinMaxScaler
+            logger.warning("Could not load scaler from %s. Using default MinMaxScaler.", scaler_path)
             return MinMaxScaler()
 
+    def build_feature_matrix(self, batch_cost_drivers, estimated_klocs):
+        """
+        Build the raw (N, 16) feature matrix for a batch of projects
+        
+        :param batch_cost_drivers: List of processed cost driver lists, one per project
+        :param estimated_klocs: List of estimated KLOC values, one per project
+        :return: Unscaled input features with one row per project
+        """
+        if len(batch_cost_drivers) != len(estimated_klocs):
+            raise ValueError("batch_cost_drivers and estimated_klocs must have the same length")
+        
+        # Fill the raw feature matrix row by row (cost drivers first, KLOC last)
+        X = np.ones((len(estimated_klocs), len(self.cost_driver_order) + 1), dtype=np.float64)
+        for row, processed_cost_drivers in enumerate(batch_cost_drivers):
+            cost_driver_dict = {driver['driver']: driver['numerical_value'] for driver in processed_cost_drivers}
+            for column, driver in enumerate(self.cost_driver_order):
+                X[row, column] = cost_driver_dict.get(driver, 1.0)
+        X[:, -1] = estimated_klocs
+        
+        return X
+
+    def scale_input(self, X):
+        """
+        Scale a raw feature matrix with whichever scaler the active engine uses
+        
+        :param X: Raw (N, 16) feature matrix
+        :return: Scaled feature matrix
+        """
+        if self.engine == 'numpy':
+            return self.numpy_engine.transform_input(X)
+        return self.scaler_X.transform(X)
+
     def prepare_input(self, processed_cost_drivers, estimated_kloc):
         """
         Prepare input for the model with proper feature names
@@ -49,25 +110,36 @@ class EffortEstimationModel:
         :param estimated_kloc: Estimated thousands of lines of code
         :return: Scaled input features
         """
-        # Create a dictionary of cost drivers for easy lookup
-        cost_driver_dict = {driver['driver']: driver['numerical_value'] for driver in processed_cost_drivers}
-        
-        # Prepare input features in the predefined order
-        input_features = [
-            cost_driver_dict.get(driver, 1.0)  # Default to 1.0 if driver not present
-            for driver in self.cost_driver_order
-        ]
+        return self.scale_input(self.build_feature_matrix([processed_cost_drivers], [estimated_kloc]))
+
+    def prepare_input_batch(self, batch_cost_drivers, estimated_klocs):
+        """
+        Prepare a scaled (N, 16) input matrix for a batch of projects
         
-        # Add estimated KLOC as the last feature
-        input_features.append(estimated_kloc)
+        :param batch_cost_drivers: List of processed cost driver lists, one per project
+        :param estimated_klocs: List of estimated KLOC values, one per project
+        :return: Scaled input features with one row per project
+        """
+        return self.scale_input(self.build_feature_matrix(batch_cost_drivers, estimated_klocs))
+
+    def predict_effort_matrix(self, X, dtype=None):
+        """
+        Predict effort for a raw feature matrix with a single model invocation
         
-        # Convert to NumPy array
-        X = np.array(input_features).reshape(1, -1)
+        :param X: Raw (N, 16) feature matrix in cost_driver_order followed by KLOC
+        :param dtype: Optional compute dtype for the NumPy engine (np.float32 for large sample batches);
+                      the Keras engine always computes in float32
+        :return: 1-D NumPy array of predicted efforts
+        """
+        if len(X) == 0:
+            return np.empty(0)
         
-        # Scale the input features
-        X_scaled = self.scaler_X.transform(X)
+        if self.engine == 'numpy':
+            return self.numpy_engine.predict(X, dtype=dtype)
         
-        return X_scaled
+        # One forward pass for all rows, then inverse transform to actual effort
+        effort_scaled = self.model.predict(self.scaler_X.transform(X), batch_size=len(X), verbose=0)
+        return self.scaler_y.inverse_transform(effort_scaled)[:, 0]
 
     def predict_effort(self, processed_cost_drivers, estimated_kloc):
         """
@@ -77,16 +149,25 @@ class EffortEstimationModel:
         :param estimated_kloc: Estimated thousands of lines of code
         :return: Predicted effort as a standard Python float
         """
-        # Prepare scaled input
-        X_scaled = self.prepare_input(processed_cost_drivers, estimated_kloc)
-        
-        # Make prediction
-        effort_scaled = self.model.predict(X_scaled)
-        
-        # Inverse transform to get actual effort and convert to standard Python float
-        effort = float(self.scaler_y.inverse_transform(effort_scaled)[0][0])
+        return self.predict_effort_batch([processed_cost_drivers], [estimated_kloc])[0]
+
+    def predict_effort_batch(self, batch_cost_drivers, estimated_klocs):
+        """
+        Predict effort for many projects with a single model invocation
         
-        return effort
+        :param batch_cost_drivers: List of processed cost driver lists, one per project
+        :param estimated_klocs: List of estimated KLOC values, one per project
+        :return: List of predicted efforts as standard Python floats
+        """
+        X = self.build_feature_matrix(batch_cost_drivers, estimated_klocs)
+        return [float(effort) for effort in self.predict_effort_matrix(X)]
+
+    def warm_up(self):
+        """
+        Run one dummy prediction (all drivers Nominal, 10 KLOC) so the first real request
+        does not pay Keras graph tracing or NumPy first-call costs
+        """
+        self.predict_effort([], 10.0)
 
     def calculate_development_time(self, effort, estimated_kloc=None):
         """
@@ -101,8 +182,18 @@ class EffortEstimationModel:
         if isinstance(effort, complex):
             effort = effort.real  # Get the real part if it's a complex number
 
-        # COCOMO II development time calculation
+        # COCOMO II development time calculation (a negative network output would make the power complex)
         B = 0.91 + 0.01 * len(self.cost_driver_order)
-        development_time = B * (effort ** 0.28)
+        development_time = B * (max(effort, 0.0) ** 0.28)
         
         return float(development_time)  # Ensure it's a standard Python float
+
+    def calculate_development_time_batch(self, efforts):
+        """
+        Vectorized calculate_development_time for an array of efforts
+
+        :param efforts: Array of efforts in person-months
+        :return: Array of development times in months (non-positive efforts give 0)
+        """
+        B = 0.91 + 0.01 * len(self.cost_driver_order)
+        return B * np.maximum(np.asarray(efforts, dtype=np.float64), 0.0) ** 0.28
@@ -0,0 +1,163 @@
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from services.estimation_pipeline import ESTIMATION_STAGES
+
+logger = logging.getLogger(__name__)
+
+class JobQueueFullError(Exception):
+    """
+    Raised when the estimation job queue is at its depth limit
+    """
+
+class EstimationJobManager:
+    def __init__(self, pipeline, max_workers=4, max_queue_depth=32, result_ttl_seconds=3600, store=None):
+        """
+        Run estimation pipelines in a bounded background worker pool
+
+        A job runs in the process that accepted it. With a shared store every state change
+        is also written there, so under a pre-fork server any worker can answer a poll.
+
+        :param pipeline: EstimationPipeline instance
+        :param max_workers: Number of pipelines run at the same time
+        :param max_queue_depth: Jobs allowed to wait for a worker before submissions are rejected
+        :param result_ttl_seconds: Seconds a finished job stays available for polling
+        :param store: Optional JobStore shared by all server processes; jobs are only visible to this process if omitted
+        """
+        self.pipeline = pipeline
+        self.store = store
+        self.max_workers = max_workers
+        self.max_queue_depth = max_queue_depth
+        self.result_ttl_seconds = result_ttl_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='estimation-job')
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue_depth)
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, requirements_doc, cost_drivers, include_uncertainty=False):
+        """
+        Queue an estimation
+
+        :param requirements_doc: In-memory document (must not reference the request stream), or None
+        :param cost_drivers: List of cost drivers as received from the client
+        :param include_uncertainty: Add Monte Carlo P10/P50/P90 ranges to the result
+        :return: Job id
+        :raises JobQueueFullError: If max_workers + max_queue_depth jobs are already pending
+        """
+        if not self._slots.acquire(blocking=False):
+            raise JobQueueFullError(f"Estimation queue is full ({self.max_queue_depth} jobs waiting)")
+
+        self._prune_finished()
+        job_id = uuid.uuid4().hex
+        job = {
+            "jobId": job_id,
+            "status": "queued",
+            "createdAt": datetime.now().isoformat(),
+            "stages": {stage: {"status": "pending"} for stage in ESTIMATION_STAGES},
+            "result": None,
+            "error": None,
+            "_finished_at": None
+        }
+        with self._lock:
+            self._jobs[job_id] = job
+        self._persist(job)
+
+        try:
+            self._executor.submit(self._run, job, requirements_doc, cost_drivers, include_uncertainty)
+        except Exception:
+            with self._lock:
+                self._jobs.pop(job_id, None)
+            self._slots.release()
+            raise
+
+        return job_id
+
+    def get(self, job_id):
+        """
+        :param job_id: Id returned by submit
+        :return: Snapshot of the job state, or None if unknown or expired
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                return self._snapshot(job)
+        # Queued by another server process
+        return self.store.get(job_id) if self.store is not None else None
+
+    def stats(self):
+        """
+        :return: Counts of this process's jobs by status
+        """
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job['status']] = counts.get(job['status'], 0) + 1
+        return counts
+
+    def _run(self, job, requirements_doc, cost_drivers, include_uncertainty):
+        def on_stage(stage, status):
+            now = time.perf_counter()
+            with self._lock:
+                state = job['stages'][stage]
+                state['status'] = 'running' if status == 'started' else status
+                if status == 'started':
+                    state['_started'] = now
+                else:
+                    state['durationMs'] = round((now - state.pop('_started', now)) * 1000, 3)
+            self._persist(job)
+
+        with self._lock:
+            job['status'] = 'running'
+        self._persist(job)
+        try:
+            result = self.pipeline.run(requirements_doc, cost_drivers, on_stage=on_stage, include_uncertainty=include_uncertainty)
+            with self._lock:
+                job['result'] = result
+                job['status'] = 'succeeded'
+        except Exception as e:
+            logger.exception("Estimation job %s failed", job['jobId'])
+            with self._lock:
+                job['error'] = str(e)
+                job['status'] = 'failed'
+                for state in job['stages'].values():
+                    if state['status'] == 'running':
+                        state['status'] = 'failed'
+                        state.pop('_started', None)
+        finally:
+            with self._lock:
+                job['_finished_at'] = time.monotonic()
+            self._persist(job)
+            self._slots.release()
+
+    def _snapshot(self, job):
+        # Caller holds self._lock
+        snapshot = {key: value for key, value in job.items() if not key.startswith('_')}
+        snapshot['stages'] = {
+            stage: {key: value for key, value in state.items() if not key.startswith('_')}
+            for stage, state in job['stages'].items()
+        }
+        return snapshot
+
+    def _persist(self, job):
+        if self.store is None:
+            return
+        with self._lock:
+            snapshot = self._snapshot(job)
+        try:
+            self.store.save(snapshot)
+        except Exception:
+            # Polls through this process still see the job; other processes see the last saved state
+            logger.exception("Could not save estimation job %s", job['jobId'])
+
+    def _prune_finished(self):
+        cutoff = time.monotonic() - self.result_ttl_seconds
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job['_finished_at'] is not None and job['_finished_at'] < cutoff
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
@@ -0,0 +1,265 @@
+import logging
+from datetime import datetime
+from services.document_extractor import extract_text_from_document
+from services.function_point_analysis import empty_fpa_analysis
+from services.cost_drivers_analyzer import process_cost_drivers
+from services.metrics import PROMPT_TOKENS_SAVED, timed_stage
+
+logger = logging.getLogger(__name__)
+
+# Pipeline stages in execution order, as reported to progress callbacks
+ESTIMATION_STAGES = ('extraction', 'functionPointAnalysis', 'costDrivers', 'effortPrediction')
+
+def format_function_point_analysis(fpa_analysis):
+    """
+    Convert an FPA analysis into the functionPointAnalysis response shape
+
+    :param fpa_analysis: Dictionary with EI/EO/EQ/ILF/EIF counts and examples
+    :return: Dictionary keyed by the frontend's function type names
+    """
+    return {
+        "externalInputs": {
+            "count": fpa_analysis['EI']['count'],
+            "modules": fpa_analysis['EI']['examples']
+        },
+        "externalOutputs": {
+            "count": fpa_analysis['EO']['count'],
+            "modules": fpa_analysis['EO']['examples']
+        },
+        "externalInquiries": {
+            "count": fpa_analysis['EQ']['count'],
+            "modules": fpa_analysis['EQ']['examples']
+        },
+        "internalLogicalFiles": {
+            "count": fpa_analysis['ILF']['count'],
+            "modules": fpa_analysis['ILF']['examples']
+        },
+        "externalInterfaceFiles": {
+            "count": fpa_analysis['EIF']['count'],
+            "modules": fpa_analysis['EIF']['examples']
+        }
+    }
+
+class EstimationPipeline:
+    def __init__(self, fpa_analyzer, cost_drivers_analyzer, effort_model_loader, max_document_bytes=None,
+                 parallel_page_threshold=None, pdf_workers=None, project_store=None, uncertainty_simulator=None,
+                 analysis_store=None, text_compactor=None):
+        """
+        Full estimation pipeline shared by the synchronous route and background jobs
+
+        :param fpa_analyzer: FunctionPointAnalyzer instance
+        :param cost_drivers_analyzer: Shared CostDriversAnalyzer instance
+        :param effort_model_loader: EffortModelLoader providing the EffortEstimationModel
+        :param max_document_bytes: Largest accepted upload in bytes
+        :param parallel_page_threshold: Minimum PDF page count for process-pool extraction
+        :param pdf_workers: Worker processes for parallel PDF extraction
+        :param project_store: Optional ProjectStore that every result is saved to
+        :param uncertainty_simulator: Optional EffortUncertaintySimulator adding percentile ranges to estimates that ask for them
+        :param analysis_store: Optional AnalysisStore keeping extracted text and FPA results for recompute
+        :param text_compactor: Optional TextCompactor that shrinks extracted text before Function Point Analysis
+        """
+        self.fpa_analyzer = fpa_analyzer
+        self.cost_drivers_analyzer = cost_drivers_analyzer
+        self.effort_model_loader = effort_model_loader
+        self.max_document_bytes = max_document_bytes
+        self.parallel_page_threshold = parallel_page_threshold
+        self.pdf_workers = pdf_workers
+        self.project_store = project_store
+        self.uncertainty_simulator = uncertainty_simulator
+        self.analysis_store = analysis_store
+        self.text_compactor = text_compactor
+
+    def run(self, requirements_doc, cost_drivers, on_stage=None, include_uncertainty=False):
+        """
+        Run extraction, FPA, cost driver inference and effort prediction
+
+        :param requirements_doc: Uploaded document (anything with .filename and .stream), or None
+        :param cost_drivers: List of cost drivers as received from the client
+        :param on_stage: Optional callback on_stage(stage, status) with status 'started' or 'completed'
+        :param include_uncertainty: Add Monte Carlo P10/P50/P90 ranges (tens of milliseconds extra)
+        :return: Estimation response payload
+        """
+        def report(stage, status):
+            if on_stage is not None:
+                on_stage(stage, status)
+
+        extracted_text = ""
+        fpa_analysis = empty_fpa_analysis()
+        fpa_complete = False
+        fpa_cache = None
+        compaction = None
+
+        # Extract text from requirements document if provided
+        report('extraction', 'started')
+        if requirements_doc:
+            with timed_stage('extraction'):
+                extracted_text = extract_text_from_document(
+                    requirements_doc,
+                    max_bytes=self.max_document_bytes,
+                    parallel_page_threshold=self.parallel_page_threshold,
+                    max_workers=self.pdf_workers
+                )
+            # %.500s keeps the preview lazy: nothing is formatted unless DEBUG is enabled
+            logger.debug("Extracted %d characters of document text: %.500s", len(extracted_text), extracted_text)
+
+        # Only the LLM sees the compacted text; the response keeps the text as extracted
+        analysis_text = extracted_text
+        if requirements_doc and self.text_compactor is not None:
+            with timed_stage('compaction'):
+                analysis_text, compaction = self.text_compactor.compact(extracted_text)
+            PROMPT_TOKENS_SAVED.inc(max(0, compaction['tokensSaved']))
+            logger.debug("Text compaction: %s", compaction)
+        report('extraction', 'completed')
+
+        # Perform Function Point Analysis
+        report('functionPointAnalysis', 'started')
+        if requirements_doc:
+            with timed_stage('functionPointAnalysis'):
+                fpa_analysis, fpa_complete, fpa_cache = self.fpa_analyzer.analyze_requirements_with_source(analysis_text)
+            logger.debug("Function Point Analysis: %s", fpa_analysis)
+        report('functionPointAnalysis', 'completed')
+
+        # Keep the expensive part of the estimate so new drivers or languages can be recomputed;
+        # like the FPA cache, only complete analyses are kept, so a failed one is never reused as all zeros
+        analysis_id = None
+        if fpa_complete and self.analysis_store is not None:
+            analysis_id = self.analysis_store.add(extracted_text, fpa_analysis)
+
+        # Process cost drivers with null values
+        report('costDrivers', 'started')
+        logger.debug("Original Cost Drivers: %s", cost_drivers)
+        with timed_stage('costDrivers'):
+            processed_cost_drivers = process_cost_drivers(cost_drivers, analyzer=self.cost_drivers_analyzer)
+        logger.debug("Processed Cost Drivers: %s", processed_cost_drivers)
+        report('costDrivers', 'completed')
+
+        report('effortPrediction', 'started')
+        with timed_stage('effortPrediction'):
+            estimation_results = self.estimate(fpa_analysis, processed_cost_drivers, include_uncertainty=include_uncertainty)
+        report('effortPrediction', 'completed')
+
+        # Prepare response
+        response_data = {
+            "projectName": "Generated Project",
+            "dateCreated": datetime.now().isoformat(),
+            "extractedRequirementsText": extracted_text,
+            "functionPointAnalysis": format_function_point_analysis(fpa_analysis),
+            "estimationResults": estimation_results,
+            "receivedCostDrivers": cost_drivers,
+            "processedCostDrivers": processed_cost_drivers,
+            "analysisId": analysis_id,
+            "textCompaction": compaction,
+            # Set when the analysis was served from the FPA cache; "similar" reuses a near-duplicate's analysis
+            "fpaCache": fpa_cache
+        }
+        
+        # Save the result so it shows up in /projects
+        if self.project_store is not None:
+            with timed_stage('persistence'):
+                response_data['id'] = self.project_store.add(response_data)
+        
+        return response_data
+
+    def recompute(self, analysis_id, cost_drivers, language="Java", include_uncertainty=False):
+        """
+        Re-estimate a stored analysis with new cost drivers and/or language
+
+        Extraction and FPA are skipped entirely; only cost driver processing and the
+        in-process effort model run, so this takes milliseconds once drivers are rated.
+
+        :param analysis_id: Id returned as analysisId by run
+        :param cost_drivers: List of cost drivers as received from the client
+        :param language: Programming language for LOC/FP
+        :param include_uncertainty: Add Monte Carlo P10/P50/P90 ranges
+        :return: Estimation response payload, or None if the analysis is unknown or expired
+        :raises ValueError: On an unknown language
+        :raises ModelNotReadyError: If the effort model has not finished loading
+        """
+        if self.analysis_store is None:
+            return None
+        analysis = self.analysis_store.get(analysis_id)
+        if analysis is None:
+            return None
+        if language not in self.fpa_analyzer.language_productivity:
+            raise ValueError(f"Unknown language '{language}', expected one of {list(self.fpa_analyzer.language_productivity)}")
+
+        fpa_analysis = analysis['fpaAnalysis']
+        with timed_stage('costDrivers'):
+            processed_cost_drivers = process_cost_drivers(cost_drivers, analyzer=self.cost_drivers_analyzer)
+        with timed_stage('effortPrediction'):
+            estimation_results = self.estimate(fpa_analysis, processed_cost_drivers, language=language,
+                                               include_uncertainty=include_uncertainty)
+
+        response_data = {
+            "projectName": "Generated Project",
+            "dateCreated": datetime.now().isoformat(),
+            "extractedRequirementsText": analysis['extractedText'],
+            "functionPointAnalysis": format_function_point_analysis(fpa_analysis),
+            "estimationResults": estimation_results,
+            "receivedCostDrivers": cost_drivers,
+            "processedCostDrivers": processed_cost_drivers,
+            "analysisId": analysis_id,
+            "language": language
+        }
+
+        if self.project_store is not None:
+            with timed_stage('persistence'):
+                response_data['id'] = self.project_store.add(response_data)
+
+        return response_data
+
+    def estimate(self, fpa_analysis, processed_cost_drivers, language="Java", include_uncertainty=False):
+        """
+        Compute project metrics, effort and schedule from an FPA result and processed drivers
+
+        :param fpa_analysis: FPA analysis dictionary
+        :param processed_cost_drivers: Cost drivers with numerical_value set
+        :param language: Programming language for LOC/FP
+        :param include_uncertainty: Add Monte Carlo P10/P50/P90 ranges when an uncertainty simulator is configured
+        :return: estimationResults payload
+        :raises ModelNotReadyError: If the effort model has not finished loading
+        """
+        effort_model = self.effort_model_loader.get()
+
+        # Calculate effort multiplier as the product of numerical values of processed cost drivers
+        effort_multiplier = 1.0
+        for driver in processed_cost_drivers:
+            effort_multiplier *= driver.get('numerical_value', 1.0)
+        logger.debug("Effort Multiplier: %s", effort_multiplier)
+
+        # Calculate project metrics
+        estimation_results = self.fpa_analyzer.calculate_project_metrics(fpa_analysis, language=language)
+        logger.debug("Estimation Results: %s", estimation_results)
+
+        # Update estimation results with the calculated effort multiplier
+        estimation_results['effortMultiplier'] = effort_multiplier
+
+        # Get estimated KLOC from project metrics
+        estimated_kloc = estimation_results.get('estimatedKLOC', 0)
+        logger.debug("Estimated KLOC: %s", estimated_kloc)
+
+        # Predict effort using the trained model
+        predicted_effort = effort_model.predict_effort(processed_cost_drivers, estimated_kloc)
+        logger.debug("Predicted Effort: %s", predicted_effort)
+
+        # Calculate development time
+        development_time = effort_model.calculate_development_time(predicted_effort, estimated_kloc)
+        logger.debug("Development Time: %s", development_time)
+
+        # Update estimation results with predicted effort and time
+        estimation_results['developmentEffort'] = predicted_effort
+        estimation_results['developmentTime'] = development_time
+
+        # P10/P50/P90 ranges around the point estimate; opt-in, as the simulation costs far more than the estimate
+        if include_uncertainty and self.uncertainty_simulator is not None:
+            with timed_stage('uncertainty'):
+                estimation_results['uncertainty'] = self.uncertainty_simulator.simulate(
+                    effort_model,
+                    processed_cost_drivers,
+                    estimated_kloc,
+                    fpa_analysis=fpa_analysis,
+                    vaf=self.fpa_analyzer.vaf,
+                    loc_per_fp=self.fpa_analyzer.language_productivity.get(language, 48)
+                )
+
+        return estimation_results
@@ -1,36 +1,53 @@
 import json
-from groq import Groq
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from services.llm_policy import LLMCallPolicy
+from services.metrics import observe_llm_call
 
-class FunctionPointAnalyzer:
-    def __init__(self, api_key, vaf=1.14):
-        """
-        Initialize Groq client for Function Point Analysis
-        
-        :param api_key: Groq API key
-        """
-        self.client = Groq(api_key=api_key)
-        self.vaf = vaf  # Fixed VAF for calculation
-        # Language Productivity Factors (LOC/FP)
-        self.language_productivity = {
-            "Assembly": 320,
-            "C": 128,
-            "C++": 64,
-            "Java": 48,
-            "Python": 15,
-            "Visual Basic": 20,
-            "SQL": 12
-        }
+logger = logging.getLogger(__name__)
 
-    def analyze_requirements(self, extracted_text):
-        """
-        Analyze requirements document using Groq API for Function Point Analysis
-        
-        :param extracted_text: Text extracted from requirements document
-        :return: Structured FPA analysis as dictionary
-        """
-        try:
-            # System prompt for FPA analysis
-            system_prompt = """You are a precise requirements document analysis tool specializing in Function Point Analysis (FPA) metrics. Your task is to meticulously extract and categorize requirements using standardized definitions:
+# Function types reported by the analysis
+FPA_FUNCTION_TYPES = ('EI', 'EO', 'EQ', 'ILF', 'EIF')
+
+# Unadjusted function point weight of each function type (average complexity)
+FPA_WEIGHTS = {'EI': 4, 'EO': 5, 'EQ': 3, 'ILF': 10, 'EIF': 7}
+
+# The 14 IFPUG general system characteristics, each rated 0 (no influence) to 5 (strong influence)
+GENERAL_SYSTEM_CHARACTERISTICS = (
+    'dataCommunications', 'distributedDataProcessing', 'performance', 'heavilyUsedConfiguration',
+    'transactionRate', 'onlineDataEntry', 'endUserEfficiency', 'onlineUpdate', 'complexProcessing',
+    'reusability', 'installationEase', 'operationalEase', 'multipleSites', 'facilitateChange'
+)
+
+def calculate_vaf(gsc_ratings):
+    """
+    Value Adjustment Factor from the general system characteristics: VAF = 0.65 + 0.01 * sum(ratings)
+
+    :param gsc_ratings: List of 14 ratings in GENERAL_SYSTEM_CHARACTERISTICS order, or a dictionary
+                        of characteristic name to rating (missing characteristics count as 0)
+    :return: VAF between 0.65 and 1.35
+    :raises ValueError: On unknown characteristics, a wrong number of ratings, or ratings outside 0-5
+    """
+    if isinstance(gsc_ratings, dict):
+        unknown = [name for name in gsc_ratings if name not in GENERAL_SYSTEM_CHARACTERISTICS]
+        if unknown:
+            raise ValueError(f"Unknown general system characteristics: {unknown}")
+        ratings = [gsc_ratings.get(name, 0) for name in GENERAL_SYSTEM_CHARACTERISTICS]
+    else:
+        ratings = list(gsc_ratings)
+        if len(ratings) != len(GENERAL_SYSTEM_CHARACTERISTICS):
+            raise ValueError(f"Expected {len(GENERAL_SYSTEM_CHARACTERISTICS)} general system characteristic ratings, got {len(ratings)}")
+
+    if any(not 0 <= rating <= 5 for rating in ratings):
+        raise ValueError("General system characteristic ratings must be between 0 and 5")
+    return 0.65 + 0.01 * sum(ratings)
+
+# Bump whenever FPA_SYSTEM_PROMPT or the user message changes, so cached analyses are not reused
+FPA_PROMPT_VERSION = 1
+
+# System prompt for FPA analysis
+FPA_SYSTEM_PROMPT = """You are a precise requirements document analysis tool specializing in Function Point Analysis (FPA) metrics. Your task is to meticulously extract and categorize requirements using standardized definitions:
             Metric Definitions:
             - External Inputs (EI): Data or control inputs from outside the system boundary that require processing. Includes user-submitted forms, data entry screens, configuration updates, and file uploads that fundamentally transform or update system state.
             - External Outputs (EO): Processed data or control information generated by the system and sent to external users or systems. Encompasses reports, notifications, exported files, API responses, and calculated results that provide value beyond simple data retrieval.
@@ -70,57 +87,310 @@ class FunctionPointAnalyzer:
             - Zero interpretative text
             - Strictly structured JSON response
             """
-            
+
+
+def empty_fpa_analysis():
+    """
+    :return: FPA analysis with every function type at zero
+    """
+    return {function_type: {"count": 0, "examples": []} for function_type in FPA_FUNCTION_TYPES}
+
+def validate_fpa_analysis(analysis):
+    """
+    Check an FPA analysis (an LLM reply or a cached result) and normalize it
+
+    Counts are coerced to non-negative ints ("3" and 3.0 become 3), examples to a list of
+    strings, and keys other than the function types are dropped.
+
+    :param analysis: Parsed FPA analysis
+    :return: New FPA analysis dictionary in the shape of empty_fpa_analysis()
+    :raises ValueError: If a function type is missing, or a count or example list is malformed
+    """
+    if not isinstance(analysis, dict):
+        raise ValueError(f"FPA analysis must be an object, got {type(analysis).__name__}")
+    normalized = {}
+    for function_type in FPA_FUNCTION_TYPES:
+        entry = analysis.get(function_type)
+        if not isinstance(entry, dict):
+            raise ValueError(f"FPA analysis has no '{function_type}' object")
+        count = entry.get('count')
+        try:
+            if isinstance(count, bool) or int(float(count)) != float(count):
+                raise ValueError
+            count = int(float(count))
+        except (TypeError, ValueError, OverflowError):
+            raise ValueError(f"Invalid count {count!r} for '{function_type}'")
+        if count < 0:
+            raise ValueError(f"Negative count {count} for '{function_type}'")
+        examples = entry.get('examples') or []
+        if not isinstance(examples, list):
+            raise ValueError(f"Examples of '{function_type}' must be a list")
+        normalized[function_type] = {"count": count, "examples": [str(example) for example in examples]}
+    return normalized
+
+def estimate_tokens(text):
+    """
+    Rough token count for budgeting prompts (about four characters per token)
+    
+    :param text: Text to measure
+    :return: Estimated number of tokens
+    """
+    return (len(text) + 3) // 4
+
+def split_requirements_text(text, max_tokens):
+    """
+    Split a document into chunks of at most max_tokens, on section/paragraph boundaries
+    
+    Paragraphs (separated by blank lines) are packed greedily; a paragraph that is
+    larger than the budget on its own is split on sentence and then line boundaries.
+    
+    :param text: Extracted document text
+    :param max_tokens: Token budget per chunk
+    :return: List of chunk strings in document order
+    """
+    max_chars = max_tokens * 4
+    
+    pieces = []
+    for paragraph in re.split(r'\n\s*\n', text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            pieces.append(paragraph)
+            continue
+        # Oversized paragraph: fall back to sentences, then hard splits
+        for sentence in re.split(r'(?<=[.!?])\s+|\n', paragraph):
+            while len(sentence) > max_chars:
+                pieces.append(sentence[:max_chars])
+                sentence = sentence[max_chars:]
+            if sentence.strip():
+                pieces.append(sentence.strip())
+    
+    chunks, current, current_len = [], [], 0
+    for piece in pieces:
+        if current and current_len + len(piece) + 2 > max_chars:
+            chunks.append('\n\n'.join(current))
+            current, current_len = [], 0
+        current.append(piece)
+        current_len += len(piece) + 2
+    if current:
+        chunks.append('\n\n'.join(current))
+    
+    return chunks
+
+def _normalize_example(name):
+    return re.sub(r'[^0-9a-z]+', ' ', str(name).casefold()).strip()
+
+def merge_fpa_analyses(analyses):
+    """
+    Reduce per-chunk FPA analyses into one, de-duplicating examples across chunks
+    
+    Examples are matched case- and punctuation-insensitively. The merged count is
+    the number of distinct examples plus any unnamed instances each chunk counted
+    beyond its own examples, so a module seen in several chunks is counted once.
+    
+    :param analyses: List of FPA analysis dictionaries
+    :return: Merged FPA analysis dictionary
+    """
+    merged = empty_fpa_analysis()
+    for function_type in FPA_FUNCTION_TYPES:
+        seen = set()
+        unnamed = 0
+        for analysis in analyses:
+            entry = analysis.get(function_type) or {}
+            examples = [example for example in entry.get('examples') or [] if _normalize_example(example)]
+            try:
+                count = int(entry.get('count', 0))
+            except (TypeError, ValueError):
+                count = len(examples)
+            unnamed += max(0, count - len({_normalize_example(example) for example in examples}))
+            for example in examples:
+                key = _normalize_example(example)
+                if key not in seen:
+                    seen.add(key)
+                    merged[function_type]['examples'].append(example)
+        merged[function_type]['count'] = len(merged[function_type]['examples']) + unnamed
+    
+    return merged
+
+class FunctionPointAnalyzer:
+    def __init__(self, api_key=None, vaf=1.14, cache=None, model="llama-3.2-3b-preview", client=None,
+                 chunk_token_budget=None, max_concurrency=4, call_policy=None):
+        """
+        Initialize Groq client for Function Point Analysis
+        
+        :param api_key: Groq API key (ignored when client is given)
+        :param cache: Optional FPAResultCache so repeated (and, with a similarity index, near-duplicate) documents skip the LLM
+        :param model: Groq model used for the analysis
+        :param client: Shared Groq client (see services.llm_client); a private one is created if omitted
+        :param chunk_token_budget: Documents above this many tokens are analyzed in chunks (None disables chunking)
+        :param max_concurrency: Maximum number of chunks analyzed at once
+        :param call_policy: Shared LLMCallPolicy (timeouts, retries, hedging, circuit breaker); calls are unprotected if omitted
+        """
+        if client is None:
+            # Imported here so modules that only receive a shared client never import the SDK
+            from groq import Groq
+            client = Groq(api_key=api_key)
+        self.client = client
+        self.vaf = vaf  # Fixed VAF for calculation
+        self.cache = cache
+        self.model = model
+        self.chunk_token_budget = chunk_token_budget
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.call_policy = call_policy or LLMCallPolicy()
+        # Language Productivity Factors (LOC/FP)
+        self.language_productivity = {
+            "Assembly": 320,
+            "C": 128,
+            "C++": 64,
+            "Java": 48,
+            "Python": 15,
+            "Visual Basic": 20,
+            "SQL": 12
+        }
+
+    def _request_analysis(self, text, deadline=None):
+        """
+        Run one FPA completion over a piece of requirements text
+        
+        :param text: Requirements text (whole document or one chunk)
+        :param deadline: Optional monotonic deadline shared by every call of the analysis
+        :return: Parsed and validated FPA analysis dictionary
+        :raises Exception: If the call fails or the response is not valid JSON
+        :raises ValueError: If the response does not have the FPA analysis shape (see validate_fpa_analysis)
+        """
+        def request():
             # Create chat completion request
-            response = self.client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": system_prompt
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Analyze the following requirements document for Function Point Analysis:\n\n{extracted_text}"
-                    }
-                ],
-                model="llama-3.2-3b-preview",
-                response_format={"type": "json_object"}
-            )
+            with observe_llm_call('function_point_analysis') as call:
+                response = self.client.chat.completions.create(
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": FPA_SYSTEM_PROMPT
+                        },
+                        {
+                            "role": "user",
+                            "content": f"Analyze the following requirements document for Function Point Analysis:\n\n{text}"
+                        }
+                    ],
+                    model=self.model,
+                    response_format={"type": "json_object"}
+                )
+                call.record(response)
+            return response
+        
+        response = self.call_policy.call(request, operation='function_point_analysis', deadline=deadline)
+        
+        # Parse the JSON response; a malformed reply fails like an error, so it is never cached
+        return validate_fpa_analysis(json.loads(response.choices[0].message.content))
+
+    def _analyze_chunks(self, chunks, deadline=None):
+        """
+        Map chunks to FPA analyses concurrently and reduce them into one
+        
+        :param chunks: List of chunk strings
+        :param deadline: Optional monotonic deadline shared by every chunk
+        :return: Tuple of (merged analysis, whether every chunk succeeded)
+        """
+        def analyze_chunk(chunk):
+            try:
+                return self._request_analysis(chunk, deadline)
+            except Exception as e:
+                logger.warning("Error in FPA analysis of chunk: %s", e)
+                return None
+        
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(chunks))) as executor:
+            results = list(executor.map(analyze_chunk, chunks))
+        
+        successful = [result for result in results if result is not None]
+        if not successful:
+            raise RuntimeError(f"All {len(chunks)} chunks failed")
+        
+        return merge_fpa_analyses(successful), len(successful) == len(chunks)
+
+    def analyze_requirements(self, extracted_text):
+        """
+        Analyze requirements document using Groq API for Function Point Analysis
+        
+        Documents larger than chunk_token_budget are split on paragraph boundaries,
+        analyzed concurrently and merged with de-duplicated examples.
+        
+        :param extracted_text: Text extracted from requirements document
+        :return: Structured FPA analysis as dictionary
+        """
+        return self.analyze_requirements_with_status(extracted_text)[0]
+
+    def analyze_requirements_with_status(self, extracted_text):
+        """
+        analyze_requirements that also reports whether the analysis is complete
+
+        :param extracted_text: Text extracted from requirements document
+        :return: Tuple of (FPA analysis, complete); complete is False when the analysis failed and is the
+                 empty default, or when some chunks failed and were left out
+        """
+        return self.analyze_requirements_with_source(extracted_text)[:2]
+
+    def analyze_requirements_with_source(self, extracted_text):
+        """
+        analyze_requirements_with_status that also reports whether the analysis came from the cache
+
+        :param extracted_text: Text extracted from requirements document
+        :return: Tuple of (FPA analysis, complete, cache match); the cache match is None for a fresh analysis,
+                 {"match": "exact"} for a cached one, or {"match": "similar", "similarity": ...} when the
+                 analysis of a near-duplicate document was reused
+        """
+        chunked = self.chunk_token_budget is not None and estimate_tokens(extracted_text) > self.chunk_token_budget
+        
+        cache_key = None
+        if self.cache is not None:
+            # Chunked and whole-document analyses differ, so the budget is part of the key
+            prompt_version = f"{FPA_PROMPT_VERSION}:chunks={self.chunk_token_budget}" if chunked else FPA_PROMPT_VERSION
+            cache_key = self.cache.make_key(extracted_text, self.model, prompt_version)
+            cached_analysis = _valid_or_none(self.cache.get(cache_key))
+            if cached_analysis is not None:
+                return cached_analysis, True, {"match": "exact"}
+            # A revised upload (typo fixed, date changed) reuses the analysis of its earlier version
+            similar = self.cache.get_similar(cache_key, extracted_text, self.model, prompt_version)
+            similar_analysis = _valid_or_none(similar[0]) if similar is not None else None
+            if similar_analysis is not None:
+                logger.info("Reusing FPA analysis of a near-duplicate document (similarity %.3f)", similar[1])
+                return similar_analysis, True, {"match": "similar", "similarity": round(similar[1], 4)}
+        
+        try:
+            complete = True
+            deadline = self.call_policy.deadline()
+            if chunked:
+                chunks = split_requirements_text(extracted_text, self.chunk_token_budget)
+                fpa_analysis, complete = self._analyze_chunks(chunks, deadline)
+            else:
+                fpa_analysis = self._request_analysis(extracted_text, deadline)
             
-            # Parse the JSON response
-            fpa_analysis = json.loads(response.choices[0].message.content)
-            return fpa_analysis
+            # Only complete, successful analyses are cached; failures fall through to the default below
+            if cache_key is not None and complete:
+                self.cache.set(cache_key, fpa_analysis)
+            return fpa_analysis, complete, None
         
         except Exception as e:
-            print(f"Error in FPA analysis: {str(e)}")
+            logger.error("Error in FPA analysis: %s", e)
             # Return a default structure if analysis fails
-            return {
-                "EI": {"count": 0, "examples": []},
-                "EO": {"count": 0, "examples": []},
-                "EQ": {"count": 0, "examples": []},
-                "ILF": {"count": 0, "examples": []},
-                "EIF": {"count": 0, "examples": []}
-            }
+            return empty_fpa_analysis(), False, None
 
-    def calculate_project_metrics(self, fpa_analysis, language="Java"):
+    def calculate_project_metrics(self, fpa_analysis, language="Java", vaf=None):
         """
         Calculate project metrics based on Function Point Analysis
         
         :param fpa_analysis: Dictionary containing FPA results
         :param language: Programming language to use for LOC/FP (default is Java)
+        :param vaf: Value Adjustment Factor (defaults to the analyzer's fixed VAF)
         :return: Dictionary with project estimation metrics
         """
         # Calculate unadjusted function points
-        total_function_points = (
-            fpa_analysis['EI']['count'] * 4 +
-            fpa_analysis['EO']['count'] * 5 +
-            fpa_analysis['EQ']['count'] * 3 +
-            fpa_analysis['ILF']['count'] * 10 +
-            fpa_analysis['EIF']['count'] * 7
+        total_function_points = sum(
+            fpa_analysis[function_type]['count'] * weight for function_type, weight in FPA_WEIGHTS.items()
         )
 
         # Apply Value Adjustment Factor (VAF)
-        adjusted_function_points = total_function_points * self.vaf
+        adjusted_function_points = total_function_points * (self.vaf if vaf is None else vaf)
 
         # Select LOC/FP for the chosen language
         loc_per_fp = self.language_productivity.get(language, 48)  # Default to Java if not found
@@ -136,4 +406,13 @@ class FunctionPointAnalyzer:
             "effortMultiplier": 0,
             "developmentTime": 0,
             "estimatedKLOC": estimated_kloc
-        }
\ No newline at end of file
+        }
+def _valid_or_none(analysis):
+    # Results cached before replies were validated may be malformed; they are treated as misses
+    if analysis is None:
+        return None
+    try:
+        return validate_fpa_analysis(analysis)
+    except ValueError as e:
+        logger.warning("Ignoring malformed cached FPA analysis: %s", e)
+        return None
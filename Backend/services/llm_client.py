@@ -0,0 +1,99 @@
+from types import SimpleNamespace
+
+# Supported values of the provider argument of create_llm_client
+LLM_PROVIDERS = ('groq', 'local')
+
+# Model used when none is configured, per provider (the local one is the base of Llama-3.2-3b-q8_0/Modelfile)
+DEFAULT_MODELS = {
+    'groq': 'llama-3.2-3b-preview',
+    'local': 'llama3.2:3b-instruct-q8_0'
+}
+
+class OpenAICompatibleClient:
+    def __init__(self, base_url, http_client, api_key=None):
+        """
+        Chat completion client for local OpenAI-compatible servers (Ollama, llama.cpp, vLLM, ...)
+
+        Implements the subset of the Groq SDK the analyzers use,
+        client.chat.completions.create(...), with the same response shape
+        (choices[0].message.content and usage), so either backend can be injected.
+
+        :param base_url: Server URL up to and including the API version, e.g. http://localhost:11434/v1
+        :param http_client: Pooled httpx.Client used for every request
+        :param api_key: Optional bearer token (most local servers ignore it)
+        """
+        self.url = base_url.rstrip('/') + '/chat/completions'
+        self.http_client = http_client
+        self.headers = {'Authorization': f'Bearer {api_key}'} if api_key else {}
+        self.chat = SimpleNamespace(completions=self)
+
+    def create(self, messages, model, **kwargs):
+        """
+        :param messages: Chat messages
+        :param model: Model name as known to the local server
+        :param kwargs: Optional completion parameters (max_tokens, temperature, response_format, ...)
+        :return: Completion with choices[0].message.content and usage
+        :raises httpx.HTTPError: On connection errors and non-2xx responses
+        """
+        payload = {'model': model, 'messages': messages}
+        payload.update({key: value for key, value in kwargs.items() if value is not None})
+        response = self.http_client.post(self.url, json=payload, headers=self.headers)
+        response.raise_for_status()
+        body = response.json()
+
+        usage = body.get('usage') or {}
+        return SimpleNamespace(
+            choices=[
+                SimpleNamespace(message=SimpleNamespace(content=choice['message'].get('content') or ''))
+                for choice in body['choices']
+            ],
+            usage=SimpleNamespace(
+                prompt_tokens=usage.get('prompt_tokens'),
+                completion_tokens=usage.get('completion_tokens')
+            )
+        )
+
+def create_llm_client(api_key, max_connections=20, max_keepalive_connections=10, keepalive_expiry=30.0,
+                      connect_timeout=5.0, read_timeout=60.0, max_retries=2, provider='groq', base_url=None):
+    """
+    Create a chat completion client backed by a pooled keep-alive HTTP connection pool
+
+    Build it once per process and share it between analyzers, so requests reuse
+    open TLS connections instead of paying connection setup on every call.
+
+    :param api_key: Groq API key (optional bearer token for the local provider)
+    :param max_connections: Maximum number of concurrent connections to the API
+    :param max_keepalive_connections: Idle connections kept open for reuse
+    :param keepalive_expiry: Seconds an idle connection is kept before it is closed
+    :param connect_timeout: Seconds allowed to establish a connection
+    :param read_timeout: Seconds allowed for a completion to be returned
+    :param max_retries: Retries on connection errors (and, for Groq, 429/5xx responses)
+    :param provider: 'groq' for the Groq API or 'local' for an OpenAI-compatible server such as Ollama
+    :param base_url: Server URL for the local provider, e.g. http://localhost:11434/v1
+    :return: Groq client or OpenAICompatibleClient
+    :raises ValueError: On an unknown provider or a local provider without base_url
+    """
+    if provider not in LLM_PROVIDERS:
+        raise ValueError(f"Unknown LLM provider '{provider}', expected one of {LLM_PROVIDERS}")
+    if provider == 'local' and not base_url:
+        raise ValueError("The local LLM provider requires a base_url")
+
+    # Imported on first use so importing the service modules stays cheap
+    import httpx
+
+    timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        keepalive_expiry=keepalive_expiry
+    )
+
+    if provider == 'local':
+        # The transport only retries failed connection attempts, which is all a local server needs
+        http_client = httpx.Client(limits=limits, timeout=timeout, transport=httpx.HTTPTransport(retries=max_retries))
+        return OpenAICompatibleClient(base_url, http_client, api_key=api_key)
+
+    from groq import Groq
+
+    http_client = httpx.Client(limits=limits, timeout=timeout)
+    return Groq(api_key=api_key, http_client=http_client, timeout=timeout, max_retries=max_retries)
@@ -0,0 +1,275 @@
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from services.metrics import LLM_HEDGES, LLM_RETRIES
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses worth retrying: timeouts, conflicts, rate limits and server errors
+TRANSIENT_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504})
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the provider while the circuit breaker is open"""
+
+class LLMTimeoutError(TimeoutError):
+    """Raised when a completion misses its per-call timeout or the overall deadline"""
+
+def is_transient_error(error):
+    """
+    Whether a failed completion is worth retrying
+
+    Works on Groq SDK, httpx and built-in exceptions without importing either library:
+    timeouts and connection errors are transient, as are responses with a status in
+    TRANSIENT_STATUS_CODES. Everything else (bad requests, auth, invalid JSON) is not.
+
+    :param error: Exception raised by the completion
+    :return: True if a retry may succeed
+    """
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    status = getattr(error, 'status_code', None)
+    if status is None:
+        status = getattr(getattr(error, 'response', None), 'status_code', None)
+    if status is not None:
+        return status in TRANSIENT_STATUS_CODES
+    # groq.APIConnectionError/APITimeoutError and httpx.TransportError subclasses carry no status
+    name = type(error).__name__
+    return 'Timeout' in name or 'Connect' in name or name in ('RemoteProtocolError', 'ReadError', 'WriteError')
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold=5, reset_seconds=30.0):
+        """
+        Consecutive-failure circuit breaker
+
+        After failure_threshold transient failures in a row the circuit opens and calls fail
+        fast for reset_seconds. Then a single probe call is let through (half-open): success
+        closes the circuit, failure opens it for another reset_seconds.
+
+        :param failure_threshold: Consecutive failures that open the circuit
+        :param reset_seconds: Seconds the circuit stays open before a probe is allowed
+        """
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.reset_seconds = reset_seconds
+        self._lock = threading.Lock()
+        self._state = 'closed'
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self):
+        """
+        :return: 'closed', 'open' or 'half_open'
+        """
+        with self._lock:
+            if self._state == 'open' and time.monotonic() - self._opened_at >= self.reset_seconds:
+                return 'half_open'
+            return self._state
+
+    def allow(self):
+        """
+        :return: True if a call may go to the provider now
+        """
+        with self._lock:
+            if self._state == 'closed':
+                return True
+            if self._state == 'open':
+                if time.monotonic() - self._opened_at < self.reset_seconds:
+                    return False
+                self._state = 'half_open'
+                self._probe_in_flight = False
+            # Half-open: exactly one probe at a time
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            if self._state != 'closed':
+                logger.info("LLM circuit closed")
+            self._state = 'closed'
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._state == 'half_open' or (self._state == 'closed' and self._failures >= self.failure_threshold):
+                logger.warning("LLM circuit opened after %d consecutive failures", self._failures)
+                self._state = 'open'
+                self._opened_at = time.monotonic()
+
+class LLMCallPolicy:
+    def __init__(self, call_timeout=None, request_timeout=None, max_attempts=1, backoff_base_seconds=0.25,
+                 backoff_max_seconds=4.0, hedge_percentile=None, hedge_min_samples=20, circuit_breaker=None,
+                 max_workers=32):
+        """
+        Timeouts, retries, hedging and circuit breaking shared by every LLM completion
+
+        Each attempt runs on a worker thread so it can be abandoned when its timeout passes
+        (the HTTP client's own read timeout eventually frees the thread). Transient failures
+        are retried with capped, jittered exponential backoff while the overall deadline
+        allows. With hedging, a duplicate request is sent once an attempt has run longer
+        than hedge_percentile of recent latencies for the same operation, and whichever
+        answers first wins. The defaults call the function inline with no protection.
+
+        :param call_timeout: Seconds allowed per attempt (None waits indefinitely)
+        :param request_timeout: Seconds allowed for all attempts of one analysis (see deadline)
+        :param max_attempts: Attempts per call, including the first
+        :param backoff_base_seconds: Backoff before the first retry, doubled per retry
+        :param backoff_max_seconds: Longest backoff between retries
+        :param hedge_percentile: Latency percentile after which a hedged request is sent (None disables hedging)
+        :param hedge_min_samples: Successful calls per operation needed before hedging starts
+        :param circuit_breaker: Optional CircuitBreaker shared by every call through this policy
+        :param max_workers: Threads available for attempts and hedges
+        """
+        self.call_timeout = call_timeout
+        self.request_timeout = request_timeout
+        self.max_attempts = max(1, int(max_attempts))
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = max(1, int(hedge_min_samples))
+        self.circuit_breaker = circuit_breaker
+        self.max_workers = max(1, int(max_workers))
+        self._lock = threading.Lock()
+        self._latencies = {}
+        self._executor = None
+        self._executor_pid = None
+
+    def deadline(self):
+        """
+        :return: Monotonic deadline for a new analysis, or None without request_timeout
+        """
+        return time.monotonic() + self.request_timeout if self.request_timeout else None
+
+    def hedge_delay(self, operation):
+        """
+        :param operation: Operation label
+        :return: Seconds after which to hedge, or None if hedging is off or there are too few samples
+        """
+        if self.hedge_percentile is None:
+            return None
+        with self._lock:
+            samples = sorted(self._latencies.get(operation, ()))
+        if len(samples) < self.hedge_min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * self.hedge_percentile / 100))]
+
+    def call(self, fn, operation='completion', deadline=None):
+        """
+        Run fn() under the policy
+
+        :param fn: Zero-argument callable performing one completion
+        :param operation: Operation label for metrics and hedge latencies
+        :param deadline: Optional monotonic deadline (see deadline) shared by related calls
+        :return: Result of the first successful attempt
+        :raises CircuitOpenError: If the circuit breaker is open
+        :raises LLMTimeoutError: If the attempt or the deadline times out
+        :raises Exception: The last error when it is not transient or no attempts remain
+        """
+        if self.call_timeout is None and deadline is None and self.max_attempts == 1 \
+                and self.hedge_percentile is None and self.circuit_breaker is None:
+            return fn()
+
+        for attempt in range(self.max_attempts):
+            if self.circuit_breaker is not None and not self.circuit_breaker.allow():
+                raise CircuitOpenError(f"LLM circuit is open, skipping {operation}")
+            timeout = self.call_timeout
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise LLMTimeoutError(f"Deadline exceeded before {operation} attempt {attempt + 1}")
+                timeout = remaining if timeout is None else min(timeout, remaining)
+
+            start = time.monotonic()
+            try:
+                result = self._attempt(fn, operation, timeout)
+            except Exception as e:
+                transient = is_transient_error(e)
+                if self.circuit_breaker is not None:
+                    # Only provider trouble counts against the circuit; a bad request is our problem
+                    if transient:
+                        self.circuit_breaker.record_failure()
+                    else:
+                        self.circuit_breaker.record_success()
+                if not transient or attempt + 1 >= self.max_attempts:
+                    raise
+                backoff = min(self.backoff_max_seconds, self.backoff_base_seconds * 2 ** attempt)
+                backoff *= random.uniform(0.5, 1.0)
+                if deadline is not None and time.monotonic() + backoff >= deadline:
+                    raise
+                logger.warning("%s attempt %d failed (%s), retrying in %.2fs", operation, attempt + 1, e, backoff)
+                LLM_RETRIES.inc(operation=operation)
+                time.sleep(backoff)
+                continue
+
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.record_success()
+            self._record_latency(operation, time.monotonic() - start)
+            return result
+
+    def stats(self):
+        """
+        :return: Dictionary with the circuit state and current hedge delay per operation
+        """
+        with self._lock:
+            operations = list(self._latencies)
+        return {
+            "circuit": self.circuit_breaker.state if self.circuit_breaker is not None else None,
+            "hedgeDelaySeconds": {operation: self.hedge_delay(operation) for operation in operations}
+        }
+
+    def _attempt(self, fn, operation, timeout):
+        hedge_delay = self.hedge_delay(operation)
+        if timeout is None and hedge_delay is None:
+            return fn()
+
+        executor = self._get_executor()
+        end = None if timeout is None else time.monotonic() + timeout
+        pending = {executor.submit(fn)}
+        hedged = False
+        first_error = None
+        while pending:
+            remaining = None if end is None else max(0.0, end - time.monotonic())
+            wait_for = remaining
+            if not hedged and hedge_delay is not None:
+                wait_for = hedge_delay if remaining is None else min(hedge_delay, remaining)
+            done, pending = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                first_error = first_error or future.exception()
+
+            if end is not None and time.monotonic() >= end:
+                break
+            if not hedged and hedge_delay is not None and first_error is None:
+                # The attempt is slower than hedge_percentile of recent calls: race a duplicate
+                hedged = True
+                LLM_HEDGES.inc(operation=operation)
+                pending.add(executor.submit(fn))
+            elif not pending and first_error is not None:
+                raise first_error
+
+        if first_error is not None and not pending:
+            raise first_error
+        raise LLMTimeoutError(f"{operation} did not complete within {timeout:.2f}s")
+
+    def _record_latency(self, operation, seconds):
+        with self._lock:
+            self._latencies.setdefault(operation, deque(maxlen=256)).append(seconds)
+
+    def _get_executor(self):
+        # Worker threads do not survive fork(), so each pre-fork worker builds its own pool
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='llm-call')
+                self._executor_pid = os.getpid()
+            return self._executor
@@ -0,0 +1,244 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+# Latency buckets in seconds, from sub-millisecond model calls to multi-minute LLM analyses
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+def _format_labels(label_names, label_values, extra=None):
+    pairs = list(zip(label_names, label_values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+class Counter:
+    def __init__(self, name, documentation, label_names=()):
+        """
+        Monotonic counter, optionally split by labels
+
+        :param name: Metric name
+        :param documentation: HELP text
+        :param label_names: Tuple of label names
+        """
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(name, '') for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def collect(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{_format_labels(self.label_names, key)} {value}')
+        return lines
+
+class Histogram:
+    def __init__(self, name, documentation, label_names=(), buckets=DEFAULT_BUCKETS):
+        """
+        Cumulative histogram, optionally split by labels
+
+        :param name: Metric name
+        :param documentation: HELP text
+        :param label_names: Tuple of label names
+        :param buckets: Sorted upper bounds of the buckets (+Inf is implied)
+        """
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels.get(name, '') for name in self.label_names)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """
+        Observe the wall time of the enclosed block
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def collect(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for key, (bucket_counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + (float('inf'),), bucket_counts):
+                    cumulative += bucket_count
+                    le = '+Inf' if bound == float('inf') else repr(float(bound))
+                    lines.append(f'{self.name}_bucket{_format_labels(self.label_names, key, ("le", le))} {cumulative}')
+                lines.append(f'{self.name}_sum{_format_labels(self.label_names, key)} {total}')
+                lines.append(f'{self.name}_count{_format_labels(self.label_names, key)} {count}')
+        return lines
+
+class CallbackGauge:
+    def __init__(self, name, documentation, callback, label_names=(), metric_type='gauge'):
+        """
+        Metric whose value is read from a callback at scrape time
+
+        :param name: Metric name
+        :param documentation: HELP text
+        :param callback: Returns a number, or a dictionary of label-value tuples to numbers
+        :param label_names: Tuple of label names used by the dictionary keys
+        :param metric_type: Prometheus type to report ('gauge' or 'counter')
+        """
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+        self.label_names = tuple(label_names)
+        self.metric_type = metric_type
+
+    def collect(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.metric_type}']
+        values = self.callback()
+        if not isinstance(values, dict):
+            values = {(): values}
+        for key, value in sorted(values.items()):
+            if value is not None:
+                lines.append(f'{self.name}{_format_labels(self.label_names, key)} {value}')
+        return lines
+
+class MetricsRegistry:
+    def __init__(self):
+        """
+        Collection of metrics rendered in the Prometheus text exposition format
+        """
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        """
+        Add a metric, replacing any metric already registered under the same name
+
+        :return: The metric, for chaining
+        """
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, label_names=()):
+        return self.register(Counter(name, documentation, label_names))
+
+    def histogram(self, name, documentation, label_names=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, documentation, label_names, buckets))
+
+    def gauge_callback(self, name, documentation, callback, label_names=(), metric_type='gauge'):
+        return self.register(CallbackGauge(name, documentation, callback, label_names, metric_type))
+
+    def render(self):
+        """
+        :return: All metrics in the Prometheus text format
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.collect())
+        return '\n'.join(lines) + '\n'
+
+# Process-wide registry served by /metrics
+REGISTRY = MetricsRegistry()
+
+STAGE_LATENCY = REGISTRY.histogram(
+    'estimation_stage_duration_seconds',
+    'Wall time of each estimation pipeline stage',
+    ('stage',)
+)
+REQUEST_LATENCY = REGISTRY.histogram(
+    'http_request_duration_seconds',
+    'Wall time of HTTP requests by endpoint',
+    ('endpoint', 'status')
+)
+LLM_CALLS = REGISTRY.counter(
+    'llm_calls_total',
+    'LLM completions by operation and outcome',
+    ('operation', 'outcome')
+)
+LLM_LATENCY = REGISTRY.histogram(
+    'llm_call_duration_seconds',
+    'Wall time of LLM completions by operation',
+    ('operation',)
+)
+LLM_RETRIES = REGISTRY.counter(
+    'llm_retries_total',
+    'LLM completion retries after transient failures by operation',
+    ('operation',)
+)
+LLM_HEDGES = REGISTRY.counter(
+    'llm_hedged_requests_total',
+    'Duplicate LLM completions sent because the first was slower than the hedge delay',
+    ('operation',)
+)
+PROMPT_TOKENS_SAVED = REGISTRY.counter(
+    'llm_prompt_tokens_saved_total',
+    'Estimated prompt tokens removed from extracted documents by text compaction'
+)
+LLM_TOKENS = REGISTRY.counter(
+    'llm_tokens_total',
+    'Tokens reported by the LLM provider by operation and kind',
+    ('operation', 'kind')
+)
+
+def timed_stage(stage):
+    """
+    Context manager recording the duration of a pipeline stage
+
+    :param stage: Stage name used as the 'stage' label
+    """
+    return STAGE_LATENCY.time(stage=stage)
+
+class _LLMCall:
+    def __init__(self, operation):
+        self.operation = operation
+
+    def record(self, response):
+        """
+        Record token usage from a chat completion response
+        """
+        usage = getattr(response, 'usage', None)
+        if usage is None:
+            return
+        for kind in ('prompt_tokens', 'completion_tokens'):
+            tokens = getattr(usage, kind, None)
+            if tokens:
+                LLM_TOKENS.inc(tokens, operation=self.operation, kind=kind.replace('_tokens', ''))
+
+@contextmanager
+def observe_llm_call(operation):
+    """
+    Count and time one LLM completion; call .record(response) inside the block to add token usage
+
+    :param operation: Operation label, e.g. 'function_point_analysis'
+    """
+    call = _LLMCall(operation)
+    start = time.perf_counter()
+    outcome = 'error'
+    try:
+        yield call
+        outcome = 'success'
+    finally:
+        LLM_LATENCY.observe(time.perf_counter() - start, operation=operation)
+        LLM_CALLS.inc(operation=operation, outcome=outcome)
@@ -0,0 +1,104 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+class MicroBatchingEffortModel:
+    def __init__(self, model, max_batch_size=32, max_wait_seconds=0.002):
+        """
+        Coalesce concurrent predict_effort calls into vectorized predict_effort_batch calls
+
+        Callers keep the EffortEstimationModel API: predict_effort blocks until its row of the
+        shared batch is done. A dispatcher thread takes the first pending request, gathers more
+        until max_batch_size is reached (waiting up to max_wait_seconds when the previous batch
+        showed concurrent load), runs one forward pass and resolves every caller's future.
+        Everything else is delegated to the wrapped model.
+
+        :param model: EffortEstimationModel instance
+        :param max_batch_size: Most requests answered by one forward pass
+        :param max_wait_seconds: Longest time the first request of a batch waits for others under load
+        """
+        self.model = model
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait_seconds = max_wait_seconds
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.requests = 0
+
+    def __getattr__(self, name):
+        # Only reached for attributes not defined here, e.g. engine or calculate_development_time
+        return getattr(self.model, name)
+
+    def predict_effort(self, processed_cost_drivers, estimated_kloc):
+        """
+        Predict effort, sharing a forward pass with concurrent callers
+
+        :param processed_cost_drivers: List of processed cost drivers
+        :param estimated_kloc: Estimated thousands of lines of code
+        :return: Predicted effort as a standard Python float
+        """
+        future = Future()
+        self._ensure_dispatcher()
+        self._queue.put((processed_cost_drivers, estimated_kloc, future))
+        return future.result()
+
+    def stats(self):
+        """
+        :return: Dictionary with request and batch counts and the mean batch size
+        """
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "meanBatchSize": round(self.requests / self.batches, 3) if self.batches else None
+        }
+
+    def _ensure_dispatcher(self):
+        # Started on first use (and again in a forked child, where the parent's thread no longer exists)
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._dispatch_forever, name='effort-micro-batcher', daemon=True)
+                self._thread.start()
+
+    def _collect_batch(self, wait_seconds):
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + wait_seconds
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                # Requests already queued are always taken; the window only bounds waiting for new ones
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _dispatch_forever(self):
+        wait_seconds = 0.0
+        while True:
+            batch = self._collect_batch(wait_seconds)
+            try:
+                efforts = self.model.predict_effort_batch(
+                    [cost_drivers for cost_drivers, _, _ in batch],
+                    [estimated_kloc for _, estimated_kloc, _ in batch]
+                )
+            except Exception:
+                # Retry one by one so a single malformed request only fails its own caller
+                logger.warning("Micro-batched effort prediction failed for %d requests, retrying individually", len(batch))
+                for cost_drivers, estimated_kloc, future in batch:
+                    try:
+                        future.set_result(self.model.predict_effort(cost_drivers, estimated_kloc))
+                    except Exception as e:
+                        future.set_exception(e)
+            else:
+                for (_, _, future), effort in zip(batch, efforts):
+                    future.set_result(effort)
+            self.batches += 1
+            self.requests += len(batch)
+            # Only hold requests back while there is concurrent load; a lone caller is answered immediately
+            wait_seconds = self.max_wait_seconds if len(batch) > 1 else 0.0
@@ -0,0 +1,112 @@
+import logging
+import threading
+import time
+from services.micro_batcher import MicroBatchingEffortModel
+
+logger = logging.getLogger(__name__)
+
+class ModelNotReadyError(Exception):
+    """
+    Raised when the effort model is still loading (or failed to load)
+    """
+
+class EffortModelLoader:
+    def __init__(self, factory, warm_up=True, wait_seconds=30, micro_batch_size=0, micro_batch_wait_seconds=0.002):
+        """
+        Load the effort model off the request path and warm it up before reporting ready
+
+        :param factory: Zero-argument callable returning an EffortEstimationModel
+        :param warm_up: Run one dummy prediction after loading so the first request pays no tracing cost
+        :param wait_seconds: Default time get() waits for a model that is still loading
+        :param micro_batch_size: Above 1, concurrent predict_effort calls are coalesced into batches of up to this size
+        :param micro_batch_wait_seconds: Longest time a request waits for others to join its batch
+        """
+        self.factory = factory
+        self.warm_up = warm_up
+        self.wait_seconds = wait_seconds
+        self.micro_batch_size = micro_batch_size
+        self.micro_batch_wait_seconds = micro_batch_wait_seconds
+        self._model = None
+        self._error = None
+        self._state = 'pending'
+        self._load_seconds = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_model(cls, model):
+        """
+        :return: Loader that is ready immediately with an already-built model
+        """
+        loader = cls(lambda: model, warm_up=False)
+        loader.load()
+        return loader
+
+    def start(self):
+        """
+        Start loading in a daemon thread; calling it again is a no-op
+        """
+        with self._lock:
+            # A loader thread does not survive fork(), so a child whose parent was mid-load starts over
+            if self._ready.is_set() or (self._thread is not None and self._thread.is_alive()):
+                return self
+            self._thread = threading.Thread(target=self.load, name='effort-model-loader', daemon=True)
+            self._thread.start()
+        return self
+
+    def load(self):
+        """
+        Build (and optionally warm up) the model in the calling thread
+        """
+        self._state = 'loading'
+        start = time.perf_counter()
+        try:
+            model = self.factory()
+            if self.warm_up:
+                model.warm_up()
+            if self.micro_batch_size > 1:
+                model = MicroBatchingEffortModel(model, self.micro_batch_size, self.micro_batch_wait_seconds)
+            self._model = model
+            self._state = 'ready'
+            logger.info("Effort model (%s engine) ready in %.2fs", model.engine, time.perf_counter() - start)
+        except Exception as e:
+            logger.exception("Effort model failed to load")
+            self._error = str(e)
+            self._state = 'failed'
+        finally:
+            self._load_seconds = time.perf_counter() - start
+            self._ready.set()
+
+    def is_ready(self):
+        return self._state == 'ready'
+
+    def get(self, timeout=None):
+        """
+        :param timeout: Seconds to wait for a loading model (None uses wait_seconds)
+        :return: The loaded EffortEstimationModel
+        :raises ModelNotReadyError: If the model is not loaded within the timeout or failed to load
+        """
+        if self._model is not None:
+            return self._model
+        self.start()
+        if not self._ready.wait(self.wait_seconds if timeout is None else timeout):
+            raise ModelNotReadyError("Effort model is still loading, retry shortly")
+        if self._model is None:
+            raise ModelNotReadyError(f"Effort model failed to load: {self._error}")
+        return self._model
+
+    def status(self):
+        """
+        :return: Dictionary with the load state, engine, load time and any load error
+        """
+        status = {"state": self._state}
+        if self._model is not None:
+            status["engine"] = self._model.engine
+            if isinstance(self._model, MicroBatchingEffortModel):
+                status["microBatching"] = self._model.stats()
+        if self._load_seconds is not None:
+            status["loadSeconds"] = round(self._load_seconds, 3)
+        if self._error is not None:
+            status["error"] = self._error
+        return status
@@ -0,0 +1,162 @@
+import struct
+import zipfile
+import numpy as np
+
+# Activations supported by the exported network
+_ACTIVATIONS = {
+    'linear': lambda x: x,
+    'relu': lambda x: np.maximum(x, 0.0)
+}
+
+def _mmap_npz(npz_path):
+    """
+    Memory-map the numeric arrays of an uncompressed .npz read-only
+
+    np.load ignores mmap_mode for .npz archives, so each member's .npy payload is located
+    inside the zip and mapped directly. The pages live in the OS page cache and are shared
+    by every process that maps the file, such as the workers of a pre-fork server.
+
+    :param npz_path: Path to an archive written with np.savez (not savez_compressed)
+    :return: Dictionary of array name to array (np.memmap for numeric arrays with ndim > 0)
+    """
+    arrays = {}
+    with zipfile.ZipFile(npz_path) as archive, open(npz_path, 'rb') as f:
+        for info in archive.infolist():
+            name = info.filename[:-4] if info.filename.endswith('.npy') else info.filename
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"Cannot memory-map compressed member '{info.filename}' of {npz_path}")
+
+            # The member data follows the 30-byte local file header, the file name and the extra field
+            f.seek(info.header_offset)
+            name_length, extra_length = struct.unpack('<HH', f.read(30)[26:30])
+            data_start = info.header_offset + 30 + name_length + extra_length
+            f.seek(data_start)
+
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+
+            if shape == () or dtype.kind not in 'fiub':
+                # Scalars and string arrays are tiny; read them normally
+                f.seek(data_start)
+                arrays[name] = np.lib.format.read_array(f)
+            else:
+                arrays[name] = np.memmap(
+                    npz_path, dtype=dtype, mode='r', offset=f.tell(), shape=shape,
+                    order='F' if fortran_order else 'C'
+                )
+    return arrays
+
+
+class NumpyEffortEngine:
+    def __init__(self, weights, biases, activations, x_scale, x_min, y_scale, y_min):
+        """
+        Pure NumPy forward pass for the exported COCOMO effort network
+
+        :param weights: List of Dense kernels with BatchNormalization already folded in
+        :param biases: List of Dense biases with BatchNormalization already folded in
+        :param activations: List of activation names, one per Dense layer
+        :param x_scale: MinMaxScaler scale_ for the input features
+        :param x_min: MinMaxScaler min_ for the input features
+        :param y_scale: MinMaxScaler scale_ for the effort label
+        :param y_min: MinMaxScaler min_ for the effort label
+        """
+        unknown = [name for name in activations if name not in _ACTIVATIONS]
+        if unknown:
+            raise ValueError(f"Unsupported activations in exported model: {unknown}")
+
+        self.weights = weights
+        self.biases = biases
+        self.activations = [_ACTIVATIONS[name] for name in activations]
+        self.x_scale = x_scale
+        self.x_min = x_min
+        self.y_scale = y_scale
+        self.y_min = y_min
+        # Weights cast to other dtypes on first use, keyed by dtype
+        self._cast_parameters = {}
+
+    @classmethod
+    def load(cls, npz_path, mmap_mode=None):
+        """
+        Load an engine from the .npz produced by export_numpy_model.py
+
+        :param npz_path: Path to the exported weights
+        :param mmap_mode: 'r' maps the weights read-only from the file instead of copying them into
+                          process memory (requires an uncompressed archive); None loads them normally
+        :return: NumpyEffortEngine instance
+        """
+        if mmap_mode is None:
+            with np.load(npz_path) as archive:
+                data = {name: archive[name] for name in archive.files}
+        elif mmap_mode == 'r':
+            data = _mmap_npz(npz_path)
+        else:
+            raise ValueError(f"Exported weights can only be memory-mapped read-only, got mmap_mode='{mmap_mode}'")
+
+        # np.asarray keeps memory-mapped arrays backed by the file
+        layer_count = int(data['layer_count'])
+        return cls(
+            weights=[np.asarray(data[f'W_{i}']) for i in range(layer_count)],
+            biases=[np.asarray(data[f'b_{i}']) for i in range(layer_count)],
+            activations=[str(name) for name in data['activations']],
+            x_scale=np.asarray(data['x_scale']),
+            x_min=np.asarray(data['x_min']),
+            y_scale=np.asarray(data['y_scale']),
+            y_min=np.asarray(data['y_min'])
+        )
+
+    def transform_input(self, X):
+        """
+        Apply the baked-in MinMaxScaler to raw input features
+
+        :param X: Raw (N, 16) feature matrix
+        :return: Scaled feature matrix
+        """
+        return np.asarray(X, dtype=np.float64) * self.x_scale + self.x_min
+
+    def inverse_transform_output(self, y_scaled):
+        """
+        Undo the baked-in MinMaxScaler on network outputs
+
+        :param y_scaled: Scaled (N, 1) outputs
+        :return: Effort in person-months with the same shape
+        """
+        return (y_scaled - self.y_min) / self.y_scale
+
+    def _parameters(self, dtype):
+        if dtype is None or np.dtype(dtype) == self.weights[0].dtype:
+            return self.weights, self.biases
+        dtype = np.dtype(dtype)
+        if dtype not in self._cast_parameters:
+            self._cast_parameters[dtype] = (
+                [W.astype(dtype) for W in self.weights],
+                [b.astype(dtype) for b in self.biases]
+            )
+        return self._cast_parameters[dtype]
+
+    def predict_scaled(self, X_scaled, dtype=None):
+        """
+        Run the folded Dense stack on already scaled inputs
+
+        :param X_scaled: Scaled (N, 16) feature matrix
+        :param dtype: Optional compute dtype; np.float32 matches Keras' own precision and is much faster on large batches
+        :return: Scaled (N, 1) outputs
+        """
+        weights, biases = self._parameters(dtype)
+        h = X_scaled if dtype is None else X_scaled.astype(dtype)
+        for W, b, activation in zip(weights, biases, self.activations):
+            h = activation(h @ W + b)
+        return h
+
+    def predict(self, X, dtype=None):
+        """
+        Predict effort for raw input features
+
+        :param X: Raw (N, 16) feature matrix
+        :param dtype: Optional compute dtype for the Dense stack (see predict_scaled)
+        :return: Effort in person-months as a 1-D array of length N
+        """
+        y_scaled = self.predict_scaled(self.transform_input(X), dtype=dtype)
+        return self.inverse_transform_output(y_scaled.astype(np.float64))[:, 0]
@@ -0,0 +1,70 @@
+# Upper bounds on the matrix size, so one request cannot make the model score an arbitrarily large batch
+MAX_SCENARIO_LANGUAGES = 32
+MAX_SCENARIO_VAFS = 50
+# Range of the Value Adjustment Factor (0.65 + 0.01 * 0..70, see calculate_vaf)
+MIN_VAF = 0.65
+MAX_VAF = 1.35
+
+def run_scenario_matrix(effort_model, fpa_analyzer, fpa_analysis, processed_cost_drivers, languages=None, vafs=None):
+    """
+    Estimate one FPA result for every language x VAF combination with a single model call
+
+    :param effort_model: EffortEstimationModel
+    :param fpa_analyzer: FunctionPointAnalyzer providing calculate_project_metrics and language_productivity
+    :param fpa_analysis: FPA counts (EI/EO/EQ/ILF/EIF)
+    :param processed_cost_drivers: Cost drivers with numerical_value set, shared by every scenario
+    :param languages: Languages to compare (defaults to every entry in language_productivity)
+    :param vafs: Value Adjustment Factors to compare (defaults to the analyzer's VAF)
+    :return: Flat scenario list plus language x VAF matrices of KLOC, effort and schedule
+    :raises ValueError: On unknown languages, an empty VAF list, VAFs outside MIN_VAF-MAX_VAF,
+                        or more than MAX_SCENARIO_LANGUAGES languages or MAX_SCENARIO_VAFS VAFs
+    """
+    languages = list(languages or fpa_analyzer.language_productivity)
+    if len(languages) > MAX_SCENARIO_LANGUAGES:
+        raise ValueError(f"At most {MAX_SCENARIO_LANGUAGES} languages can be compared")
+    unknown = [language for language in languages if language not in fpa_analyzer.language_productivity]
+    if unknown:
+        raise ValueError(f"Unknown languages {unknown}, expected some of {list(fpa_analyzer.language_productivity)}")
+    vafs = [float(vaf) for vaf in (vafs if vafs is not None else [fpa_analyzer.vaf])]
+    if not vafs:
+        raise ValueError("At least one VAF is required")
+    if len(vafs) > MAX_SCENARIO_VAFS:
+        raise ValueError(f"At most {MAX_SCENARIO_VAFS} VAFs can be compared")
+    # Also rejects NaN and infinity
+    invalid = [vaf for vaf in vafs if not MIN_VAF <= vaf <= MAX_VAF]
+    if invalid:
+        raise ValueError(f"VAFs must be between {MIN_VAF} and {MAX_VAF}, got {invalid}")
+
+    # One row per (language, vaf), language-major so the matrices reshape directly
+    metrics = [
+        fpa_analyzer.calculate_project_metrics(fpa_analysis, language=language, vaf=vaf)
+        for language in languages for vaf in vafs
+    ]
+    klocs = [result['estimatedKLOC'] for result in metrics]
+    X = effort_model.build_feature_matrix([processed_cost_drivers] * len(klocs), klocs)
+    efforts = effort_model.predict_effort_matrix(X)
+    times = effort_model.calculate_development_time_batch(efforts)
+
+    scenarios = []
+    for index, (language, vaf) in enumerate((language, vaf) for language in languages for vaf in vafs):
+        scenarios.append({
+            "language": language,
+            "vaf": vaf,
+            "locPerFunctionPoint": fpa_analyzer.language_productivity[language],
+            "estimatedKLOC": klocs[index],
+            "developmentEffort": float(efforts[index]),
+            "developmentTime": float(times[index])
+        })
+
+    def matrix(values):
+        return [[float(values[row * len(vafs) + column]) for column in range(len(vafs))] for row in range(len(languages))]
+
+    return {
+        "totalFunctionPoints": metrics[0]['totalFunctionPoints'],
+        "languages": languages,
+        "vafs": vafs,
+        "scenarios": scenarios,
+        "estimatedKLOC": matrix(klocs),
+        "developmentEffort": matrix(efforts),
+        "developmentTime": matrix(times)
+    }
@@ -0,0 +1,110 @@
+import numpy as np
+from services.cost_drivers_analyzer import COST_DRIVER_MULTIPLIERS, RATING_SCALE, normalize_rating
+
+# Default KLOC sweep: this many points spread over +/- DEFAULT_KLOC_SPREAD around the baseline
+DEFAULT_KLOC_STEPS = 11
+DEFAULT_KLOC_SPREAD = 0.5
+# Upper bound on KLOC sweep points, so one request cannot make the model score an arbitrarily large matrix
+MAX_KLOC_STEPS = 200
+
+def resolve_baseline_ratings(cost_drivers):
+    """
+    Turn a client cost driver list into a complete rating per driver
+
+    :param cost_drivers: List of {"driver", "value"}; drivers that are missing or 'null' are Nominal
+    :return: Dictionary of every driver in COST_DRIVER_MULTIPLIERS to its canonical rating
+    :raises ValueError: On unknown drivers or ratings
+    """
+    ratings = {driver: 'Nominal' for driver in COST_DRIVER_MULTIPLIERS}
+    for entry in cost_drivers:
+        name = entry.get('driver')
+        if name not in COST_DRIVER_MULTIPLIERS:
+            raise ValueError(f"Unknown cost driver '{name}'")
+        value = entry.get('value')
+        if value is None or str(value).lower() == 'null':
+            continue
+        rating = normalize_rating(value)
+        if rating is None:
+            raise ValueError(f"Invalid rating '{value}' for cost driver '{name}', expected one of {RATING_SCALE}")
+        ratings[name] = rating
+    return ratings
+
+def kloc_sweep_values(estimated_kloc, kloc_min=None, kloc_max=None, steps=DEFAULT_KLOC_STEPS):
+    """
+    :return: Evenly spaced KLOC values, by default +/- 50% around estimated_kloc
+    :raises ValueError: On an invalid range or more than MAX_KLOC_STEPS steps
+    """
+    steps = float(steps)
+    # Also rejects NaN and infinity
+    if not steps <= MAX_KLOC_STEPS:
+        raise ValueError(f"KLOC sweep steps must be at most {MAX_KLOC_STEPS}")
+    kloc_min = estimated_kloc * (1 - DEFAULT_KLOC_SPREAD) if kloc_min is None else kloc_min
+    kloc_max = estimated_kloc * (1 + DEFAULT_KLOC_SPREAD) if kloc_max is None else kloc_max
+    if kloc_min < 0 or kloc_max < kloc_min:
+        raise ValueError("KLOC range must satisfy 0 <= min <= max")
+    return np.linspace(kloc_min, kloc_max, max(2, int(steps)))
+
+def run_sensitivity_sweep(effort_model, baseline_ratings, estimated_kloc, kloc_values):
+    """
+    Evaluate every one-at-a-time rating change and a KLOC sweep in a single model call
+
+    :param effort_model: EffortEstimationModel
+    :param baseline_ratings: Dictionary of driver to rating (see resolve_baseline_ratings)
+    :param estimated_kloc: Baseline KLOC
+    :param kloc_values: KLOC values to sweep with the baseline ratings
+    :return: Tornado-chart payload: baseline, per-driver efforts sorted by swing, and the KLOC curve
+    """
+    drivers = list(COST_DRIVER_MULTIPLIERS)
+    columns = {driver: effort_model.cost_driver_order.index(driver) for driver in drivers}
+
+    # Row 0 is the baseline, then len(RATING_SCALE) rows per driver, then the KLOC sweep
+    baseline_row = np.ones(len(effort_model.cost_driver_order) + 1)
+    for driver, rating in baseline_ratings.items():
+        baseline_row[columns[driver]] = COST_DRIVER_MULTIPLIERS[driver][rating]
+    baseline_row[-1] = estimated_kloc
+
+    driver_rows = len(drivers) * len(RATING_SCALE)
+    X = np.tile(baseline_row, (1 + driver_rows + len(kloc_values), 1))
+    for index, driver in enumerate(drivers):
+        start = 1 + index * len(RATING_SCALE)
+        X[start:start + len(RATING_SCALE), columns[driver]] = [COST_DRIVER_MULTIPLIERS[driver][rating] for rating in RATING_SCALE]
+    X[1 + driver_rows:, -1] = kloc_values
+
+    efforts = effort_model.predict_effort_matrix(X)
+    times = effort_model.calculate_development_time_batch(efforts)
+    baseline_effort = float(efforts[0])
+
+    driver_results = []
+    for index, driver in enumerate(drivers):
+        start = 1 + index * len(RATING_SCALE)
+        driver_efforts = efforts[start:start + len(RATING_SCALE)]
+        low, high = float(driver_efforts.min()), float(driver_efforts.max())
+        driver_results.append({
+            "driver": driver,
+            "baselineRating": baseline_ratings[driver],
+            "efforts": {rating: float(effort) for rating, effort in zip(RATING_SCALE, driver_efforts)},
+            "minEffort": low,
+            "maxEffort": high,
+            "lowDelta": low - baseline_effort,
+            "highDelta": high - baseline_effort,
+            "swing": high - low
+        })
+    # Widest bar first, as drawn in a tornado chart
+    driver_results.sort(key=lambda result: result['swing'], reverse=True)
+
+    return {
+        "baseline": {
+            "estimatedKLOC": float(estimated_kloc),
+            "developmentEffort": baseline_effort,
+            "developmentTime": float(times[0]),
+            "ratings": baseline_ratings
+        },
+        "ratingScale": list(RATING_SCALE),
+        "drivers": driver_results,
+        "kloc": {
+            "values": [float(value) for value in kloc_values],
+            "developmentEffort": [float(value) for value in efforts[1 + driver_rows:]],
+            "developmentTime": [float(value) for value in times[1 + driver_rows:]]
+        },
+        "evaluations": int(len(X))
+    }
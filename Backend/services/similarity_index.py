@@ -0,0 +1,177 @@
+import threading
+import zlib
+import numpy as np
+
+# Odd 64-bit multiplier used to combine word hashes into shingle hashes and band keys
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+def document_shingles(text, shingle_size=5):
+    """
+    Hash every run of shingle_size consecutive words
+
+    :param text: Document text (case and whitespace are ignored)
+    :param shingle_size: Words per shingle
+    :return: uint64 array of distinct shingle hashes (empty for empty text)
+    """
+    words = text.casefold().split()
+    if not words:
+        return np.empty(0, dtype=np.uint64)
+    word_hashes = np.fromiter((zlib.crc32(word.encode('utf-8')) for word in words), dtype=np.uint64, count=len(words))
+    if len(words) <= shingle_size:
+        shingle_size = len(words)
+    # Polynomial rolling combination of the word hashes, wrapping at 2**64
+    count = len(words) - shingle_size + 1
+    shingles = np.zeros(count, dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        for offset in range(shingle_size):
+            shingles = shingles * _MIX + word_hashes[offset:offset + count]
+    return np.unique(shingles)
+
+class MinHashLSHIndex:
+    def __init__(self, threshold=0.9, num_perm=128, bands=16, shingle_size=5, max_entries=50000, seed=1):
+        """
+        In-memory near-duplicate index of documents using MinHash and banded LSH
+
+        Each document is reduced to num_perm 16-bit MinHash values (b-bit MinHash) over its
+        word shingles. Signatures are split into bands; documents sharing any band are
+        candidates, and candidates are verified by the fraction of equal MinHash values, an
+        estimate of the Jaccard similarity of their shingle sets. Band keys live in one
+        sorted NumPy array per band, so a lookup is a handful of binary searches and memory
+        stays at a few hundred bytes per document.
+
+        :param threshold: Minimum estimated Jaccard similarity for a match
+        :param num_perm: MinHash permutations per signature (must be divisible by bands)
+        :param bands: LSH bands; more bands find less similar candidates
+        :param shingle_size: Words per shingle
+        :param max_entries: Documents kept; the oldest are overwritten once full
+        :param seed: Seed of the MinHash permutations
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.max_entries = max(1, int(max_entries))
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2 ** 63, size=(num_perm, 1), dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, size=(num_perm, 1), dtype=np.uint64)
+
+        self._lock = threading.Lock()
+        self._signatures = np.zeros((0, num_perm), dtype=np.uint16)
+        self._band_keys = np.zeros((0, bands), dtype=np.uint64)
+        self._namespaces = np.zeros(0, dtype=np.uint32)
+        self._values = []
+        self._next_slot = 0
+        # Per band: sorted band keys and the slot each one belongs to; newer slots wait in _pending
+        self._sorted_keys = np.zeros((bands, 0), dtype=np.uint64)
+        self._sorted_slots = np.zeros((bands, 0), dtype=np.uint32)
+        self._pending = []
+
+    def signature(self, text):
+        """
+        :param text: Document text
+        :return: (num_perm,) uint16 MinHash signature, or None for documents without words
+        """
+        shingles = document_shingles(text, self.shingle_size)
+        if not len(shingles):
+            return None
+        minimum = np.full(self.num_perm, np.iinfo(np.uint64).max, dtype=np.uint64)
+        with np.errstate(over='ignore'):
+            # Multiply-shift hashing per permutation; chunked to bound the temporary matrix
+            for start in range(0, len(shingles), 4096):
+                hashed = (self._a * shingles[start:start + 4096] + self._b) >> np.uint64(32)
+                np.minimum(minimum, hashed.min(axis=1), out=minimum)
+        return minimum.astype(np.uint16)
+
+    def _band_keys_of(self, signature):
+        rows = signature.reshape(self.bands, self.rows).astype(np.uint64)
+        keys = np.zeros(self.bands, dtype=np.uint64)
+        with np.errstate(over='ignore'):
+            for row in range(self.rows):
+                keys = keys * _MIX + rows[:, row]
+        return keys
+
+    def add(self, signature, value, namespace=0):
+        """
+        :param signature: Signature from signature()
+        :param value: Payload returned by query for this document
+        :param namespace: Integer partition; queries only match entries of the same namespace
+        """
+        if signature is None:
+            return
+        band_keys = self._band_keys_of(signature)
+        with self._lock:
+            slot = self._next_slot % self.max_entries
+            if slot == len(self._values):
+                self._signatures = _grow(self._signatures, slot)
+                self._band_keys = _grow(self._band_keys, slot)
+                self._namespaces = _grow(self._namespaces, slot)
+                self._values.append(value)
+            else:
+                # Full: overwrite the oldest entry; its stale band keys fail verification until the next rebuild
+                self._values[slot] = value
+            self._signatures[slot] = signature
+            self._band_keys[slot] = band_keys
+            self._namespaces[slot] = namespace
+            self._next_slot += 1
+            self._pending.append(slot)
+            if len(self._pending) >= max(256, len(self._values) // 8):
+                self._rebuild()
+
+    def query(self, signature, namespace=0):
+        """
+        :param signature: Signature from signature()
+        :param namespace: Partition to search
+        :return: Tuple of (value, estimated similarity) of the most similar entry above threshold, or None
+        """
+        if signature is None:
+            return None
+        band_keys = self._band_keys_of(signature)
+        with self._lock:
+            size = len(self._values)
+            candidates = []
+            for band in range(self.bands):
+                keys = self._sorted_keys[band]
+                low = np.searchsorted(keys, band_keys[band], side='left')
+                high = np.searchsorted(keys, band_keys[band], side='right')
+                if high > low:
+                    candidates.append(self._sorted_slots[band, low:high])
+            if self._pending:
+                pending = np.array(self._pending, dtype=np.uint32)
+                matches = (self._band_keys[pending] == band_keys).any(axis=1)
+                candidates.append(pending[matches])
+            if not candidates:
+                return None
+            slots = np.unique(np.concatenate(candidates))
+            slots = slots[(slots < size) & (self._namespaces[slots] == namespace)]
+            if not len(slots):
+                return None
+            similarities = (self._signatures[slots] == signature).mean(axis=1)
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                return None
+            return self._values[int(slots[best])], float(similarities[best])
+
+    def __len__(self):
+        with self._lock:
+            return len(self._values)
+
+    def _rebuild(self):
+        # Called with the lock held: re-sort every band over all live slots
+        size = len(self._values)
+        keys = self._band_keys[:size].T
+        order = np.argsort(keys, axis=1, kind='stable')
+        self._sorted_keys = np.take_along_axis(keys, order, axis=1)
+        self._sorted_slots = order.astype(np.uint32)
+        self._pending = []
+
+def _grow(array, size):
+    # Amortized doubling, so adds stay O(1)
+    if size < len(array):
+        return array
+    grown = np.zeros((max(64, 2 * len(array)),) + array.shape[1:], dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
@@ -0,0 +1,243 @@
+import re
+from collections import Counter, defaultdict
+from services.function_point_analysis import estimate_tokens
+
+# Separator between pages in extracted PDF text (see extract_text_from_document)
+PAGE_SEPARATOR = '\f'
+
+# Sections that describe the document rather than the system, dropped when drop_sections is on
+NON_REQUIREMENT_SECTIONS = (
+    'table of contents', 'contents', 'revision history', 'document history', 'version history',
+    'change log', 'changelog', 'approvals', 'approval', 'sign-off', 'signoff', 'distribution list',
+    'acknowledgements', 'acknowledgments', 'glossary', 'references', 'index'
+)
+
+_PAGE_NUMBER_LINE = re.compile(r'^[\s\-–—|]*(page\s*)?\d{1,4}(\s*(of|/)\s*\d{1,4})?[\s\-–—|]*$', re.IGNORECASE)
+# A bare number only counts as a page number when set off by whitespace or a separator, so "1.2 ..." is kept
+_PAGE_NUMBER_TOKEN = re.compile(r'\bpage\s*\d{1,4}(\s*(of|/)\s*\d{1,4})?\b|^\s*\d{1,4}(\s+|\s*[|\-–—]\s*)|(\s+|\s*[|\-–—]\s*)\d{1,4}\s*$', re.IGNORECASE)
+# Table of contents entries: a heading-like title, a dot leader of at least four dots and a page number,
+# so an ellipsis before a number in running text ("1s, 2s, 4s... 60") is not taken for one
+_TOC_LINE = re.compile(r'^(?P<title>(\d+(\.\d+)*\.?\s+)?[A-Z][^.!?;]{0,78}?)\s*(\.\s?){4,}\s*\d{1,4}$')
+# Runs of spaces and any tabs; single spaces are left alone so most of the text is not rewritten
+_HORIZONTAL_WHITESPACE = re.compile(r'[ \t\v]{2,}|[\t\v]')
+# A word hyphenated across a line break; the continuation must start lowercase
+_HYPHENATED_BREAK = re.compile(r'\b([A-Za-z]+)-\n[ \t]*([a-z]+)\b')
+_WORD = re.compile(r'[a-z]+')
+_DIGITS = re.compile(r'\d+')
+# Numbered, markdown, "Section N" or ALL CAPS lines end a dropped section
+_HEADING_LINE = re.compile(r'^(#+\s+\S.*|\d+(\.\d+)*\.?\s+[A-Z].*|(?i:section)\s+\d+.*|[A-Z][A-Z0-9 &/,\-]{2,})$')
+_SECTION_TITLE = re.compile(r'^(#+\s*)?(\d+(\.\d+)*\.?\s*)?(?P<title>[a-z][a-z \-]*?)\s*:?$', re.IGNORECASE)
+
+# Numbered section titles are only dropped this close to the start or end of the document (fraction of paragraphs)
+_SECTION_EDGE_RATIO = 0.2
+
+def _boilerplate_key(line):
+    # Page numbers are the only part of a running header/footer that changes from page to page
+    return ' '.join(_PAGE_NUMBER_TOKEN.sub('', line).split()).casefold()
+
+def _boilerplate_signature(line, page_index):
+    # The stripped numbers must count up with the pages, so "Priority: 2" and "Priority: 5" stay distinct lines
+    offsets = tuple(int(_DIGITS.search(match.group()).group()) - page_index for match in _PAGE_NUMBER_TOKEN.finditer(line))
+    return _boilerplate_key(line), offsets
+
+def _page_number_shape(line):
+    # "Page 3 of 40" and "Page 4 of 40" share a shape; the digits are what changes between pages
+    return _DIGITS.sub('#', ' '.join(line.split()).casefold())
+
+def _paragraph_key(paragraph):
+    return ' '.join(paragraph.split()).casefold()
+
+class TextCompactor:
+    def __init__(self, drop_sections=False, boilerplate_page_ratio=0.5, edge_lines=3, min_duplicate_chars=20):
+        """
+        Shrink extracted requirements text before it is sent to the LLM
+
+        Removes running headers and footers (lines repeated at the top or bottom of most
+        pages, ignoring page numbers), page number lines, table of contents entries
+        and hyphenation breaks, collapses whitespace, and drops repeated paragraphs.
+        A line holding only a number is removed as a page number only when it sits at a page
+        edge and counts up with the pages (see _find_page_numbers), so numbers from tables
+        and sentences that extract onto their own line are kept.
+        Optionally drops whole non-requirement sections (revision history, glossary, ...).
+
+        :param drop_sections: Also drop the sections named in NON_REQUIREMENT_SECTIONS
+        :param boilerplate_page_ratio: Fraction of pages a header/footer line must appear on to be removed
+        :param edge_lines: Lines at the top and bottom of each page considered for headers and footers
+        :param min_duplicate_chars: Shorter paragraphs (headings, labels) are never de-duplicated
+        """
+        self.drop_sections = drop_sections
+        self.boilerplate_page_ratio = boilerplate_page_ratio
+        self.edge_lines = max(1, int(edge_lines))
+        self.min_duplicate_chars = min_duplicate_chars
+
+    def compact(self, text):
+        """
+        :param text: Extracted document text, pages separated by PAGE_SEPARATOR
+        :return: Tuple of (compacted text, report with token counts and what was removed)
+        """
+        removed = Counter()
+        pages = [page.replace('\r\n', '\n').replace('\r', '\n').replace('\u00a0', ' ') for page in text.split(PAGE_SEPARATOR)]
+
+        # Hyphenated words split across lines are joined before line-level processing
+        vocabulary = set(_WORD.findall(_HYPHENATED_BREAK.sub(' ', '\n'.join(pages)).casefold()))
+        pages = [_HORIZONTAL_WHITESPACE.sub(' ', self._join_hyphenation(page, vocabulary, removed)) for page in pages]
+        page_lines = [[line.strip() for line in page.split('\n')] for page in pages]
+
+        boilerplate = self._find_boilerplate(page_lines)
+        page_numbers = self._find_page_numbers(page_lines)
+        kept_lines = []
+        for page_index, lines in enumerate(page_lines):
+            non_empty = [index for index, line in enumerate(lines) if line]
+            edges = set(non_empty[:self.edge_lines] + non_empty[-self.edge_lines:])
+            for index, line in enumerate(lines):
+                if not line:
+                    kept_lines.append('')
+                elif index in edges and (page_index, line) in page_numbers:
+                    removed['pageNumberLines'] += 1
+                elif index in edges and _boilerplate_signature(line, page_index) in boilerplate:
+                    removed['boilerplateLines'] += 1
+                elif line[-1].isdigit() and _TOC_LINE.match(line):
+                    removed['tableOfContentsLines'] += 1
+                else:
+                    kept_lines.append(line)
+            # Page breaks become paragraph breaks
+            kept_lines.append('')
+
+        paragraphs = self._paragraphs(kept_lines)
+        dropped_sections = []
+        if self.drop_sections:
+            paragraphs, dropped_sections = self._drop_sections(paragraphs)
+
+        seen = set()
+        compacted = []
+        for paragraph in paragraphs:
+            key = _paragraph_key(paragraph)
+            if len(key) >= self.min_duplicate_chars:
+                if key in seen:
+                    removed['duplicateParagraphs'] += 1
+                    continue
+                seen.add(key)
+            compacted.append(paragraph)
+        compacted_text = '\n\n'.join(compacted)
+
+        original_tokens = estimate_tokens(text)
+        compacted_tokens = estimate_tokens(compacted_text)
+        return compacted_text, {
+            "originalTokens": original_tokens,
+            "compactedTokens": compacted_tokens,
+            "tokensSaved": original_tokens - compacted_tokens,
+            "savedRatio": round(1 - compacted_tokens / original_tokens, 4) if original_tokens else 0.0,
+            "removed": dict(removed),
+            "droppedSections": dropped_sections
+        }
+
+    def _join_hyphenation(self, page, vocabulary, removed):
+        """
+        Undo line-break hyphenation without gluing real compounds together
+
+        The halves are joined only when the joined word is used elsewhere in the document
+        ("require-\nments" with "requirements"). Otherwise the hyphen is kept and only the
+        line break goes, so "client-\nserver" becomes "client-server", never "clientserver".
+
+        :param vocabulary: Lowercase words of the whole document, excluding the broken words themselves
+        """
+        def join(match):
+            head, tail = match.group(1), match.group(2)
+            if (head + tail).casefold() in vocabulary:
+                removed['hyphenationBreaks'] += 1
+                return head + tail
+            return f"{head}-{tail}"
+        return _HYPHENATED_BREAK.sub(join, page)
+
+    def _find_boilerplate(self, page_lines):
+        """
+        Find the running headers and footers
+
+        A line is boilerplate when it repeats at the top or bottom of enough pages once its
+        page numbers are stripped, and those numbers keep the same offset to the page index
+        (as in _find_page_numbers). Edge lines whose numbers vary otherwise ("Priority: 2",
+        "Priority: 5") are content and kept.
+
+        :return: Signatures (see _boilerplate_signature) of the header/footer lines
+        """
+        if len(page_lines) < 2:
+            return set()
+        page_counts = Counter()
+        for page_index, lines in enumerate(page_lines):
+            non_empty = [line for line in lines if line]
+            edge = non_empty[:self.edge_lines] + non_empty[-self.edge_lines:]
+            page_counts.update({
+                signature for signature in (_boilerplate_signature(line, page_index) for line in edge) if signature[0]
+            })
+        threshold = max(2, self.boilerplate_page_ratio * len(page_lines))
+        return {signature for signature, count in page_counts.items() if count >= threshold}
+
+    def _find_page_numbers(self, page_lines):
+        """
+        Find the page number lines at the top or bottom of each page
+
+        Page numbers count up with the pages, so for one shape ("12", "- 12 -", "Page 12 of 40")
+        the number minus the page index stays the same. A shape and offset must be at the edge
+        of enough pages; any other number on its own line (table cells, years) is kept.
+
+        :return: Set of (page index, line) to remove
+        """
+        if len(page_lines) < 2:
+            return set()
+        candidates = defaultdict(set)
+        for page_index, lines in enumerate(page_lines):
+            non_empty = [line for line in lines if line]
+            edge = non_empty[:self.edge_lines] + non_empty[-self.edge_lines:]
+            for line in edge:
+                if _PAGE_NUMBER_LINE.match(line):
+                    offset = int(_DIGITS.search(line).group()) - page_index
+                    candidates[(_page_number_shape(line), offset)].add((page_index, line))
+        threshold = max(2, self.boilerplate_page_ratio * len(page_lines))
+        page_numbers = set()
+        for occurrences in candidates.values():
+            if len({page_index for page_index, _ in occurrences}) >= threshold:
+                page_numbers.update(occurrences)
+        return page_numbers
+
+    def _paragraphs(self, lines):
+        paragraphs, current = [], []
+        for line in lines:
+            if line:
+                current.append(line)
+            elif current:
+                paragraphs.append('\n'.join(current))
+                current = []
+        if current:
+            paragraphs.append('\n'.join(current))
+        return paragraphs
+
+    def _drop_sections(self, paragraphs):
+        """
+        Drop paragraphs from a non-requirement section heading up to the next heading
+
+        Front and back matter sits at the ends of a document, so a numbered title such as
+        "4.3 Approval" in the body is a requirements section and kept; only unnumbered
+        titles, or numbered ones within _SECTION_EDGE_RATIO of either end, start a drop.
+
+        :return: Tuple of (kept paragraphs, titles of the dropped sections)
+        """
+        kept, dropped = [], []
+        dropping = False
+        edge = max(1, int(len(paragraphs) * _SECTION_EDGE_RATIO))
+        for paragraph_index, paragraph in enumerate(paragraphs):
+            near_edge = paragraph_index < edge or paragraph_index >= len(paragraphs) - edge
+            lines = paragraph.split('\n')
+            for line in lines:
+                is_heading = len(line) <= 80 and _HEADING_LINE.match(line) is not None
+                title = _SECTION_TITLE.match(line) if len(line) <= 80 else None
+                if title and title.group(2) and not near_edge:
+                    title = None
+                if title and title.group('title').strip().casefold() in NON_REQUIREMENT_SECTIONS:
+                    dropping = True
+                    dropped.append(title.group('title').strip())
+                elif is_heading and dropping:
+                    dropping = False
+                if not dropping:
+                    kept.append(line)
+            kept.append('')
+        return self._paragraphs(kept), dropped
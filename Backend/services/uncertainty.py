@@ -0,0 +1,115 @@
+import numpy as np
+from services.cost_drivers_analyzer import COST_DRIVER_MULTIPLIERS, RATING_SCALE, normalize_rating
+from services.function_point_analysis import FPA_FUNCTION_TYPES, FPA_WEIGHTS
+
+# Percentiles reported for every simulated quantity
+DEFAULT_PERCENTILES = (10, 50, 90)
+
+class EffortUncertaintySimulator:
+    def __init__(self, samples=20000, rating_step_probability=0.2, kloc_sigma=0.15, percentiles=DEFAULT_PERCENTILES, seed=None):
+        """
+        Monte Carlo effort and schedule ranges around a point estimate
+
+        Each sample moves every rated cost driver one step down or up the rating scale with
+        rating_step_probability each, redraws every FPA count from a Poisson distribution
+        around the analyzed count, and applies lognormal noise to LOC per function point.
+        All samples go through the effort model as one (samples, 16) matrix.
+
+        :param samples: Number of Monte Carlo samples per estimate
+        :param rating_step_probability: Probability of a driver being rated one step lower (and, separately, higher)
+        :param kloc_sigma: Standard deviation of the lognormal KLOC noise (0.15 is roughly +/-15%)
+        :param percentiles: Percentiles reported in the result
+        :param seed: Optional seed for reproducible samples
+        """
+        if not 0 <= rating_step_probability <= 0.5:
+            raise ValueError("rating_step_probability must be between 0 and 0.5")
+        self.samples = int(samples)
+        self.rating_step_probability = rating_step_probability
+        self.kloc_sigma = kloc_sigma
+        self.percentiles = tuple(percentiles)
+        self.seed = seed
+
+        # Multiplier table indexed by [driver, rating index] for vectorized lookups
+        self.drivers = tuple(COST_DRIVER_MULTIPLIERS)
+        self.multiplier_table = np.array(
+            [[COST_DRIVER_MULTIPLIERS[driver][rating] for rating in RATING_SCALE] for driver in self.drivers]
+        )
+
+    def sample_driver_multipliers(self, processed_cost_drivers, rng):
+        """
+        :param processed_cost_drivers: Cost drivers with 'driver' and 'value' (rating)
+        :param rng: numpy Generator
+        :return: Dictionary of driver name to (samples,) array of multipliers
+        """
+        sampled = {}
+        step = self.rating_step_probability
+        for driver in processed_cost_drivers:
+            name = driver.get('driver')
+            rating = normalize_rating(driver.get('value'))
+            if name not in self.drivers:
+                continue
+            if rating is None:
+                # Unrated drivers keep whatever multiplier the point estimate used
+                sampled[name] = np.full(self.samples, driver.get('numerical_value', 1.0))
+                continue
+            row = self.drivers.index(name)
+            draws = rng.random(self.samples)
+            offsets = (draws > 1 - step).astype(np.int64) - (draws < step)
+            indices = np.clip(RATING_SCALE.index(rating) + offsets, 0, len(RATING_SCALE) - 1)
+            sampled[name] = self.multiplier_table[row, indices]
+        return sampled
+
+    def sample_klocs(self, estimated_kloc, rng, fpa_analysis=None, vaf=None, loc_per_fp=None):
+        """
+        :param estimated_kloc: Point estimate of KLOC
+        :param rng: numpy Generator
+        :param fpa_analysis: Optional FPA counts; when given, the counts themselves are resampled
+        :param vaf: Value Adjustment Factor used with fpa_analysis
+        :param loc_per_fp: Lines of code per function point used with fpa_analysis
+        :return: (samples,) array of KLOC values
+        """
+        noise = rng.lognormal(mean=0.0, sigma=self.kloc_sigma, size=self.samples) if self.kloc_sigma else 1.0
+        if fpa_analysis is not None and vaf is not None and loc_per_fp is not None:
+            counts = np.array([fpa_analysis[function_type]['count'] for function_type in FPA_FUNCTION_TYPES])
+            weights = np.array([FPA_WEIGHTS[function_type] for function_type in FPA_FUNCTION_TYPES])
+            if counts.sum() > 0:
+                function_points = rng.poisson(counts, size=(self.samples, len(counts))) @ weights
+                return function_points * vaf * loc_per_fp / 1000 * noise
+        return np.full(self.samples, float(estimated_kloc)) * noise
+
+    def simulate(self, effort_model, processed_cost_drivers, estimated_kloc, fpa_analysis=None, vaf=None, loc_per_fp=None):
+        """
+        Run the Monte Carlo simulation
+
+        :param effort_model: EffortEstimationModel (or anything with predict_effort_matrix)
+        :param processed_cost_drivers: Processed cost drivers of the point estimate
+        :param estimated_kloc: KLOC of the point estimate
+        :param fpa_analysis: Optional FPA counts used to resample KLOC
+        :param vaf: Value Adjustment Factor used with fpa_analysis
+        :param loc_per_fp: Lines of code per function point used with fpa_analysis
+        :return: Dictionary with percentiles of developmentEffort, developmentTime and estimatedKLOC
+        """
+        rng = np.random.default_rng(self.seed)
+        klocs = self.sample_klocs(estimated_kloc, rng, fpa_analysis, vaf, loc_per_fp)
+        multipliers = self.sample_driver_multipliers(processed_cost_drivers, rng)
+
+        # Drivers that are not sampled (including virt and turn) stay at the model's neutral 1.0
+        X = np.ones((self.samples, len(effort_model.cost_driver_order) + 1))
+        for column, driver in enumerate(effort_model.cost_driver_order):
+            if driver in multipliers:
+                X[:, column] = multipliers[driver]
+        X[:, -1] = klocs
+
+        # float32 is the network's trained precision and far cheaper for tens of thousands of rows
+        efforts = effort_model.predict_effort_matrix(X, dtype=np.float32)
+        times = effort_model.calculate_development_time_batch(efforts)
+
+        def summarize(values):
+            return {f"p{q}": float(value) for q, value in zip(self.percentiles, np.percentile(values, self.percentiles))}
+
+        return {
+            "samples": self.samples,
+            "developmentEffort": summarize(efforts),
+            "developmentTime": summarize(times),
+            "estimatedKLOC": summarize(klocs)
+        }
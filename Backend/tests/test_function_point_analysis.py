@@ -0,0 +1,157 @@
+import json
+import pytest
+from services.cache import FPAResultCache
+from services.function_point_analysis import (
+    FunctionPointAnalyzer, empty_fpa_analysis, estimate_tokens, merge_fpa_analyses, split_requirements_text,
+    validate_fpa_analysis
+)
+from services.similarity_index import MinHashLSHIndex
+
+class FakeResponse:
+    def __init__(self, content):
+        self.choices = [type('Choice', (), {'message': type('Message', (), {'content': content})()})()]
+        self.usage = None
+
+class ScriptedClient:
+    """
+    Chat completions client that answers each call with the next scripted reply
+    (a string, or an exception to raise)
+    """
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.calls = 0
+        self.chat = self
+        self.completions = self
+
+    def create(self, **kwargs):
+        reply = self.replies[min(self.calls, len(self.replies) - 1)]
+        self.calls += 1
+        if isinstance(reply, Exception):
+            raise reply
+        return FakeResponse(reply)
+
+def fpa_reply(**counts):
+    analysis = empty_fpa_analysis()
+    for function_type, count in counts.items():
+        analysis[function_type] = {"count": count, "examples": [f"{function_type} {index}" for index in range(count)]}
+    return json.dumps(analysis)
+
+def test_validate_coerces_counts_and_drops_unknown_keys():
+    analysis = empty_fpa_analysis()
+    analysis['EI'] = {"count": "3", "examples": ["Login", 7]}
+    analysis['EO'] = {"count": 2.0}
+    analysis['notes'] = "ignored"
+
+    validated = validate_fpa_analysis(analysis)
+    assert validated['EI'] == {"count": 3, "examples": ["Login", "7"]}
+    assert validated['EO'] == {"count": 2, "examples": []}
+    assert 'notes' not in validated
+
+@pytest.mark.parametrize('reply', [
+    [],
+    {"EI": 3},
+    {**empty_fpa_analysis(), "EO": {"count": "three"}},
+    {**empty_fpa_analysis(), "EO": {"count": -1}},
+    {**empty_fpa_analysis(), "EO": {"count": 1.5}},
+    {**empty_fpa_analysis(), "EO": {"count": float('inf')}},
+    {**empty_fpa_analysis(), "EO": {"count": 1, "examples": "Report"}},
+])
+def test_validate_rejects_malformed_analyses(reply):
+    with pytest.raises(ValueError):
+        validate_fpa_analysis(reply)
+
+def test_malformed_reply_is_incomplete_and_not_cached():
+    cache = FPAResultCache()
+    client = ScriptedClient('{"EI": 3}', fpa_reply(EI=2))
+    analyzer = FunctionPointAnalyzer(client=client, cache=cache)
+
+    analysis, complete = analyzer.analyze_requirements_with_status("The system shall let users log in.")
+    assert not complete
+    assert analysis == empty_fpa_analysis()
+    assert len(cache.memory) == 0
+
+    # The next request asks the LLM again instead of reusing the bad reply
+    analysis, complete = analyzer.analyze_requirements_with_status("The system shall let users log in.")
+    assert complete
+    assert analysis['EI']['count'] == 2
+    assert client.calls == 2
+
+def test_cache_source_is_reported():
+    cache = FPAResultCache(similarity_index=MinHashLSHIndex(threshold=0.8))
+    client = ScriptedClient(fpa_reply(EI=2))
+    analyzer = FunctionPointAnalyzer(client=client, cache=cache)
+    text = ' '.join(f"The system shall support feature {index}." for index in range(200))
+
+    _, complete, source = analyzer.analyze_requirements_with_source(text)
+    assert complete and source is None
+    _, _, source = analyzer.analyze_requirements_with_source(text)
+    assert source == {"match": "exact"}
+
+    analysis, _, source = analyzer.analyze_requirements_with_source(text.replace("feature 7.", "feature 7b."))
+    assert source['match'] == "similar"
+    assert 0.8 <= source['similarity'] < 1
+    assert analysis['EI']['count'] == 2
+    assert client.calls == 1
+
+def paragraphs(count, length=60):
+    return [f"Paragraph {index} ".ljust(length, 'x') + "." for index in range(count)]
+
+def test_split_packs_whole_paragraphs_under_the_budget():
+    text = '\n\n'.join(paragraphs(6))
+    chunks = split_requirements_text(text, max_tokens=40)
+
+    assert len(chunks) > 1
+    assert all(estimate_tokens(chunk) <= 40 for chunk in chunks)
+    # Every paragraph lands whole in exactly one chunk, in document order
+    assert [paragraph for chunk in chunks for paragraph in chunk.split('\n\n')] == paragraphs(6)
+
+def test_split_breaks_oversize_paragraphs_on_sentences_then_hard():
+    sentences = [f"Sentence {index} of the long paragraph." for index in range(10)]
+    unbroken = 'y' * 250
+    text = ' '.join(sentences) + '\n\n' + unbroken
+    chunks = split_requirements_text(text, max_tokens=25)
+
+    assert all(len(chunk) <= 100 for chunk in chunks)
+    joined = ' '.join(chunks)
+    for sentence in sentences:
+        assert sentence in joined
+    assert ''.join(chunk for chunk in chunks if set(chunk) <= {'y', '\n'}).replace('\n', '') == unbroken
+
+def test_split_keeps_small_documents_whole():
+    assert split_requirements_text("One paragraph.\n\nAnother one.", max_tokens=100) == ["One paragraph.\n\nAnother one."]
+    assert split_requirements_text("  \n\n ", max_tokens=100) == []
+
+def test_merge_sums_counts_and_deduplicates_examples():
+    first = empty_fpa_analysis()
+    first['EI'] = {"count": 3, "examples": ["Login form", "Customer entry"]}
+    second = empty_fpa_analysis()
+    second['EI'] = {"count": 2, "examples": ["login-form", "File upload"]}
+    second['ILF'] = {"count": 1, "examples": ["Orders"]}
+
+    merged = merge_fpa_analyses([first, second])
+    assert merged['EI']['examples'] == ["Login form", "Customer entry", "File upload"]
+    # Three distinct named inputs plus the one unnamed input the first chunk counted
+    assert merged['EI']['count'] == 4
+    assert merged['ILF'] == {"count": 1, "examples": ["Orders"]}
+    assert merged['EO'] == {"count": 0, "examples": []}
+
+def test_failed_chunk_makes_the_analysis_incomplete_and_uncached():
+    cache = FPAResultCache()
+    client = ScriptedClient(fpa_reply(EI=1), RuntimeError("LLM unavailable"), fpa_reply(EO=2))
+    analyzer = FunctionPointAnalyzer(client=client, cache=cache, chunk_token_budget=20, max_concurrency=1)
+    text = '\n\n'.join(paragraphs(3))
+
+    analysis, complete = analyzer.analyze_requirements_with_status(text)
+    assert client.calls == 3
+    assert not complete
+    assert analysis['EI']['count'] == 1
+    assert analysis['EO']['count'] == 2
+    assert len(cache.memory) == 0
+
+def test_every_chunk_failing_returns_the_empty_analysis():
+    client = ScriptedClient(RuntimeError("LLM unavailable"))
+    analyzer = FunctionPointAnalyzer(client=client, chunk_token_budget=20, max_concurrency=1)
+
+    analysis, complete = analyzer.analyze_requirements_with_status('\n\n'.join(paragraphs(3)))
+    assert not complete
+    assert analysis == empty_fpa_analysis()
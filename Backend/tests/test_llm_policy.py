@@ -0,0 +1,147 @@
+import threading
+import time
+import pytest
+from services import llm_policy
+from services.llm_policy import CircuitBreaker, CircuitOpenError, LLMCallPolicy, LLMTimeoutError
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(llm_policy.time, 'monotonic', fake)
+    return fake
+
+def test_circuit_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_seconds=30)
+    breaker.record_failure()
+    breaker.record_failure()
+    # A success in between resets the count
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == 'closed'
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    assert not breaker.allow()
+
+def test_circuit_half_open_probe_closes_on_success(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30)
+    breaker.record_failure()
+    clock.now += 29.9
+    assert breaker.state == 'open'
+    assert not breaker.allow()
+
+    clock.now += 0.1
+    assert breaker.state == 'half_open'
+    # Exactly one probe goes through while half-open
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == 'closed'
+    assert breaker.allow()
+    assert breaker.allow()
+
+def test_circuit_half_open_probe_failure_reopens(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    assert not breaker.allow()
+    clock.now += 30
+    assert breaker.allow()
+
+def test_open_circuit_fails_fast_without_calling_provider():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=60)
+    breaker.record_failure()
+    calls = []
+    policy = LLMCallPolicy(circuit_breaker=breaker)
+    with pytest.raises(CircuitOpenError):
+        policy.call(lambda: calls.append(1))
+    assert calls == []
+
+def test_transient_errors_are_retried_and_trip_the_circuit():
+    breaker = CircuitBreaker(failure_threshold=3, reset_seconds=60)
+    policy = LLMCallPolicy(max_attempts=3, backoff_base_seconds=0, circuit_breaker=breaker)
+    attempts = []
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError("reset by peer")
+        return 'ok'
+
+    assert policy.call(flaky, operation='test_retry') == 'ok'
+    assert len(attempts) == 3
+    assert breaker.state == 'closed'
+
+    def down():
+        raise ConnectionError("refused")
+    with pytest.raises(ConnectionError):
+        policy.call(down, operation='test_retry')
+    assert breaker.state == 'open'
+
+def test_non_transient_errors_are_not_retried():
+    policy = LLMCallPolicy(max_attempts=3, backoff_base_seconds=0)
+    attempts = []
+    def bad_request():
+        attempts.append(1)
+        raise ValueError("invalid JSON")
+    with pytest.raises(ValueError):
+        policy.call(bad_request, operation='test_bad_request')
+    assert len(attempts) == 1
+
+def test_hedged_request_wins_over_slow_attempt():
+    policy = LLMCallPolicy(call_timeout=5, hedge_percentile=50, hedge_min_samples=3)
+    for _ in range(3):
+        policy.call(lambda: 'warm', operation='test_hedge')
+    assert policy.hedge_delay('test_hedge') is not None
+
+    release = threading.Event()
+    calls = []
+    lock = threading.Lock()
+    def completion():
+        with lock:
+            calls.append(1)
+            first = len(calls) == 1
+        if first:
+            # The original attempt hangs until the test ends
+            release.wait(5)
+            return 'original'
+        return 'hedged'
+
+    try:
+        start = time.monotonic()
+        assert policy.call(completion, operation='test_hedge') == 'hedged'
+        assert time.monotonic() - start < 1
+        assert len(calls) == 2
+    finally:
+        release.set()
+
+def test_deadline_expires_during_attempt():
+    policy = LLMCallPolicy(max_attempts=3)
+    release = threading.Event()
+    try:
+        start = time.monotonic()
+        with pytest.raises(LLMTimeoutError):
+            policy.call(lambda: release.wait(5), operation='test_deadline', deadline=time.monotonic() + 0.1)
+        assert time.monotonic() - start < 1
+    finally:
+        release.set()
+
+def test_expired_deadline_skips_the_call():
+    policy = LLMCallPolicy(max_attempts=3)
+    calls = []
+    with pytest.raises(LLMTimeoutError):
+        policy.call(lambda: calls.append(1), operation='test_deadline', deadline=time.monotonic() - 1)
+    assert calls == []
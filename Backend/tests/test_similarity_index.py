@@ -0,0 +1,83 @@
+import random
+import pytest
+from services.similarity_index import MinHashLSHIndex
+
+def make_document(seed, words=400):
+    rng = random.Random(seed)
+    return [f"word{rng.randrange(5000)}" for _ in range(words)]
+
+def edit(words, changes, seed=0):
+    rng = random.Random(seed)
+    edited = list(words)
+    for index in rng.sample(range(len(words)), changes):
+        edited[index] = f"edit{rng.randrange(5000)}"
+    return edited
+
+@pytest.fixture
+def index():
+    return MinHashLSHIndex(threshold=0.9)
+
+def test_near_duplicate_hit_and_unrelated_miss(index):
+    base = make_document(1)
+    index.add(index.signature(' '.join(base)), 'base')
+
+    match = index.query(index.signature(' '.join(edit(base, 1))))
+    assert match is not None
+    assert match[0] == 'base'
+    assert match[1] >= 0.9
+
+    assert index.query(index.signature(' '.join(edit(base, 40)))) is None
+    assert index.query(index.signature(' '.join(make_document(2)))) is None
+
+def test_match_requires_threshold(index):
+    base = make_document(3)
+    index.add(index.signature(' '.join(base)), 'base')
+    signature = index.signature(' '.join(edit(base, 5)))
+
+    index.threshold = 0.0
+    value, similarity = index.query(signature)
+    assert 0 < similarity < 1
+
+    index.threshold = similarity
+    assert index.query(signature) == ('base', similarity)
+    index.threshold = similarity + 1 / index.num_perm
+    assert index.query(signature) is None
+
+def test_namespaces_are_isolated(index):
+    text = ' '.join(make_document(4))
+    index.add(index.signature(text), 'model-a', namespace=1)
+
+    assert index.query(index.signature(text), namespace=2) is None
+    assert index.query(index.signature(text), namespace=1)[0] == 'model-a'
+
+    index.add(index.signature(text), 'model-b', namespace=2)
+    assert index.query(index.signature(text), namespace=1)[0] == 'model-a'
+    assert index.query(index.signature(text), namespace=2)[0] == 'model-b'
+
+def test_oldest_entry_is_overwritten_when_full():
+    index = MinHashLSHIndex(threshold=0.9, max_entries=2)
+    texts = [' '.join(make_document(seed)) for seed in (10, 11, 12)]
+    for value, text in enumerate(texts):
+        index.add(index.signature(text), value)
+
+    assert len(index) == 2
+    assert index.query(index.signature(texts[0])) is None
+    assert index.query(index.signature(texts[1]))[0] == 1
+    assert index.query(index.signature(texts[2]))[0] == 2
+
+def test_rebuilt_and_pending_entries_are_both_found():
+    index = MinHashLSHIndex(threshold=0.9, shingle_size=2)
+    texts = [' '.join(make_document(seed, words=30)) for seed in range(300)]
+    for value, text in enumerate(texts):
+        index.add(index.signature(text), value)
+
+    # The first 256 adds were sorted into the bands by a rebuild; the rest are still pending
+    assert len(index._pending) == 300 - 256
+    assert index.query(index.signature(texts[0]))[0] == 0
+    assert index.query(index.signature(texts[299]))[0] == 299
+
+def test_documents_without_words_are_ignored(index):
+    assert index.signature('   ') is None
+    index.add(None, 'empty')
+    assert len(index) == 0
+    assert index.query(None) is None
@@ -0,0 +1,123 @@
+from services.text_compaction import PAGE_SEPARATOR, TextCompactor
+
+
+def pages(*bodies):
+    return PAGE_SEPARATOR.join(bodies)
+
+
+def compact(text, **options):
+    compacted, report = TextCompactor(**options).compact(text)
+    return compacted, report['removed']
+
+
+def test_table_of_contents_entries_are_removed():
+    text = (
+        "Table of Contents\n"
+        "1. Introduction ........ 3\n"
+        "1.2 Scope . . . . . . 4\n"
+        "Appendix .......... 12\n\n"
+        "The system shall store orders."
+    )
+    compacted, removed = compact(text)
+    assert "Introduction" not in compacted
+    assert "Scope" not in compacted
+    assert "Appendix" not in compacted
+    assert "The system shall store orders." in compacted
+    assert removed['tableOfContentsLines'] == 3
+
+
+def test_ellipses_before_numbers_in_sentences_are_kept():
+    lines = [
+        "Retries happen at 1s, 2s, 4s... 60",
+        "the cache is flushed every ........ 10",
+        "Wait. Then retry...... 5",
+    ]
+    compacted, removed = compact('\n'.join(lines))
+    for line in lines:
+        assert line in compacted
+    assert 'tableOfContentsLines' not in removed
+
+
+def test_running_headers_and_page_footers_are_removed():
+    text = pages(*(
+        f"ACME Order System SRS\nThe system shall handle case {page}.\nConfidential - Page {page + 1} of 3"
+        for page in range(3)
+    ))
+    compacted, removed = compact(text)
+    assert "ACME Order System SRS" not in compacted
+    assert "Confidential" not in compacted
+    for page in range(3):
+        assert f"The system shall handle case {page}." in compacted
+    assert removed['boilerplateLines'] == 6
+
+
+def test_edge_lines_with_numbers_that_do_not_follow_the_pages_are_kept():
+    priorities = [2, 2, 1, 1]
+    text = pages(*(f"Requirement R{page}\nPriority: {priority}" for page, priority in enumerate(priorities)))
+    compacted, removed = compact(text)
+    for priority in set(priorities):
+        assert f"Priority: {priority}" in compacted
+    assert 'boilerplateLines' not in removed
+
+
+def test_page_numbers_are_removed_but_table_values_are_kept():
+    text = pages(
+        "Quota per user\n50\nThe system shall enforce quotas.\n1",
+        "Retention days\n30\nThe system shall purge old data.\n2",
+        "Max sessions\n5\nThe system shall limit sessions.\n3"
+    )
+    compacted, removed = compact(text)
+    for value in ("50", "30", "5"):
+        assert f"\n{value}\n" in compacted
+    assert removed['pageNumberLines'] == 3
+
+
+def test_hyphenation_is_joined_only_for_known_words():
+    text = "The require-\nments are listed.\nAll requirements are numbered.\nA client-\nserver design is used."
+    compacted, removed = compact(text)
+    assert "The requirements are listed." in compacted
+    assert "client-server" in compacted
+    assert removed['hyphenationBreaks'] == 1
+
+
+def test_repeated_paragraphs_are_removed_but_short_labels_are_kept():
+    paragraph = "The system shall send a confirmation email."
+    text = f"Notes\n\n{paragraph}\n\nNotes\n\n{paragraph}"
+    compacted, removed = compact(text)
+    assert compacted.count(paragraph) == 1
+    assert compacted.count("Notes") == 2
+    assert removed['duplicateParagraphs'] == 1
+
+
+def test_front_and_back_matter_sections_are_dropped():
+    body = '\n\n'.join(f"The system shall support feature {index}." for index in range(8))
+    text = (
+        "Revision History\n\nv1.0 initial draft by Alice\n\n"
+        "1 Introduction\n\n" + body + "\n\n"
+        "Glossary\n\nFP: function point"
+    )
+    compacted, report = TextCompactor(drop_sections=True).compact(text)
+    assert report['droppedSections'] == ["Revision History", "Glossary"]
+    assert "initial draft" not in compacted
+    assert "function point" not in compacted
+    assert "The system shall support feature 7." in compacted
+
+
+def test_numbered_sections_in_the_body_are_kept():
+    before = '\n\n'.join(f"The system shall support feature {index}." for index in range(6))
+    after = '\n\n'.join(f"The system shall report metric {index}." for index in range(6))
+    text = (
+        f"{before}\n\n4.3 Approval\n\nA manager shall approve every order above 1000 USD.\n\n"
+        f"4.4 Reporting\n\n{after}"
+    )
+    compacted, report = TextCompactor(drop_sections=True).compact(text)
+    assert report['droppedSections'] == []
+    assert "4.3 Approval" in compacted
+    assert "A manager shall approve every order above 1000 USD." in compacted
+
+
+def test_sections_are_kept_unless_dropping_is_enabled():
+    text = "Revision History\n\nv1.0 initial draft\n\n1 Introduction\n\nThe system shall store orders."
+    compacted, report = TextCompactor().compact(text)
+    assert "initial draft" in compacted
+    assert report['droppedSections'] == []
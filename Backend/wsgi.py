@@ -0,0 +1,41 @@
+"""
+Production WSGI entry point for pre-fork servers
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+With the exported NumPy weights (cocomo_effort_model.npz) the model is loaded once in the
+master before workers are forked. Its weights are memory-mapped read-only, so every worker
+shares the same page-cache pages and adding workers does not add model copies to RSS.
+
+Without the export the Keras model is used. TensorFlow is not fork-safe, so in that case
+each worker loads its own copy after forking (see post_fork in gunicorn.conf.py).
+Run export_numpy_model.py to get the shared, TensorFlow-free setup.
+
+Every worker is a separate process, so per-process state is not shared between them:
+- Async estimation jobs (POST /estimations?async=1) run in the worker that accepted them,
+  and their state is written to a SQLite JobStore (ESTIMATION_JOB_STORE_PATH, by default
+  the project store's database) so GET /estimations/jobs/<id> works from any worker.
+- Saved analyses for recompute are in SQLite (ANALYSIS_STORE_PATH) and are shared too.
+- The in-memory FPA cache, its near-duplicate index and the cost driver rating memo are
+  per worker; set FPA_CACHE_DB_PATH to share cached FPA results across workers.
+"""
+import os
+import config
+from app import create_app
+from services.effort_estimation_model import EffortEstimationModel, MODEL_DIR
+from services.model_loader import EffortModelLoader
+
+# Load in the master only when it is safe to share across fork()
+PRELOAD_MODEL = os.path.exists(os.path.join(MODEL_DIR, 'cocomo_effort_model.npz'))
+
+model_loader = EffortModelLoader(
+    lambda: EffortEstimationModel(engine='numpy' if PRELOAD_MODEL else 'keras', mmap_weights=PRELOAD_MODEL),
+    warm_up=config.EFFORT_MODEL_WARM_UP,
+    wait_seconds=config.EFFORT_MODEL_WAIT_SECONDS,
+    micro_batch_size=config.EFFORT_MODEL_MICRO_BATCH_SIZE,
+    micro_batch_wait_seconds=config.EFFORT_MODEL_MICRO_BATCH_WAIT_MS / 1000
+)
+if PRELOAD_MODEL:
+    model_loader.load()
+
+app = create_app(model_loader=model_loader)